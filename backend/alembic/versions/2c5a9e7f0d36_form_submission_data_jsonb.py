@@ -0,0 +1,51 @@
+"""Store form submission data as JSONB with a GIN index
+
+Revision ID: 2c5a9e7f0d36
+Revises: a9e4c6d13b80
+Create Date: 2026-10-18 18:44:37.902155
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c5a9e7f0d36'
+down_revision: Union[str, Sequence[str], None] = 'a9e4c6d13b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite keeps JSON text and filters with json_extract
+        return
+    op.alter_column(
+        'form_submissions', 'data',
+        type_=postgresql.JSONB(), existing_type=sa.JSON(), postgresql_using='data::jsonb',
+    )
+    op.create_index(
+        'ix_form_submissions_data', 'form_submissions', ['data'],
+        postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'},
+    )
+    # Per-template field indexes are created by the API when a template marks
+    # fields as indexed (app/services/submission_query.py)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DO $$ DECLARE r record; BEGIN "
+               "FOR r IN SELECT indexname FROM pg_indexes WHERE tablename = 'form_submissions' "
+               "AND indexname ~ '^ix_form_submissions_t[0-9]+_' LOOP "
+               "EXECUTE 'DROP INDEX ' || quote_ident(r.indexname); END LOOP; END $$")
+    op.drop_index('ix_form_submissions_data', table_name='form_submissions')
+    op.alter_column(
+        'form_submissions', 'data',
+        type_=sa.JSON(), existing_type=postgresql.JSONB(), postgresql_using='data::json',
+    )
@@ -0,0 +1,28 @@
+"""Add automation rules version to workspaces
+
+Revision ID: 3b9d6c2e7f14
+Revises: c58e1f3a6d02
+Create Date: 2026-10-18 14:58:16.204733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d6c2e7f14'
+down_revision: Union[str, Sequence[str], None] = 'c58e1f3a6d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('workspaces', sa.Column('automation_rules_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('workspaces', 'automation_rules_version')
@@ -0,0 +1,35 @@
+"""Add generated low-stock flag to inventory items
+
+Revision ID: 4a7e2d90c815
+Revises: 9f61b0d27c4e
+Create Date: 2026-10-18 13:48:30.901442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7e2d90c815'
+down_revision: Union[str, Sequence[str], None] = '9f61b0d27c4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite can only add VIRTUAL generated columns to an existing table
+    persisted = op.get_bind().dialect.name != 'sqlite'
+    op.add_column('inventory_items', sa.Column('is_low_stock', sa.Boolean(), sa.Computed('quantity <= low_stock_threshold', persisted=persisted), nullable=True))
+    op.create_index(
+        'ix_inventory_items_low_stock', 'inventory_items', ['workspace_id', 'name', 'id'], unique=False,
+        postgresql_where=sa.text('is_low_stock'), sqlite_where=sa.text('is_low_stock'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_items_low_stock', table_name='inventory_items')
+    op.drop_column('inventory_items', 'is_low_stock')
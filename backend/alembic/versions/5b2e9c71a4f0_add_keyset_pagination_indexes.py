@@ -0,0 +1,43 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5b2e9c71a4f0
+Revises: d10ccf57f5e8
+Create Date: 2026-10-18 10:41:07.553912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9c71a4f0'
+down_revision: Union[str, Sequence[str], None] = 'd10ccf57f5e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) - each ends in the table's unique key so the
+# list endpoints can seek straight to the cursor position.
+INDEXES = [
+    ('ix_conversations_workspace_last_message', 'conversations', ['workspace_id', 'last_message_at', 'id']),
+    ('ix_messages_conversation_timestamp', 'messages', ['conversation_id', 'timestamp', 'id']),
+    ('ix_form_templates_workspace_id_id', 'form_templates', ['workspace_id', 'id']),
+    ('ix_form_submissions_template_id_id', 'form_submissions', ['template_id', 'id']),
+    ('ix_inventory_items_workspace_name', 'inventory_items', ['workspace_id', 'name', 'id']),
+    ('ix_automation_rules_workspace_id_id', 'automation_rules', ['workspace_id', 'id']),
+    ('ix_services_workspace_id_id', 'services', ['workspace_id', 'id']),
+    ('ix_users_workspace_role', 'users', ['workspace_id', 'role', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
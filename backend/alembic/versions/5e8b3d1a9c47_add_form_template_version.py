@@ -0,0 +1,28 @@
+"""Add form template version
+
+Revision ID: 5e8b3d1a9c47
+Revises: 2c5a9e7f0d36
+Create Date: 2026-10-18 19:20:03.318660
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b3d1a9c47'
+down_revision: Union[str, Sequence[str], None] = '2c5a9e7f0d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('form_templates', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('form_templates', 'version')
@@ -0,0 +1,100 @@
+"""Add normalized contact identifiers with per-workspace unique indexes
+
+Revision ID: 6d2f8a3c1e57
+Revises: 8e4b1a7d5c39
+Create Date: 2026-10-18 16:48:21.603114
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2f8a3c1e57'
+down_revision: Union[str, Sequence[str], None] = '8e4b1a7d5c39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copies of app.models.crm.normalize_email/normalize_phone as of this revision
+def _normalize_email(email):
+    email = (email or "").strip().lower()
+    return email or None
+
+def _normalize_phone(phone):
+    phone = (phone or "").strip()
+    digits = re.sub(r"[^0-9]", "", phone)
+    if not digits:
+        return None
+    return "+" + digits if phone.startswith("+") else digits
+
+# Tables whose contact_id points at a merged duplicate
+REFERENCING_TABLES = ("conversations", "bookings", "form_submissions")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('email_normalized', sa.String(), nullable=True))
+    op.add_column('contacts', sa.Column('phone_normalized', sa.String(), nullable=True))
+
+    # Merge duplicates the way the public forms matched them: oldest contact
+    # first, an email match before a phone match. Identifiers a duplicate had
+    # and its survivor lacked are carried over when no other contact has them.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, workspace_id, email, phone FROM contacts ORDER BY id")).fetchall()
+    by_email = {}
+    by_phone = {}
+    keys = {}
+    merges = []
+    for row in rows:
+        email_key = _normalize_email(row.email)
+        phone_key = _normalize_phone(row.phone)
+        survivor = by_email.get((row.workspace_id, email_key)) if email_key else None
+        if survivor is None and phone_key:
+            survivor = by_phone.get((row.workspace_id, phone_key))
+        if survivor is None:
+            keys[row.id] = {"email": row.email, "phone": row.phone, "email_normalized": email_key, "phone_normalized": phone_key}
+            survivor = row.id
+        else:
+            merges.append((row.id, survivor))
+            kept = keys[survivor]
+            if email_key and not kept["email_normalized"] and (row.workspace_id, email_key) not in by_email:
+                kept.update(email=row.email, email_normalized=email_key)
+            if phone_key and not kept["phone_normalized"] and (row.workspace_id, phone_key) not in by_phone:
+                kept.update(phone=row.phone, phone_normalized=phone_key)
+        kept = keys[survivor]
+        if kept["email_normalized"]:
+            by_email.setdefault((row.workspace_id, kept["email_normalized"]), survivor)
+        if kept["phone_normalized"]:
+            by_phone.setdefault((row.workspace_id, kept["phone_normalized"]), survivor)
+
+    for duplicate, survivor in merges:
+        for table in REFERENCING_TABLES:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET contact_id = :survivor WHERE contact_id = :duplicate"),
+                {"survivor": survivor, "duplicate": duplicate},
+            )
+        bind.execute(sa.text("DELETE FROM contacts WHERE id = :id"), {"id": duplicate})
+    if keys:
+        bind.execute(
+            sa.text(
+                "UPDATE contacts SET email = :email, phone = :phone, "
+                "email_normalized = :email_normalized, phone_normalized = :phone_normalized WHERE id = :id"
+            ),
+            [dict(values, id=contact_id) for contact_id, values in keys.items()],
+        )
+    # workspace_counters.contacts is corrected by the next reconcile-counters run
+
+    op.create_index('uq_contacts_workspace_email', 'contacts', ['workspace_id', 'email_normalized'], unique=True)
+    op.create_index('uq_contacts_workspace_phone', 'contacts', ['workspace_id', 'phone_normalized'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Merged duplicates are not restored
+    op.drop_index('uq_contacts_workspace_phone', table_name='contacts')
+    op.drop_index('uq_contacts_workspace_email', table_name='contacts')
+    op.drop_column('contacts', 'phone_normalized')
+    op.drop_column('contacts', 'email_normalized')
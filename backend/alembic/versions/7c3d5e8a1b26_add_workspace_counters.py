@@ -0,0 +1,42 @@
+"""Add workspace dashboard counters
+
+Revision ID: 7c3d5e8a1b26
+Revises: b4f906590aef
+Create Date: 2026-10-18 12:05:13.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d5e8a1b26'
+down_revision: Union[str, Sequence[str], None] = 'b4f906590aef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows are not backfilled here: the dashboard builds a workspace's row from
+    # the source tables on first read, and the reconcile job covers the rest.
+    op.create_table('workspace_counters',
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('bookings', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('contacts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('active_conversations', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('pending_forms', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unread_alerts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('workspace_id')
+    )
+    op.create_index('ix_alerts_workspace_unread', 'alerts', ['workspace_id', 'is_read', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alerts_workspace_unread', table_name='alerts')
+    op.drop_table('workspace_counters')
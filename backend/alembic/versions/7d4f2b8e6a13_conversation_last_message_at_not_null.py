@@ -0,0 +1,39 @@
+"""Make conversations.last_message_at NOT NULL
+
+Revision ID: 7d4f2b8e6a13
+Revises: 5e8b3d1a9c47
+Create Date: 2026-10-18 21:05:41.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4f2b8e6a13'
+down_revision: Union[str, Sequence[str], None] = '5e8b3d1a9c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The inbox pages on (last_message_at, id): a NULL makes the cursor comparison
+    # NULL and the next page empty. Conversations without messages sort as of now.
+    op.execute("""
+        UPDATE conversations
+        SET last_message_at = COALESCE(
+            (SELECT max(m.timestamp) FROM messages m WHERE m.conversation_id = conversations.id),
+            CURRENT_TIMESTAMP)
+        WHERE last_message_at IS NULL
+    """)
+    with op.batch_alter_table('conversations') as batch_op:
+        batch_op.alter_column('last_message_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('conversations') as batch_op:
+        batch_op.alter_column('last_message_at', existing_type=sa.DateTime(timezone=True), nullable=True)
@@ -0,0 +1,106 @@
+"""Partition integration_logs by month (Postgres)
+
+Revision ID: 8e4b1a7d5c39
+Revises: 3b9d6c2e7f14
+Create Date: 2026-10-18 16:02:55.417820
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b1a7d5c39'
+down_revision: Union[str, Sequence[str], None] = '3b9d6c2e7f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Later months are created by the integration-log-maintenance job
+MONTHS_AHEAD = 2
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Other databases keep the plain table; retention deletes rows there
+        return
+
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE integration_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE integration_logs RENAME TO integration_logs_legacy")
+    op.execute("ALTER INDEX integration_logs_pkey RENAME TO integration_logs_legacy_pkey")
+    op.execute("ALTER INDEX ix_integration_logs_id RENAME TO ix_integration_logs_legacy_id")
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE integration_logs (
+            id integer NOT NULL DEFAULT nextval('integration_logs_id_seq'),
+            workspace_id integer NOT NULL REFERENCES workspaces (id),
+            integration_type varchar NOT NULL,
+            status varchar NOT NULL,
+            details text,
+            timestamp timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE integration_logs_id_seq OWNED BY integration_logs.id")
+    op.execute("CREATE INDEX ix_integration_logs_workspace_timestamp ON integration_logs (workspace_id, timestamp)")
+    # Catches rows outside every monthly range instead of failing the insert
+    op.execute("CREATE TABLE integration_logs_default PARTITION OF integration_logs DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(timestamp) FROM integration_logs_legacy")).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = (oldest.date() if oldest else today).replace(day=1)
+    last = today.replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        following = _next_month(month)
+        op.execute(
+            f"CREATE TABLE integration_logs_p{month:%Y%m} PARTITION OF integration_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    op.execute("""
+        INSERT INTO integration_logs (id, workspace_id, integration_type, status, details, timestamp)
+        SELECT id, workspace_id, integration_type, status, details, coalesce(timestamp, now())
+        FROM integration_logs_legacy
+    """)
+    op.execute("DROP TABLE integration_logs_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER SEQUENCE integration_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE integration_logs RENAME TO integration_logs_partitioned")
+    op.execute("ALTER INDEX integration_logs_pkey RENAME TO integration_logs_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE integration_logs (
+            id integer NOT NULL DEFAULT nextval('integration_logs_id_seq') PRIMARY KEY,
+            workspace_id integer NOT NULL REFERENCES workspaces (id),
+            integration_type varchar NOT NULL,
+            status varchar NOT NULL,
+            details text,
+            timestamp timestamptz DEFAULT now()
+        )
+    """)
+    op.execute("ALTER SEQUENCE integration_logs_id_seq OWNED BY integration_logs.id")
+    op.execute("CREATE INDEX ix_integration_logs_id ON integration_logs (id)")
+    op.execute("""
+        INSERT INTO integration_logs (id, workspace_id, integration_type, status, details, timestamp)
+        SELECT id, workspace_id, integration_type, status, details, timestamp
+        FROM integration_logs_partitioned
+    """)
+    op.execute("DROP TABLE integration_logs_partitioned")
@@ -0,0 +1,28 @@
+"""Add contact_imports.heartbeat_at
+
+Revision ID: 9a3e6c1f4b28
+Revises: 7d4f2b8e6a13
+Create Date: 2026-10-18 21:48:12.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e6c1f4b28'
+down_revision: Union[str, Sequence[str], None] = '7d4f2b8e6a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contact_imports', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contact_imports', 'heartbeat_at')
@@ -0,0 +1,67 @@
+"""Prevent overlapping bookings per service
+
+Revision ID: 9f61b0d27c4e
+Revises: e2a8f41c93d7
+Create Date: 2026-10-18 13:10:07.554291
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f61b0d27c4e'
+down_revision: Union[str, Sequence[str], None] = 'e2a8f41c93d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same DDL as the after_create hooks in app/models/operations.py
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap
+        EXCLUDE USING gist (service_id WITH =, tstzrange(start_time, end_time) WITH &&)
+        WHERE (status IS DISTINCT FROM 'CANCELLED')""",
+]
+
+SQLITE_DDL = [
+    """CREATE TRIGGER bookings_no_overlap_insert BEFORE INSERT ON bookings
+        WHEN NEW.status IS NOT 'CANCELLED'
+        BEGIN
+            SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+                SELECT 1 FROM bookings
+                WHERE service_id = NEW.service_id AND status IS NOT 'CANCELLED'
+                AND start_time < NEW.end_time AND end_time > NEW.start_time
+            );
+        END""",
+    """CREATE TRIGGER bookings_no_overlap_update BEFORE UPDATE OF service_id, start_time, end_time, status ON bookings
+        WHEN NEW.status IS NOT 'CANCELLED'
+        BEGIN
+            SELECT RAISE(ABORT, 'bookings_no_overlap') WHERE EXISTS (
+                SELECT 1 FROM bookings
+                WHERE service_id = NEW.service_id AND status IS NOT 'CANCELLED' AND id != NEW.id
+                AND start_time < NEW.end_time AND end_time > NEW.start_time
+            );
+        END""",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if overlapping non-cancelled bookings already exist; cancel the
+    # duplicates first.
+    dialect = op.get_bind().dialect.name
+    statements = {"postgresql": POSTGRES_DDL, "sqlite": SQLITE_DDL}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_constraint('bookings_no_overlap', 'bookings', type_='exclude')
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS bookings_no_overlap_insert")
+        op.execute("DROP TRIGGER IF EXISTS bookings_no_overlap_update")
@@ -0,0 +1,59 @@
+"""Add conversation inbox summary columns
+
+Revision ID: b4f906590aef
+Revises: 5b2e9c71a4f0
+Create Date: 2026-10-18 11:26:44.190375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4f906590aef'
+down_revision: Union[str, Sequence[str], None] = '5b2e9c71a4f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('conversations', sa.Column('last_message_preview', sa.String(), nullable=True))
+    op.add_column('conversations', sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing messages: latest activity and preview...
+    op.execute("""
+        UPDATE conversations c
+        SET last_message_at = m.timestamp,
+            last_message_preview = left(m.content, 140)
+        FROM (
+            SELECT DISTINCT ON (conversation_id) conversation_id, timestamp, content
+            FROM messages
+            ORDER BY conversation_id, timestamp DESC, id DESC
+        ) m
+        WHERE m.conversation_id = c.id
+    """)
+    # ...and inbound messages received after the last outbound one count as unread
+    op.execute("""
+        UPDATE conversations c
+        SET unread_count = u.unread
+        FROM (
+            SELECT m.conversation_id, count(*) AS unread
+            FROM messages m
+            WHERE m.direction = 'INBOUND'
+              AND m.timestamp > COALESCE(
+                  (SELECT max(o.timestamp) FROM messages o
+                   WHERE o.conversation_id = m.conversation_id AND o.direction = 'OUTBOUND'),
+                  '-infinity')
+            GROUP BY m.conversation_id
+        ) u
+        WHERE u.conversation_id = c.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'unread_count')
+    op.drop_column('conversations', 'last_message_preview')
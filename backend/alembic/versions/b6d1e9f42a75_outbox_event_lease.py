@@ -0,0 +1,30 @@
+"""Add outbox_events.claimed_at for leased dispatch
+
+Revision ID: b6d1e9f42a75
+Revises: 9a3e6c1f4b28
+Create Date: 2026-10-18 22:41:07.183520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1e9f42a75'
+down_revision: Union[str, Sequence[str], None] = '9a3e6c1f4b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('outbox_events', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Claimed events go back to the queue
+    op.execute("UPDATE outbox_events SET status = 'pending' WHERE status = 'processing'")
+    op.drop_column('outbox_events', 'claimed_at')
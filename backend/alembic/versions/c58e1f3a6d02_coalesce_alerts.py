@@ -0,0 +1,50 @@
+"""Coalesce alerts by workspace, type and subject
+
+Revision ID: c58e1f3a6d02
+Revises: 4a7e2d90c815
+Create Date: 2026-10-18 14:22:41.730968
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e1f3a6d02'
+down_revision: Union[str, Sequence[str], None] = '4a7e2d90c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('alerts', sa.Column('subject', sa.String(), server_default='', nullable=False))
+    op.add_column('alerts', sa.Column('occurrences', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('alerts', sa.Column('opened_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('alerts', sa.Column('last_seen_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    # Existing rows predate subjects; give each its own so the unique
+    # constraint holds, and keep their original timestamps.
+    op.execute("""
+        UPDATE alerts
+        SET subject = 'legacy:' || id,
+            opened_at = created_at,
+            last_seen_at = created_at
+    """)
+
+    op.create_unique_constraint('uq_alerts_workspace_type_subject', 'alerts', ['workspace_id', 'type', 'subject'])
+    op.drop_index('ix_alerts_workspace_unread', table_name='alerts')
+    op.create_index('ix_alerts_workspace_unread', 'alerts', ['workspace_id', 'is_read', 'last_seen_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alerts_workspace_unread', table_name='alerts')
+    op.create_index('ix_alerts_workspace_unread', 'alerts', ['workspace_id', 'is_read', 'created_at'], unique=False)
+    op.drop_constraint('uq_alerts_workspace_type_subject', 'alerts', type_='unique')
+    op.drop_column('alerts', 'last_seen_at')
+    op.drop_column('alerts', 'opened_at')
+    op.drop_column('alerts', 'occurrences')
+    op.drop_column('alerts', 'subject')
@@ -0,0 +1,28 @@
+"""Add booking index for slot lookups
+
+Revision ID: e2a8f41c93d7
+Revises: 7c3d5e8a1b26
+Create Date: 2026-10-18 12:41:52.118630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8f41c93d7'
+down_revision: Union[str, Sequence[str], None] = '7c3d5e8a1b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_service_id_start_time', 'bookings', ['service_id', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bookings_service_id_start_time', table_name='bookings')
@@ -0,0 +1,62 @@
+"""Add contact import jobs and staging table
+
+Revision ID: f3c07b5e9a21
+Revises: 6d2f8a3c1e57
+Create Date: 2026-10-18 17:31:40.118502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c07b5e9a21'
+down_revision: Union[str, Sequence[str], None] = '6d2f8a3c1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('contact_imports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('format', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('send_welcome', sa.Boolean(), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('invalid_rows', sa.Integer(), nullable=False),
+    sa.Column('inserted', sa.Integer(), nullable=False),
+    sa.Column('duplicates', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contact_imports_id'), 'contact_imports', ['id'], unique=False)
+    op.create_index(op.f('ix_contact_imports_workspace_id'), 'contact_imports', ['workspace_id'], unique=False)
+    op.create_table('contact_import_rows',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('import_id', sa.Integer(), nullable=False),
+    sa.Column('line', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('email_normalized', sa.String(), nullable=True),
+    sa.Column('phone_normalized', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['import_id'], ['contact_imports.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_contact_import_rows_import_id_id', 'contact_import_rows', ['import_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_import_rows_import_id_id', table_name='contact_import_rows')
+    op.drop_table('contact_import_rows')
+    op.drop_index(op.f('ix_contact_imports_workspace_id'), table_name='contact_imports')
+    op.drop_index(op.f('ix_contact_imports_id'), table_name='contact_imports')
+    op.drop_table('contact_imports')
@@ -1,10 +1,13 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "CareOps"
     VERSION: str = "0.1.0"
     API_V1_STR: str = "/api/v1"
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 500
     
     # Database
     POSTGRES_USER: str = "postgres"
@@ -14,10 +17,96 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "careops"
     DATABASE_URL: str | None = None
 
+    # Connection pool (Postgres)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800 # Seconds before a pooled connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: float = 30 # Seconds to wait for a connection before "QueuePool limit reached"
+
     # Security
     SECRET_KEY: str = "YOUR_SUPER_SECRET_KEY_CHANGE_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL: float = 60 # Seconds an authenticated user stays cached per worker
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12 # Existing hashes are upgraded/downgraded on next login
+    HASH_WORKERS: int = 0 # Concurrent bcrypt operations, 0 = number of CPUs
+    HASH_MAX_PENDING: int = 64 # Hashes allowed to wait for a worker before requests get 503
+
+    # Event bus
+    EVENT_WORKERS: int = 4
+    EVENT_QUEUE_SIZE: int = 1000
+    EVENT_QUEUE_PUT_TIMEOUT: float = 0.5 # Seconds to wait for queue space before the caller runs handlers itself
+    EVENT_DEFAULT_CONCURRENCY: int = 0 # Max concurrent handlers per event type, 0 = unlimited
+    EVENT_TYPE_CONCURRENCY: Dict[str, int] = {} # Per event type override, e.g. {"FORM_SUBMITTED": 2}
+
+    # Transactional outbox
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_POLL_INTERVAL: float = 1.0 # Seconds between polls when the outbox is drained
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETENTION_HOURS: int = 24 # Dispatched rows are purged after this
+    OUTBOX_LEASE_SECONDS: int = 300 # A claimed event is dispatched again if no result is recorded within this
+    OUTBOX_WAIT_TIMEOUT: float = 30 # Seconds the dispatcher waits on a batch before claiming the next one
+
+    # Dashboard
+    DASHBOARD_ALERT_LIMIT: int = 20 # Unread alerts returned with the stats
+    COUNTER_RECONCILE_INTERVAL: int = 900 # Seconds between counter drift checks, 0 disables
+
+    # Booking slots
+    SLOT_CACHE_TTL: int = 30 # Seconds; other workers' bookings show up after at most this
+    SLOT_CACHE_SIZE: int = 20000 # (service, day) entries
+    SLOT_MAX_RANGE_DAYS: int = 62
+
+    # Alerts
+    ALERT_SUPPRESSION_WINDOW_SECONDS: int = 3600 # Repeats of an alert within this window are not written
+
+    # Automation
+    RULE_INDEX_CHECK_INTERVAL: float = 2.0 # Seconds a worker trusts its rule index before re-checking the version
+
+    # Outbound delivery (email/SMS)
+    RESEND_API_URL: str = "https://api.resend.com"
+    TWILIO_API_URL: str = "https://api.twilio.com"
+    DELIVERY_DEFAULT_FROM: str = "CareOps <noreply@careops.app>"
+    DELIVERY_WORKERS: int = 4
+    DELIVERY_QUEUE_SIZE: int = 10000
+    DELIVERY_QUEUE_PUT_TIMEOUT: float = 1.0 # Seconds to wait for queue space before send() raises DeliveryBusy
+    DELIVERY_BATCH_SIZE: int = 100 # Messages a worker collects before sending
+    DELIVERY_LINGER_MS: int = 50 # How long a worker waits to fill a batch
+    DELIVERY_MAX_ATTEMPTS: int = 5
+    DELIVERY_BACKOFF_BASE: float = 1.0 # Seconds before the first retry, doubled per attempt
+    DELIVERY_BACKOFF_MAX: float = 300
+    DELIVERY_RATE_PER_WORKSPACE: float = 20 # Messages per second per workspace
+    DELIVERY_RATE_BURST: int = 100
+    DELIVERY_HTTP_TIMEOUT: float = 10
+    DELIVERY_MAX_CONNECTIONS: int = 20 # Per provider
+    DELIVERY_CONFIG_TTL: float = 30 # Seconds a worker caches a workspace's channel settings
+
+    # Bulk contact import
+    CONTACT_IMPORT_STAGE_ROWS: int = 5000 # Rows per COPY / multi-row INSERT into staging
+    CONTACT_IMPORT_MERGE_ROWS: int = 10000 # Staged rows merged into contacts per transaction
+    CONTACT_IMPORT_WELCOME_BATCH: int = 50 # Welcome events released together
+    CONTACT_IMPORT_WELCOME_PER_MINUTE: int = 300 # Per import; spreads welcome messages over time
+    CONTACT_IMPORT_STALE_AFTER: int = 900 # Seconds without progress before a pending/running import is failed
+    CONTACT_IMPORT_SWEEP_INTERVAL: float = 300 # Seconds between stale import sweeps; 0 disables
+
+    # Form validation
+    FORM_VALIDATOR_CACHE_SIZE: int = 1000 # Compiled template validators per worker
+    FORM_VALIDATOR_CACHE_TTL: int = 3600
+
+    # Exports
+    EXPORT_YIELD_PER: int = 1000 # Rows fetched per round trip from the server-side cursor
+    EXPORT_CHUNK_BYTES: int = 65536 # Response body chunk size
+
+    # Integration log
+    INTEGRATION_LOG_FLUSH_ROWS: int = 500 # Buffered rows that trigger a flush
+    INTEGRATION_LOG_FLUSH_MS: int = 1000 # Max time a row waits in the buffer
+    INTEGRATION_LOG_MAX_BUFFER: int = 50000 # Past this, writers flush inline
+    INTEGRATION_LOG_RETENTION_DAYS: int = 90
+    INTEGRATION_LOG_PARTITIONS_AHEAD: int = 2 # Monthly partitions created in advance (Postgres)
+    INTEGRATION_LOG_MAINTENANCE_INTERVAL: int = 3600 # Seconds between partition/retention runs, 0 disables
 
     class Config:
         env_file = ".env"
@@ -1,8 +1,92 @@
-from sqlalchemy import create_engine
+import ssl
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
 
-engine = create_engine(settings.sqlalchemy_database_uri)
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+class PoolStats:
+    """Checkout counters and wait-time histogram shared by every pool the engine recreates."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.max_wait_ms = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        wait_ms = seconds * 1000
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+            self.wait_buckets[index] += 1
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_5000ms"]
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self.wait_buckets)),
+            }
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+class _CheckoutTimer:
+    """
+    Pool mixin that records how long each checkout took: waiting for a free
+    connection, opening a new one and the pre-ping. Wraps the public
+    Pool.connect(), which the engine calls for every checkout; the pool events
+    only fire once a connection is in hand, so they cannot time the wait.
+    """
+
+    stats: PoolStats
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+class InstrumentedQueuePool(_CheckoutTimer, QueuePool):
+    stats = pool_stats
+
+class InstrumentedAsyncQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    stats = async_pool_stats
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite (tests, local scripts) keeps SQLAlchemy's default pooling. aiosqlite
+        # connections are bound to the event loop that opened them and are cheap
+        # to open, so the async engine does not pool them at all.
+        return {"poolclass": NullPool} if is_async else {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+engine = create_engine(settings.sqlalchemy_database_uri, **engine_options(settings.sqlalchemy_database_uri))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -13,3 +97,108 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def dialect_insert(db, table):
+    """INSERT construct with ON CONFLICT support for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(table)
+
+# libpq query parameters that asyncpg does not accept as connect() keywords.
+# sslmode / connect_timeout / application_name are translated in
+# async_connect_args, the rest are dropped from the async URL.
+_LIBPQ_ONLY = {
+    "sslmode", "sslrootcert", "sslcert", "sslkey", "sslcrl", "sslpassword", "sslcompression",
+    "connect_timeout", "application_name", "options", "gssencmode", "channel_binding",
+    "keepalives", "keepalives_idle", "keepalives_interval", "keepalives_count",
+}
+
+def async_database_uri(url: str) -> str:
+    parsed = make_url(url)
+    driver = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    if driver == "postgresql+asyncpg":
+        parsed = parsed.difference_update_query(_LIBPQ_ONLY)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def async_connect_args(url: str) -> Dict[str, Any]:
+    """asyncpg equivalents of the libpq parameters stripped by async_database_uri."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return {}
+    query = {key: value if isinstance(value, str) else value[-1] for key, value in parsed.query.items()}
+    args: Dict[str, Any] = {}
+    sslmode = query.get("sslmode")
+    if sslmode in ("verify-ca", "verify-full") and "sslrootcert" in query:
+        context = ssl.create_default_context(cafile=query["sslrootcert"])
+        context.check_hostname = sslmode == "verify-full"
+        if "sslcert" in query:
+            context.load_cert_chain(query["sslcert"], query.get("sslkey"))
+        args["ssl"] = context
+    elif sslmode:
+        # asyncpg takes the libpq mode names as-is for its ssl argument
+        args["ssl"] = sslmode
+    if "connect_timeout" in query:
+        args["timeout"] = float(query["connect_timeout"])
+    if "application_name" in query:
+        args["server_settings"] = {"application_name": query["application_name"]}
+    ignored = sorted(set(query) & _LIBPQ_ONLY - {"sslmode", "sslrootcert", "sslcert", "sslkey", "connect_timeout", "application_name"})
+    if ignored:
+        print(f"[DB] Ignoring libpq-only parameters for the async engine: {', '.join(ignored)}")
+    return args
+
+# The async engine is created on first use so deployments that never hit an
+# async endpoint do not need the async driver installed.
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker | None = None
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            async_database_uri(settings.sqlalchemy_database_uri),
+            connect_args=async_connect_args(settings.sqlalchemy_database_uri),
+            **engine_options(settings.sqlalchemy_database_uri, is_async=True),
+        )
+        # expire_on_commit=False: attributes stay readable after commit without
+        # an implicit (and in async code, forbidden) lazy refresh.
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+def _describe_pool(pool, stats: PoolStats) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()), # QueuePool counts up from -pool_size
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout": pool.timeout(),
+        })
+    status.update(stats.snapshot())
+    return status
+
+def get_pool_status() -> Dict[str, Any]:
+    status = _describe_pool(engine.pool, pool_stats)
+    if _async_engine is not None:
+        status["async"] = _describe_pool(_async_engine.pool, async_pool_stats)
+    return status
@@ -1,4 +1,12 @@
-from typing import Any, Dict, Callable, List
+import asyncio
+import inspect
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, Callable, List, Optional
+from app.core.config import settings
 
 subscribers: Dict[str, List[Callable]] = {}
 
@@ -7,14 +15,225 @@ def subscribe(event_type: str, handler: Callable):
         subscribers[event_type] = []
     subscribers[event_type].append(handler)
 
+class EventStats:
+    """Counters and recent latency samples for one event type."""
+
+    def __init__(self, window: int):
+        self.lock = threading.Lock()
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.inline = 0
+        self.in_flight = 0
+        self.queue_wait = deque(maxlen=window)
+        self.handler_time = deque(maxlen=window)
+
+    def count(self, field: str, delta: int = 1):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + delta)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "inline": self.inline,
+            "in_flight": self.in_flight,
+            "queue_wait_ms": _percentiles(self.queue_wait),
+            "handler_ms": _percentiles(self.handler_time),
+        }
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    pick = lambda q: round(ordered[min(last, int(q * len(ordered)))] * 1000, 3)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+class EventBus:
+    """
+    Bounded in-process dispatcher. emit() only enqueues; a pool of worker threads
+    runs the subscribed handlers. When the queue stays full for longer than
+    put_timeout the caller runs the handlers itself, which slows producers down
+    instead of dropping events.
+
+    An event type over its concurrency limit is parked rather than waited on,
+    so a burst of one type never holds the workers other types need; whichever
+    thread finishes a handler of that type runs the next parked event with the
+    slot it already holds.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        put_timeout: float,
+        type_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 0,
+        stats_window: int = 1000,
+    ):
+        self.workers = workers
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._type_concurrency = type_concurrency or {}
+        self._default_concurrency = default_concurrency
+        self._limits: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._parked: Dict[str, deque] = {}
+        self._stats: Dict[str, EventStats] = {}
+        self._stats_window = stats_window
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"event-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        print(f"[EVENT] Event bus started with {self.workers} workers (queue size {self._queue.maxsize})")
+
+    def stop(self, timeout: float = 10.0):
+        """Drain queued events, then stop the workers."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def submit(self, event_type: str, payload: Dict[str, Any]) -> Future:
+        """Queue an event. The returned future resolves to True once every handler succeeded."""
+        future: Future = Future()
+        stats = self._stats_for(event_type)
+        stats.count("enqueued")
+        if not self._running:
+            self._run((event_type, payload, future, None))
+            return future
+        try:
+            self._queue.put((event_type, payload, future, time.monotonic()), timeout=self.put_timeout)
+        except queue.Full:
+            # Backpressure: the producer pays for the work it cannot hand off.
+            stats.count("inline")
+            print(f"[EVENT] Queue full, dispatching {event_type} on caller thread")
+            self._run((event_type, payload, future, None))
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._running,
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "parked": {event_type: len(parked) for event_type, parked in list(self._parked.items()) if parked},
+            "events": {event_type: s.snapshot() for event_type, s in list(self._stats.items())},
+        }
+
+    def _stats_for(self, event_type: str) -> EventStats:
+        stats = self._stats.get(event_type)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(event_type, EventStats(self._stats_window))
+        return stats
+
+    def _limit_for(self, event_type: str) -> int:
+        limit = self._limits.get(event_type)
+        if limit is None:
+            limit = self._limits[event_type] = self._type_concurrency.get(event_type, self._default_concurrency)
+        return limit
+
+    def _claim(self, item) -> bool:
+        """Take a handler slot for the item's event type, or park the item until one frees up."""
+        event_type = item[0]
+        limit = self._limit_for(event_type)
+        if limit <= 0:
+            return True
+        with self._lock:
+            if self._active.get(event_type, 0) < limit:
+                self._active[event_type] = self._active.get(event_type, 0) + 1
+                return True
+            self._parked.setdefault(event_type, deque()).append(item)
+            return False
+
+    def _next_parked(self, event_type: str):
+        """Hand a finished handler's slot to the next parked event of its type, or free it."""
+        if self._limit_for(event_type) <= 0:
+            return None
+        with self._lock:
+            parked = self._parked.get(event_type)
+            if parked:
+                return parked.popleft()
+            self._active[event_type] -= 1
+            return None
+
+    def _run(self, item, loop=None):
+        if not self._claim(item):
+            return
+        while item is not None:
+            self._dispatch(*item, loop)
+            item = self._next_parked(item[0])
+
+    def _worker(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                self._run(item, loop)
+        finally:
+            loop.close()
+
+    def _dispatch(self, event_type, payload, future: Future, enqueued_at, loop=None):
+        stats = self._stats_for(event_type)
+        if enqueued_at is not None:
+            stats.queue_wait.append(time.monotonic() - enqueued_at)
+        stats.count("in_flight")
+        started = time.monotonic()
+        ok = True
+        try:
+            for handler in subscribers.get(event_type, []):
+                try:
+                    if inspect.iscoroutinefunction(handler):
+                        if loop is not None:
+                            loop.run_until_complete(handler(payload))
+                        else:
+                            asyncio.run(handler(payload))
+                    else:
+                        handler(payload)
+                except Exception as e:
+                    ok = False
+                    print(f"Error in event handler for {event_type}: {e}")
+        finally:
+            stats.count("in_flight", -1)
+        stats.handler_time.append(time.monotonic() - started)
+        stats.count("processed" if ok else "failed")
+        future.set_result(ok)
+
+bus = EventBus(
+    workers=settings.EVENT_WORKERS,
+    queue_size=settings.EVENT_QUEUE_SIZE,
+    put_timeout=settings.EVENT_QUEUE_PUT_TIMEOUT,
+    type_concurrency=settings.EVENT_TYPE_CONCURRENCY,
+    default_concurrency=settings.EVENT_DEFAULT_CONCURRENCY,
+)
+
 def emit(event_type: str, payload: Dict[str, Any]):
     print(f"[EVENT] {event_type} triggered with payload: {payload}")
-    if event_type in subscribers:
-        for handler in subscribers[event_type]:
-            try:
-                handler(payload)
-            except Exception as e:
-                print(f"Error in event handler for {event_type}: {e}")
+    bus.submit(event_type, payload)
 
 # Pre-defined attributes for known events
 NEW_CONTACT = "NEW_CONTACT"
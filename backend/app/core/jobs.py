@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Callable, List
+
+class PeriodicJob:
+    """Runs fn every `interval` seconds on a daemon thread until stopped."""
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], None], run_at_start: bool = False):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.run_at_start = run_at_start
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        if not self.run_at_start and self._stop.wait(self.interval):
+            return
+        while True:
+            started = time.monotonic()
+            try:
+                self.fn()
+            except Exception as e:
+                print(f"[JOBS] {self.name} failed: {e}")
+            if self._stop.wait(max(0.0, self.interval - (time.monotonic() - started))):
+                return
+
+jobs: List[PeriodicJob] = []
+
+def register(name: str, interval: float, fn: Callable[[], None], run_at_start: bool = False) -> PeriodicJob:
+    job = PeriodicJob(name, interval, fn, run_at_start)
+    jobs.append(job)
+    return job
+
+def start_all():
+    for job in jobs:
+        job.start()
+    if jobs:
+        print(f"[JOBS] Started {', '.join(job.name for job in jobs)}")
+
+def stop_all():
+    for job in jobs:
+        job.stop()
@@ -0,0 +1,187 @@
+import threading
+from concurrent.futures import wait
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core import events
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.system import OutboxEvent
+
+def add_event(db: Union[Session, AsyncSession], event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+    """
+    Record an event in the caller's transaction. It is dispatched only once the
+    transaction commits, and survives a crash between commit and dispatch.
+    """
+    event = OutboxEvent(event_type=event_type, payload=payload, status="pending", attempts=0)
+    db.add(event)
+    return event
+
+class OutboxDispatcher:
+    """
+    Drains outbox_events in batches under a lease. A short transaction claims
+    up to batch_size rows (FOR UPDATE SKIP LOCKED on Postgres, so several API
+    workers can drain the same table), marks them processing until
+    now + lease and commits; no transaction is open while the event bus runs
+    the handlers. Results are written back in a second short transaction.
+    Events still running after wait_timeout are settled when they finish, and
+    a claim whose worker died is picked up again once its lease runs out.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, max_attempts: int, retention_hours: int,
+                 lease_seconds: float = 300, wait_timeout: float = 30):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention = timedelta(hours=retention_hours)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.wait_timeout = wait_timeout
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_purge = datetime.min.replace(tzinfo=timezone.utc)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+        print(f"[OUTBOX] Dispatcher started (batch size {self.batch_size})")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self):
+        """Wake the dispatcher after a commit instead of waiting for the next poll."""
+        self._wake.set()
+
+    def run_once(self) -> int:
+        try:
+            found, claimed, claimed_at = self._claim()
+        except Exception as e:
+            print(f"[OUTBOX] Error claiming batch: {e}")
+            return 0
+        if not claimed:
+            return found
+
+        futures = {event_id: events.bus.submit(event_type, payload) for event_id, event_type, payload in claimed}
+        finished, running = wait(futures.values(), timeout=self.wait_timeout)
+        self._settle({event_id: future.result() for event_id, future in futures.items() if future in finished}, claimed_at)
+        for event_id, future in futures.items():
+            if future in running:
+                # Settled when the handler returns; until then the row stays claimed by its lease
+                future.add_done_callback(lambda f, event_id=event_id: self._settle({event_id: f.result()}, claimed_at))
+        if running:
+            print(f"[OUTBOX] {len(running)} events still running after {self.wait_timeout}s")
+        return found
+
+    def _claim(self) -> Tuple[int, List[Tuple[int, str, Dict[str, Any]]], datetime]:
+        """Claim due events and commit the lease. Returns (rows found, (id, type, payload) claimed, claim time)."""
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            batch = (
+                db.query(OutboxEvent)
+                .filter(OutboxEvent.status.in_(("pending", "processing")), OutboxEvent.available_at <= now)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            for event in batch:
+                if event.status == "processing":
+                    # The lease ran out without a result: the handler hung or its worker died
+                    event.attempts += 1
+                    event.last_error = "lease expired"
+                    if event.attempts >= self.max_attempts:
+                        event.status = "failed"
+                        continue
+                event.status = "processing"
+                event.claimed_at = now
+                event.available_at = now + self.lease
+                claimed.append((event.id, event.event_type, event.payload))
+            db.commit()
+            return len(batch), claimed, now
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _settle(self, results: Dict[int, bool], claimed_at: datetime):
+        """Record handler results for events still held by this claim."""
+        if not results:
+            return
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            mine = (OutboxEvent.status == "processing", OutboxEvent.claimed_at == claimed_at)
+            done = [event_id for event_id, ok in results.items() if ok]
+            if done:
+                db.query(OutboxEvent).filter(OutboxEvent.id.in_(done), *mine).update(
+                    {OutboxEvent.status: "dispatched", OutboxEvent.dispatched_at: now},
+                    synchronize_session=False,
+                )
+            failed = [event_id for event_id, ok in results.items() if not ok]
+            # Failures are rare, so these are updated one by one with their own backoff
+            for event in db.query(OutboxEvent).filter(OutboxEvent.id.in_(failed), *mine).all():
+                attempts = event.attempts + 1
+                event.attempts = attempts
+                event.last_error = "handler failed"
+                if attempts >= self.max_attempts:
+                    event.status = "failed"
+                else:
+                    event.status = "pending"
+                    event.available_at = now + timedelta(seconds=2 ** attempts)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[OUTBOX] Error recording results: {e}")
+        finally:
+            db.close()
+
+    def purge(self):
+        db = SessionLocal()
+        try:
+            cutoff = datetime.now(timezone.utc) - self.retention
+            deleted = db.query(OutboxEvent).filter(
+                OutboxEvent.status == "dispatched", OutboxEvent.dispatched_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                print(f"[OUTBOX] Purged {deleted} dispatched events")
+        except Exception as e:
+            db.rollback()
+            print(f"[OUTBOX] Error purging dispatched events: {e}")
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            claimed = self.run_once()
+            now = datetime.now(timezone.utc)
+            if now - self._last_purge > timedelta(hours=1):
+                self._last_purge = now
+                self.purge()
+            if claimed < self.batch_size:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+dispatcher = OutboxDispatcher(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    retention_hours=settings.OUTBOX_RETENTION_HOURS,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    wait_timeout=settings.OUTBOX_WAIT_TIMEOUT,
+)
+
+def notify():
+    dispatcher.notify()
@@ -1,13 +1,53 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a different cost than BCRYPT_ROUNDS report needs_update(), which
+# is what drives the rehash on login.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 ALGORITHM = settings.ALGORITHM
 
+class HashingBusy(Exception):
+    """Raised when the hashing pool already has as much work queued as it accepts."""
+
+class HashingExecutor:
+    """
+    Dedicated pool for bcrypt. At most `workers` hashes run at once, so a login
+    storm cannot take every request thread or CPU core, and at most
+    `max_pending` more may wait; anything beyond that is rejected straight away
+    instead of queueing behind work that will time out anyway.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self.rejected = 0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy()
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def run(self, fn: Callable, *args) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+hashing = HashingExecutor(
+    workers=settings.HASH_WORKERS or os.cpu_count() or 2,
+    max_pending=settings.HASH_MAX_PENDING,
+)
+
 def create_access_token(subject: str | Any, expires_delta: timedelta = None) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -18,8 +58,12 @@ def create_access_token(subject: str | Any, expires_delta: timedelta = None) ->
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing.submit(pwd_context.hash, password).result()
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Returns (valid, new_hash); new_hash is set when the stored hash uses an outdated cost."""
+    return await hashing.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing.run(pwd_context.hash, password)
@@ -1,11 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.routers import auth, workspaces, integrations, public, services, inventory, forms, staff, conversations, dashboard, automation as automation_router
+from app.routers import contacts, exports, internal
 from app.services import automation as automation_service
+from app.services import contact_import, counters, delivery, integration_log
+from app.core import events, jobs, outbox, security
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.database import dispose_async_engine
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.schemas.common import Detail
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION)
 
+if settings.COUNTER_RECONCILE_INTERVAL > 0:
+    jobs.register("reconcile-counters", settings.COUNTER_RECONCILE_INTERVAL, counters.reconcile_all)
+if settings.INTEGRATION_LOG_MAINTENANCE_INTERVAL > 0:
+    jobs.register("integration-log-maintenance", settings.INTEGRATION_LOG_MAINTENANCE_INTERVAL, integration_log.maintain, run_at_start=True)
+if settings.CONTACT_IMPORT_SWEEP_INTERVAL > 0:
+    jobs.register("sweep-contact-imports", settings.CONTACT_IMPORT_SWEEP_INTERVAL, contact_import.sweep_stale, run_at_start=True)
+
 # Set all CORS enabled origins
 app.add_middleware(
     CORSMiddleware,
@@ -13,11 +27,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+@app.exception_handler(security.HashingBusy)
+async def hashing_busy_handler(request: Request, exc: security.HashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many password operations in progress, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
 @app.on_event("startup")
 async def startup_event():
     automation_service.start_automation()
+    events.bus.start()
+    integration_log.writer.start()
+    delivery.service.start()
+    outbox.dispatcher.start()
+    jobs.start_all()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    jobs.stop_all()
+    outbox.dispatcher.stop()
+    events.bus.stop()
+    delivery.service.stop()
+    integration_log.writer.stop() # flushes what delivery just logged
+    await dispose_async_engine()
 
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}", tags=["auth"])
 app.include_router(workspaces.router, prefix=f"{settings.API_V1_STR}/workspaces", tags=["workspaces"])
@@ -29,8 +66,11 @@ app.include_router(staff.router, prefix=f"{settings.API_V1_STR}/workspaces/staff
 app.include_router(conversations.router, prefix=f"{settings.API_V1_STR}/workspaces/conversations", tags=["conversations"])
 app.include_router(dashboard.router, prefix=f"{settings.API_V1_STR}/workspaces/dashboard", tags=["dashboard"])
 app.include_router(automation_router.router, prefix=f"{settings.API_V1_STR}/workspaces/automation", tags=["automation"])
+app.include_router(contacts.router, prefix=f"{settings.API_V1_STR}/workspaces/contacts", tags=["contacts"])
+app.include_router(exports.router, prefix=f"{settings.API_V1_STR}/workspaces/exports", tags=["exports"])
 app.include_router(public.router, prefix=f"{settings.API_V1_STR}/public", tags=["public"])
+app.include_router(internal.router, prefix=f"{settings.API_V1_STR}/internal", tags=["internal"])
 
-@app.get("/")
+@app.get("/", response_model=Detail)
 def read_root():
     return {"message": "Welcome to CareOps API"}
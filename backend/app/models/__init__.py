@@ -1,7 +1,7 @@
-from .workspace import Workspace
+from .workspace import Workspace, WorkspaceCounters
 from .user import User
-from .crm import Contact, Conversation, Message
+from .crm import Contact, ContactImport, ContactImportRow, Conversation, Message
 from .operations import Service, Availability, Booking
 from .forms_inventory import FormTemplate, FormSubmission, InventoryItem, InventoryUsage, AutomationRule
-from .system import Alert, IntegrationLog
+from .system import Alert, IntegrationLog, OutboxEvent
 from app.core.database import Base
@@ -1,5 +1,8 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Text
-from sqlalchemy.orm import relationship
+import re
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, DateTime, Enum, Text, Index, DDL, event, update
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -13,6 +16,20 @@ class MessageType(str, enum.Enum):
     SMS = "sms"
     SYSTEM = "system"
 
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip().lower()
+    return email or None
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    # "+1 (555) 010-0199" -> "+15550100199"; only a leading + is kept
+    phone = (phone or "").strip()
+    digits = _NON_DIGITS.sub("", phone)
+    if not digits:
+        return None
+    return "+" + digits if phone.startswith("+") else digits
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -21,6 +38,9 @@ class Contact(Base):
     name = Column(String, nullable=False)
     email = Column(String, index=True, nullable=True) # Allow null if only phone is provided? Standard says email/phone.
     phone = Column(String, index=True, nullable=True)
+    # Match keys for deduplication, kept in step with email/phone by the validators below
+    email_normalized = Column(String, nullable=True)
+    phone_normalized = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     workspace = relationship("Workspace", back_populates="contacts")
@@ -28,6 +48,56 @@ class Contact(Base):
     bookings = relationship("Booking", back_populates="contact")
     form_submissions = relationship("FormSubmission", back_populates="contact")
 
+    __table_args__ = (
+        # NULLs are distinct, so contacts with only one of the two still coexist
+        Index("uq_contacts_workspace_email", "workspace_id", "email_normalized", unique=True),
+        Index("uq_contacts_workspace_phone", "workspace_id", "phone_normalized", unique=True),
+    )
+
+    @validates("email")
+    def _set_email_normalized(self, key, value):
+        self.email_normalized = normalize_email(value)
+        return value
+
+    @validates("phone")
+    def _set_phone_normalized(self, key, value):
+        self.phone_normalized = normalize_phone(value)
+        return value
+
+class ContactImport(Base):
+    __tablename__ = "contact_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
+    format = Column(String, nullable=False) # csv, ndjson
+    status = Column(String, nullable=False, default="pending") # pending, running, completed, failed
+    send_welcome = Column(Boolean, nullable=False, default=True)
+    total_rows = Column(Integer, nullable=False, default=0)
+    invalid_rows = Column(Integer, nullable=False, default=0) # Neither email nor phone
+    inserted = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0) # Matched an existing contact or an earlier row
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True) # Last progress; the sweeper fails jobs that stop moving
+
+class ContactImportRow(Base):
+    # Staging for bulk imports; rows are deleted once merged into contacts
+    __tablename__ = "contact_import_rows"
+
+    id = Column(Integer, primary_key=True)
+    import_id = Column(Integer, ForeignKey("contact_imports.id", ondelete="CASCADE"), nullable=False)
+    line = Column(Integer, nullable=False)
+    name = Column(String, nullable=False)
+    email = Column(String, nullable=True)
+    phone = Column(String, nullable=True)
+    email_normalized = Column(String, nullable=True)
+    phone_normalized = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_contact_import_rows_import_id_id", "import_id", "id"),
+    )
+
 class Conversation(Base):
     __tablename__ = "conversations"
 
@@ -35,11 +105,20 @@ class Conversation(Base):
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
     contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
     status = Column(String, default="active") # active, paused (if staff reply)
-    last_message_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Denormalized from messages by the after_insert hook below, so the inbox is one query.
+    # NOT NULL since the inbox pages on it; the Python default matches what the hook
+    # writes, so SQLite stores the text format the cursor is compared against.
+    last_message_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc), server_default=func.now())
+    last_message_preview = Column(String, nullable=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0") # Inbound messages since staff last read
 
     contact = relationship("Contact", back_populates="conversations")
     messages = relationship("Message", back_populates="conversation")
 
+    __table_args__ = (
+        Index("ix_conversations_workspace_last_message", "workspace_id", "last_message_at", "id"),
+    )
+
 class Message(Base):
     __tablename__ = "messages"
 
@@ -51,3 +130,58 @@ class Message(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
     conversation = relationship("Conversation", back_populates="messages")
+
+    __table_args__ = (
+        Index("ix_messages_conversation_timestamp", "conversation_id", "timestamp", "id"),
+    )
+
+# Full-text search over message content (see app/services/search.py). Postgres
+# keeps a generated tsvector column with a GIN index; it is not mapped, so the
+# ORM never reads or writes it. SQLite, used by tests and local scripts, keeps
+# an external-content FTS5 table in step with triggers.
+MESSAGE_SEARCH_CONFIG = "english"
+
+POSTGRES_MESSAGE_SEARCH_DDL = [
+    f"""ALTER TABLE messages ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('{MESSAGE_SEARCH_CONFIG}', coalesce(content, ''))) STORED""",
+    "CREATE INDEX ix_messages_search_vector ON messages USING gin (search_vector)",
+]
+
+SQLITE_MESSAGE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE messages_fts USING fts5(
+        content, content='messages', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END""",
+    """CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+    END""",
+    """CREATE TRIGGER messages_fts_update AFTER UPDATE OF content ON messages BEGIN
+        INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+        INSERT INTO messages_fts (rowid, content) VALUES (NEW.id, NEW.content);
+    END""",
+]
+
+for statement in POSTGRES_MESSAGE_SEARCH_DDL:
+    event.listen(Message.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_MESSAGE_SEARCH_DDL:
+    event.listen(Message.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+# The FTS table is not in the metadata, so drop it with messages
+event.listen(Message.__table__, "before_drop", DDL("DROP TABLE IF EXISTS messages_fts").execute_if(dialect="sqlite"))
+
+PREVIEW_LENGTH = 140
+
+@event.listens_for(Message, "after_insert")
+def update_conversation_summary(mapper, connection, message):
+    # Runs inside the flush that inserts the message, so the summary commits
+    # (or rolls back) together with it whichever code path added the message.
+    values = {
+        "last_message_at": message.timestamp or datetime.now(timezone.utc),
+        "last_message_preview": message.content[:PREVIEW_LENGTH],
+    }
+    if message.direction == MessageDirection.INBOUND:
+        values["unread_count"] = Conversation.unread_count + 1
+    connection.execute(
+        update(Conversation.__table__).where(Conversation.id == message.conversation_id).values(**values)
+    )
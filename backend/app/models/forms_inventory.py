@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, JSON, Index, Boolean, Computed, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -15,19 +16,24 @@ class FormTemplate(Base):
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
     name = Column(String, nullable=False)
-    schema = Column(JSON, nullable=False) # JSON schema for the form fields
+    schema = Column(JSON, nullable=False) # {"fields": [...]}, see app/services/form_validation.py
+    version = Column(Integer, nullable=False, default=1, server_default="1") # Bumped on every schema change
 
     workspace = relationship("Workspace", back_populates="form_templates")
     submissions = relationship("FormSubmission", back_populates="template")
     automation_rules = relationship("AutomationRule", back_populates="form_template")
 
+    __table_args__ = (
+        Index("ix_form_templates_workspace_id_id", "workspace_id", "id"),
+    )
+
 class FormSubmission(Base):
     __tablename__ = "form_submissions"
 
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("form_templates.id"), nullable=False)
     contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False)
-    data = Column(JSON, nullable=True)
+    data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True) # Filtered by app/services/submission_query.py
     status = Column(Enum(FormStatus), default=FormStatus.PENDING)
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     due_at = Column(DateTime(timezone=True), nullable=True)
@@ -35,6 +41,15 @@ class FormSubmission(Base):
     template = relationship("FormTemplate", back_populates="submissions")
     contact = relationship("Contact", back_populates="form_submissions")
 
+    __table_args__ = (
+        Index("ix_form_submissions_template_id_id", "template_id", "id"),
+        # Containment (@>) lookups on answers; Postgres only
+        Index(
+            "ix_form_submissions_data", "data",
+            postgresql_using="gin", postgresql_ops={"data": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
 
@@ -43,10 +58,21 @@ class InventoryItem(Base):
     name = Column(String, nullable=False)
     quantity = Column(Integer, default=0)
     low_stock_threshold = Column(Integer, default=5)
+    # Generated by the database, so every quantity or threshold change keeps it current
+    is_low_stock = Column(Boolean, Computed("quantity <= low_stock_threshold", persisted=True))
 
     workspace = relationship("Workspace", back_populates="inventory_items")
     usages = relationship("InventoryUsage", back_populates="item")
 
+    __table_args__ = (
+        Index("ix_inventory_items_workspace_name", "workspace_id", "name", "id"),
+        # Only low items are indexed, so the low-stock list stays small to read
+        Index(
+            "ix_inventory_items_low_stock", "workspace_id", "name", "id",
+            postgresql_where=text("is_low_stock"), sqlite_where=text("is_low_stock"),
+        ),
+    )
+
 class InventoryUsage(Base):
     __tablename__ = "inventory_usage"
 
@@ -75,3 +101,7 @@ class AutomationRule(Base):
 
     workspace = relationship("Workspace", back_populates="automation_rules")
     form_template = relationship("FormTemplate", back_populates="automation_rules")
+
+    __table_args__ = (
+        Index("ix_automation_rules_workspace_id_id", "workspace_id", "id"),
+    )
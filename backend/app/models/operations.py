@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Time
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Time, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -23,6 +23,10 @@ class Service(Base):
     availabilities = relationship("Availability", back_populates="service")
     bookings = relationship("Booking", back_populates="service")
 
+    __table_args__ = (
+        Index("ix_services_workspace_id_id", "workspace_id", "id"),
+    )
+
 class Availability(Base):
     __tablename__ = "availabilities"
 
@@ -47,3 +51,48 @@ class Booking(Base):
     service = relationship("Service", back_populates="bookings")
     contact = relationship("Contact", back_populates="bookings")
     inventory_usage = relationship("InventoryUsage", back_populates="booking")
+
+    __table_args__ = (
+        # Slot engine range scans
+        Index("ix_bookings_service_id_start_time", "service_id", "start_time"),
+    )
+
+# Overlapping bookings of a service are rejected by the database itself, so two
+# concurrent requests for the same slot cannot both commit. Postgres uses an
+# exclusion constraint over the booked time range (btree_gist provides the
+# equality operator class for service_id); SQLite, which serializes writers,
+# uses triggers that abort the statement. Both report this name.
+BOOKING_OVERLAP_CONSTRAINT = "bookings_no_overlap"
+
+POSTGRES_BOOKING_OVERLAP_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    f"""ALTER TABLE bookings ADD CONSTRAINT {BOOKING_OVERLAP_CONSTRAINT}
+        EXCLUDE USING gist (service_id WITH =, tstzrange(start_time, end_time) WITH &&)
+        WHERE (status IS DISTINCT FROM 'CANCELLED')""",
+]
+
+SQLITE_BOOKING_OVERLAP_DDL = [
+    f"""CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_insert BEFORE INSERT ON bookings
+        WHEN NEW.status IS NOT 'CANCELLED'
+        BEGIN
+            SELECT RAISE(ABORT, '{BOOKING_OVERLAP_CONSTRAINT}') WHERE EXISTS (
+                SELECT 1 FROM bookings
+                WHERE service_id = NEW.service_id AND status IS NOT 'CANCELLED'
+                AND start_time < NEW.end_time AND end_time > NEW.start_time
+            );
+        END""",
+    f"""CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_update BEFORE UPDATE OF service_id, start_time, end_time, status ON bookings
+        WHEN NEW.status IS NOT 'CANCELLED'
+        BEGIN
+            SELECT RAISE(ABORT, '{BOOKING_OVERLAP_CONSTRAINT}') WHERE EXISTS (
+                SELECT 1 FROM bookings
+                WHERE service_id = NEW.service_id AND status IS NOT 'CANCELLED' AND id != NEW.id
+                AND start_time < NEW.end_time AND end_time > NEW.start_time
+            );
+        END""",
+]
+
+for statement in POSTGRES_BOOKING_OVERLAP_DDL:
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_BOOKING_OVERLAP_DDL:
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
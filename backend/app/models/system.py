@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Text, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -9,13 +9,26 @@ class Alert(Base):
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
     type = Column(String, nullable=False) # e.g., "inventory_low", "form_overdue"
-    message = Column(String, nullable=False)
+    subject = Column(String, nullable=False, default="", server_default="") # What it is about, e.g. "inventory_item:42"
+    message = Column(String, nullable=False) # Latest occurrence's message
     is_read = Column(Boolean, default=False)
+    occurrences = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    opened_at = Column(DateTime(timezone=True), server_default=func.now()) # Start of the current unread episode
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now())
 
     workspace = relationship("Workspace", back_populates="alerts")
 
+    __table_args__ = (
+        # One row per (workspace, type, subject); repeats update it (services/alerts.py)
+        UniqueConstraint("workspace_id", "type", "subject", name="uq_alerts_workspace_type_subject"),
+        Index("ix_alerts_workspace_unread", "workspace_id", "is_read", "last_seen_at"),
+    )
+
 class IntegrationLog(Base):
+    # On Postgres this table is partitioned by month on timestamp, with a
+    # (id, timestamp) primary key; id alone stays the ORM identity. Rows are
+    # written through services.integration_log.writer.
     __tablename__ = "integration_logs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -24,3 +37,21 @@ class IntegrationLog(Base):
     status = Column(String, nullable=False) # success, failure
     details = Column(Text, nullable=True) # Error message or payload
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="pending") # pending, processing, dispatched, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now()) # Not claimed before this (retry backoff, or lease end while processing)
+    claimed_at = Column(DateTime(timezone=True), nullable=True) # Start of the current lease
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_events_status_available_at", "status", "available_at", "id"),
+    )
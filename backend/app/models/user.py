@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -17,3 +17,7 @@ class User(Base):
     workspace_id = Column(Integer, ForeignKey("workspaces.id"))
 
     workspace = relationship("Workspace", back_populates="users")
+
+    __table_args__ = (
+        Index("ix_users_workspace_role", "workspace_id", "role", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, JSON
+from sqlalchemy import Column, Integer, String, Enum, JSON, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 import enum
@@ -17,6 +17,7 @@ class Workspace(Base):
     contact_email = Column(String, nullable=False)
     status = Column(Enum(WorkspaceStatus), default=WorkspaceStatus.DRAFT)
     settings = Column(JSON, nullable=True) # For storing integration config (Twilio/Resend keys)
+    automation_rules_version = Column(Integer, nullable=False, default=0, server_default="0") # Bumped on rule changes, see services/rule_index.py
 
     users = relationship("User", back_populates="workspace")
     contacts = relationship("Contact", back_populates="workspace")
@@ -25,3 +26,19 @@ class Workspace(Base):
     inventory_items = relationship("InventoryItem", back_populates="workspace")
     automation_rules = relationship("AutomationRule", back_populates="workspace")
     alerts = relationship("Alert", back_populates="workspace")
+
+class WorkspaceCounters(Base):
+    """
+    Dashboard metrics maintained incrementally by the write paths, so the
+    dashboard is a primary-key read. services.counters reconciles them
+    against the source tables periodically.
+    """
+    __tablename__ = "workspace_counters"
+
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    contacts = Column(Integer, nullable=False, default=0, server_default="0")
+    active_conversations = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_forms = Column(Integer, nullable=False, default=0, server_default="0")
+    unread_alerts = Column(Integer, nullable=False, default=0, server_default="0")
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
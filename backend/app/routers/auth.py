@@ -2,29 +2,39 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core import security
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.user import User, UserRole
 from app.schemas.token import Token
 
 router = APIRouter()
 
 @router.post("/login/access-token", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     password = form_data.password
     if not password:
          raise HTTPException(status_code=400, detail="Password is required")
          
     # Try to find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
+    if not user:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    # bcrypt runs on the hashing pool, so the event loop keeps serving other requests
+    valid, new_hash = await security.verify_and_update_password(password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-         
 
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this password was stored
+        user.password_hash = new_hash
+        await db.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
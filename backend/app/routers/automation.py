@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.routers import deps
-from app.models.user import User
 from app.models.forms_inventory import AutomationRule, AutomationActionType, FormTemplate
-from pydantic import BaseModel
+from app.services.rule_index import bump_version, rule_index
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, List
+from app.schemas.common import Detail
 
 router = APIRouter()
 
@@ -17,16 +19,15 @@ class AutomationRuleCreate(BaseModel):
     is_active: int = 1
 
 class AutomationRuleOut(AutomationRuleCreate):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     workspace_id: int
-    
-    class Config:
-        orm_mode = True
 
 @router.post("/", response_model=AutomationRuleOut)
 def create_automation_rule(
     rule_in: AutomationRuleCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     # Verify template belongs to workspace
@@ -43,21 +44,26 @@ def create_automation_rule(
         is_active=rule_in.is_active
     )
     db.add(rule)
+    bump_version(db, current_user.workspace_id)
     db.commit()
+    rule_index.invalidate(current_user.workspace_id)
     db.refresh(rule)
     return rule
 
 @router.get("/", response_model=List[AutomationRuleOut])
 def list_automation_rules(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(AutomationRule).filter(AutomationRule.workspace_id == current_user.workspace_id).all()
+    query = db.query(AutomationRule).filter(AutomationRule.workspace_id == current_user.workspace_id)
+    return paginate(query, [AutomationRule.id], page, response)
 
-@router.delete("/{rule_id}")
+@router.delete("/{rule_id}", response_model=Detail)
 def delete_automation_rule(
     rule_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     rule = db.query(AutomationRule).filter(AutomationRule.id == rule_id, AutomationRule.workspace_id == current_user.workspace_id).first()
@@ -65,5 +71,7 @@ def delete_automation_rule(
         raise HTTPException(status_code=404, detail="Rule not found")
     
     db.delete(rule)
+    bump_version(db, current_user.workspace_id)
     db.commit()
+    rule_index.invalidate(current_user.workspace_id)
     return {"message": "Rule deleted"}
@@ -0,0 +1,70 @@
+import tempfile
+from datetime import datetime, timezone
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.models.crm import ContactImport
+from app.models.user import UserRole
+from app.routers import deps
+from app.services import contact_import
+from app.schemas.crm import ContactImportOut, ContactImportStarted
+
+router = APIRouter()
+
+# Uploads past this are spooled to disk instead of held in memory
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+def _run_import(import_id: int, upload):
+    try:
+        contact_import.run_import(import_id, upload)
+    finally:
+        upload.close()
+
+@router.post("/import", status_code=202, response_model=ContactImportStarted)
+async def import_contacts(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: str = "csv",
+    send_welcome: bool = True,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # The request body is the raw CSV (header row required) or NDJSON file.
+    # It is streamed to a temporary file and imported after the response.
+    if current_user.role != UserRole.OWNER:
+        raise HTTPException(status_code=403, detail="Only owners can import contacts")
+    if format not in contact_import.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(contact_import.FORMATS)}")
+
+    # Past SPOOL_MAX_BYTES the writes hit disk, so they run off the event loop
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(upload.write, chunk)
+        upload.seek(0)
+    except BaseException:
+        upload.close()
+        raise
+
+    # A job whose worker dies before it finishes is failed by contact_import.sweep_stale
+    job = ContactImport(
+        workspace_id=current_user.workspace_id, format=format, send_welcome=send_welcome, status="pending",
+        heartbeat_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    await db.commit()
+
+    background_tasks.add_task(_run_import, job.id, upload)
+    return {"id": job.id, "status": job.status}
+
+@router.get("/import/{import_id}", response_model=ContactImportOut)
+async def get_import(
+    import_id: int,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await db.get(ContactImport, import_id)
+    if not job or job.workspace_id != current_user.workspace_id:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.routers import deps
-from app.models.user import User
-from app.models.crm import Conversation, Message, MessageDirection, MessageType
+from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
 from app.core import events
+from app.core.pagination import PageParams, paginate
+from app.services import counters, search
 from pydantic import BaseModel
+from typing import List
+from app.schemas.crm import ConversationOut, ConversationRead, InboxItem, MessageOut, MessageSearchHit
 
 router = APIRouter()
 
@@ -13,31 +16,86 @@ class MessageCreate(BaseModel):
     content: str
     type: str = "email" # or sms
 
-@router.get("/")
+@router.get("/", response_model=List[ConversationOut])
 def list_conversations(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    # Return all conversations for workspace
-    return db.query(Conversation).filter(Conversation.workspace_id == current_user.workspace_id).all()
+    # Most recent activity first
+    query = db.query(Conversation).filter(Conversation.workspace_id == current_user.workspace_id)
+    return paginate(query, [Conversation.last_message_at, Conversation.id], page, response, descending=True)
 
-@router.get("/{conversation_id}/messages")
+@router.get("/inbox", response_model=List[InboxItem])
+def get_inbox(
+    response: Response,
+    page: PageParams = Depends(),
+    unread_only: bool = False,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    # One query: the preview and unread count are kept on the conversation row
+    query = db.query(
+        Conversation.id,
+        Conversation.status,
+        Conversation.last_message_at,
+        Conversation.last_message_preview,
+        Conversation.unread_count,
+        Conversation.contact_id,
+        Contact.name.label("contact_name"),
+    ).join(Contact, Contact.id == Conversation.contact_id).filter(Conversation.workspace_id == current_user.workspace_id)
+    if unread_only:
+        query = query.filter(Conversation.unread_count > 0)
+    return paginate(query, [Conversation.last_message_at, Conversation.id], page, response, descending=True)
+
+@router.get("/search", response_model=List[MessageSearchHit])
+def search_messages(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    # Best matches first; each hit carries its conversation and contact
+    if not search.has_terms(q):
+        raise HTTPException(status_code=400, detail="Search query has no words")
+    return search.search_messages(db, current_user.workspace_id, q, page, response)
+
+@router.post("/{conversation_id}/read", response_model=ConversationRead)
+def mark_conversation_read(
+    conversation_id: int,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    updated = db.query(Conversation).filter(
+        Conversation.id == conversation_id, Conversation.workspace_id == current_user.workspace_id
+    ).update({Conversation.unread_count: 0}, synchronize_session=False)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    db.commit()
+    return {"id": conversation_id, "unread_count": 0}
+
+@router.get("/{conversation_id}/messages", response_model=List[MessageOut])
 def get_messages(
     conversation_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    order: str = Query("asc", pattern="^(asc|desc)$"), # desc pages back from the newest message
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     conversation = db.query(Conversation).filter(Conversation.id == conversation_id, Conversation.workspace_id == current_user.workspace_id).first()
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return conversation.messages
+    query = db.query(Message).filter(Message.conversation_id == conversation.id)
+    return paginate(query, [Message.timestamp, Message.id], page, response, descending=order == "desc")
 
-@router.post("/{conversation_id}/messages")
+@router.post("/{conversation_id}/messages", response_model=MessageOut)
 def reply_to_conversation(
     conversation_id: int,
     message_in: MessageCreate,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     conversation = db.query(Conversation).filter(Conversation.id == conversation_id, Conversation.workspace_id == current_user.workspace_id).first()
@@ -52,13 +110,21 @@ def reply_to_conversation(
         content=message_in.content
     )
     db.add(msg)
+    # Replying means staff have read the thread
+    conversation.unread_count = 0
     
     # Logic: Staff reply pauses automation
+    paused = False
     if conversation.status != "paused":
+        if conversation.status == "active":
+            db.execute(counters.increment(conversation.workspace_id, active_conversations=-1))
         conversation.status = "paused"
+        paused = True
         print(f"[AUTOMATION] Paused automation for Conversation {conversation.id} due to STAFF_REPLY")
-        background_tasks.add_task(events.emit, events.STAFF_REPLY, {"conversation_id": conversation.id})
         
     db.commit()
     db.refresh(msg)
+    # Emit after commit so handlers on the event bus see the paused conversation
+    if paused:
+        events.emit(events.STAFF_REPLY, {"conversation_id": conversation.id})
     return msg
@@ -1,36 +1,51 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from app.core.config import settings
 from app.core.database import get_db
 from app.routers import deps
-from app.models.user import User
-from app.models.crm import Contact, Conversation
-from app.models.operations import Booking
-from app.models.forms_inventory import FormSubmission
 from app.models.system import Alert
+from app.services import alerts as alerts_service
+from app.services import counters as counters_service
+from app.schemas.system import AlertRead, DashboardStats
 
 router = APIRouter()
 
-@router.get("/stats")
+@router.get("/stats", response_model=DashboardStats)
 def get_dashboard_stats(
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     ws_id = current_user.workspace_id
     
-    total_bookings = db.query(Booking).join(Booking.service).filter(Booking.service.has(workspace_id=ws_id)).count()
-    total_contacts = db.query(Contact).filter(Contact.workspace_id == ws_id).count()
-    active_conversations = db.query(Conversation).filter(Conversation.workspace_id == ws_id, Conversation.status == "active").count()
-    pending_forms = db.query(FormSubmission).join(FormSubmission.template).filter(FormSubmission.template.has(workspace_id=ws_id), FormSubmission.status == "pending").count()
+    # Counters are maintained by the write paths; this is a primary-key read
+    counters = counters_service.get_counters(db, ws_id)
     
-    alerts = db.query(Alert).filter(Alert.workspace_id == ws_id, Alert.is_read == False).all()
+    alerts = (
+        db.query(Alert)
+        .filter(Alert.workspace_id == ws_id, Alert.is_read == False)
+        .order_by(Alert.last_seen_at.desc(), Alert.id.desc())
+        .limit(settings.DASHBOARD_ALERT_LIMIT)
+        .all()
+    )
     
     return {
         "metrics": {
-            "bookings": total_bookings,
-            "contacts": total_contacts,
-            "active_conversations": active_conversations,
-            "pending_forms": pending_forms
+            "bookings": counters.bookings,
+            "contacts": counters.contacts,
+            "active_conversations": counters.active_conversations,
+            "pending_forms": counters.pending_forms,
+            "unread_alerts": counters.unread_alerts
         },
         "alerts": alerts
     }
+
+@router.post("/alerts/{alert_id}/read", response_model=AlertRead)
+def mark_alert_read(
+    alert_id: int,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    if not alerts_service.mark_read(db, current_user.workspace_id, alert_id):
+        raise HTTPException(status_code=404, detail="Alert not found")
+    db.commit()
+    return {"id": alert_id, "is_read": True}
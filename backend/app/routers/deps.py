@@ -1,21 +1,56 @@
-from typing import Generator
+from dataclasses import dataclass
+from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
+from app.models.workspace import Workspace, WorkspaceStatus
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as seen by the routers. Plain data rather than an ORM
+    instance so it can be cached across requests and threads; routers that need
+    the full User or Workspace row load it explicitly.
+    """
+    id: int
+    email: str
+    role: UserRole
+    workspace_id: Optional[int]
+    workspace_status: Optional[WorkspaceStatus]
+
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    row = (
+        db.query(User.id, User.email, User.role, User.workspace_id, Workspace.status)
+        .outerjoin(Workspace, Workspace.id == User.workspace_id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not row:
+        return None
+    return Principal(id=row[0], email=row[1], role=row[2], workspace_id=row[3], workspace_status=row[4])
+
+def invalidate_user(user_id: int):
+    principal_cache.pop(user_id)
+
+def invalidate_workspace(workspace_id: int):
+    principal_cache.discard_where(lambda _, principal: principal.workspace_id == workspace_id)
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+) -> Principal:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -26,13 +61,25 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == int(token_data)).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
+    user_id = int(token_data)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # The session only checks out a connection on this miss path
+        principal = load_principal(db, user_id)
+        if not principal:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal_cache.set(user_id, principal)
+    return principal
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     # Logic to check if user is active if needed. For now just return user.
     return current_user
+
+def get_current_owner(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
+    if current_user.role != UserRole.OWNER:
+        raise HTTPException(status_code=403, detail="Only owners can do this")
+    return current_user
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app.routers import deps
+from app.services import exports
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+@router.get("/{kind}")
+def export(
+    kind: str,
+    format: str = "ndjson",
+    gzip: bool = False,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+):
+    # kind is one of messages, conversations, bookings, form_submissions.
+    # The body is produced row by row as the client reads it; gzip=true
+    # compresses on the fly and returns a .gz file.
+    if kind not in exports.EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export, expected one of {', '.join(exports.EXPORTS)}")
+    if format not in exports.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(exports.FORMATS)}")
+
+    filename = f"{kind}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        exports.stream(kind, current_user.workspace_id, format, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
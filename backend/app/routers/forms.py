@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.routers import deps
-from app.models.user import User
 from app.models.forms_inventory import FormTemplate, FormSubmission
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from app.services import form_validation, submission_query
+from app.schemas.forms_inventory import FormSubmissionOut, FormTemplateOut
 
 router = APIRouter()
 
@@ -13,12 +15,25 @@ class FormTemplateCreate(BaseModel):
     name: str
     schema: Dict[str, Any] # JSON schema
 
-@router.post("/")
+class FormTemplateUpdate(BaseModel):
+    name: Optional[str] = None
+    schema: Optional[Dict[str, Any]] = None
+
+def check_schema(schema: Dict[str, Any]):
+    # Compiling is the check; the cached validator is built on first submission
+    try:
+        form_validation.Validator(schema)
+    except form_validation.SchemaError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid schema: {e}")
+
+@router.post("/", response_model=FormTemplateOut)
 def create_form_template(
     form_in: FormTemplateCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    background_tasks: BackgroundTasks,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    check_schema(form_in.schema)
     form = FormTemplate(
         workspace_id=current_user.workspace_id,
         name=form_in.name,
@@ -27,22 +42,66 @@ def create_form_template(
     db.add(form)
     db.commit()
     db.refresh(form)
+    background_tasks.add_task(submission_query.sync_template_indexes, form.id)
+    return form
+
+@router.put("/{template_id}", response_model=FormTemplateOut)
+def update_form_template(
+    template_id: int,
+    form_in: FormTemplateUpdate,
+    background_tasks: BackgroundTasks,
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    form = db.query(FormTemplate).filter(
+        FormTemplate.id == template_id, FormTemplate.workspace_id == current_user.workspace_id
+    ).first()
+    if not form:
+        raise HTTPException(status_code=404, detail="Form template not found")
+    if form_in.name is not None:
+        form.name = form_in.name
+    if form_in.schema is not None and form_in.schema != form.schema:
+        check_schema(form_in.schema)
+        form.schema = form_in.schema
+        # Submissions in flight on other workers pick up the new version on their next template read
+        form.version = FormTemplate.version + 1
+    db.commit()
+    db.refresh(form)
+    form_validation.invalidate(form.id)
+    background_tasks.add_task(submission_query.sync_template_indexes, form.id)
     return form
 
-@router.get("/")
+@router.get("/", response_model=List[FormTemplateOut])
 def list_forms(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(FormTemplate).filter(FormTemplate.workspace_id == current_user.workspace_id).all()
+    query = db.query(FormTemplate).filter(FormTemplate.workspace_id == current_user.workspace_id)
+    return paginate(query, [FormTemplate.id], page, response)
 
-@router.get("/submissions")
+@router.get("/submissions", response_model=List[FormSubmissionOut])
 def list_submissions(
+    response: Response,
     template_id: int = None,
-    current_user: User = Depends(deps.get_current_active_user),
+    where: List[str] = Query([], description="Answer filters as field:op:value, op one of eq, contains, gt, gte, lt, lte"),
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(FormSubmission).join(FormTemplate).filter(FormTemplate.workspace_id == current_user.workspace_id)
+    schema = None
     if template_id:
+        schema = db.query(FormTemplate.schema).filter(
+            FormTemplate.id == template_id, FormTemplate.workspace_id == current_user.workspace_id
+        ).scalar()
+        if schema is None:
+            raise HTTPException(status_code=404, detail="Form template not found")
         query = query.filter(FormSubmission.template_id == template_id)
-    return query.order_by(FormSubmission.submitted_at.desc()).all()
+    try:
+        query = submission_query.apply_filters(db, query, where, schema)
+    except submission_query.FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Newest first by id: submitted_at is nullable, which keyset pagination cannot order on
+    return paginate(query, [FormSubmission.id], page, response, descending=True)
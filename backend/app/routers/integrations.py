@@ -2,23 +2,28 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.routers import deps
-from app.models.user import User
 from app.models.workspace import Workspace
-from app.models.system import IntegrationLog
+from app.services import delivery
 from pydantic import BaseModel
+from typing import Optional
+from app.schemas.common import Detail
+from app.schemas.workspace import IntegrationsUpdated
 
 router = APIRouter()
 
 class IntegrationConfig(BaseModel):
-    channels: dict # e.g. {"email": {"provider": "resend", "api_key": "..."}}
+    # e.g. {"email": {"provider": "resend", "api_key": "...", "from": "Clinic <hi@clinic.com>"},
+    #       "sms": {"provider": "twilio", "account_sid": "...", "auth_token": "...", "from": "+15550100"}}
+    # A bare string instead of an object is treated as a demo key and delivered by the mock provider.
+    channels: dict
 
-@router.put("/me/integrations")
+@router.put("/me/integrations", response_model=IntegrationsUpdated)
 def update_integrations(
     config: IntegrationConfig,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    workspace = current_user.workspace
+    workspace = db.query(Workspace).filter(Workspace.id == current_user.workspace_id).first()
     if not workspace:
          raise HTTPException(status_code=404, detail="Workspace not found")
          
@@ -35,29 +40,38 @@ def update_integrations(
     flag_modified(workspace, "settings")
     
     db.commit()
+    delivery.invalidate_config(workspace.id)
     return {"message": "Integrations updated", "settings": workspace.settings}
 
-@router.post("/me/integrations/test")
+@router.post("/me/integrations/test", response_model=Detail)
 def test_integration(
     channel: str = Body(..., embed=True),
-    current_user: User = Depends(deps.get_current_active_user),
+    to: Optional[str] = Body(None, embed=True), # Defaults to the workspace contact email for email
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    workspace = current_user.workspace
+    workspace = db.query(Workspace).filter(Workspace.id == current_user.workspace_id).first()
+    if not workspace:
+         raise HTTPException(status_code=404, detail="Workspace not found")
     settings = workspace.settings or {}
     
     if channel not in settings:
         raise HTTPException(status_code=400, detail=f"Channel {channel} not configured")
         
-    # Mock sending
-    # Log the attempt
-    log = IntegrationLog(
+    to = to or (workspace.contact_email if channel == "email" else None)
+    if not to:
+        raise HTTPException(status_code=400, detail=f"A recipient is required to test {channel}")
+        
+    # One synchronous attempt so the result can be reported; it is logged to IntegrationLog
+    result = delivery.service.send_now(delivery.OutboundMessage(
         workspace_id=workspace.id,
-        integration_type=channel,
-        status="success", # Mock success
-        details=f"Test message sent via {channel}"
-    )
-    db.add(log)
-    db.commit()
+        channel=channel,
+        to=to,
+        subject="CareOps test message",
+        body=f"This is a test message from {workspace.name} via {channel}.",
+        kind="test",
+    ))
+    if not result.ok:
+        raise HTTPException(status_code=400, detail=f"Test {channel} failed: {result.detail}")
     
     return {"message": f"Test {channel} sent successfully"}
@@ -0,0 +1,29 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+from app.core import events
+from app.core.database import get_pool_status
+from app.routers import deps
+from app.services import delivery, integration_log
+
+router = APIRouter()
+
+# Process-wide figures, not scoped to a workspace: owners only
+
+@router.get("/events", response_model=Dict[str, Any])
+def get_event_stats(
+    current_user: deps.Principal = Depends(deps.get_current_owner),
+):
+    # Process-local: each uvicorn worker reports its own bus.
+    return events.bus.stats()
+
+@router.get("/db-pool", response_model=Dict[str, Any])
+def get_db_pool_stats(
+    current_user: deps.Principal = Depends(deps.get_current_owner),
+):
+    return get_pool_status()
+
+@router.get("/delivery", response_model=Dict[str, Any])
+def get_delivery_stats(
+    current_user: deps.Principal = Depends(deps.get_current_owner),
+):
+    return dict(delivery.service.stats(), log_writer=integration_log.writer.stats())
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core import events, outbox
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.routers import deps
-from app.models.user import User
 from app.models.forms_inventory import InventoryItem, InventoryUsage
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas.forms_inventory import InventoryItemOut
 
 router = APIRouter()
 
@@ -13,10 +17,10 @@ class InventoryItemCreate(BaseModel):
     quantity: int
     low_stock_threshold: int = 5
 
-@router.post("/")
+@router.post("/", response_model=InventoryItemOut)
 def create_inventory_item(
     item_in: InventoryItemCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     item = InventoryItem(
@@ -26,40 +30,79 @@ def create_inventory_item(
         low_stock_threshold=item_in.low_stock_threshold
     )
     db.add(item)
+    db.flush()
+    if item_in.quantity <= item_in.low_stock_threshold:
+        outbox.add_event(db, events.INVENTORY_LOW, {"item_id": item.id, "workspace_id": item.workspace_id})
     db.commit()
+    outbox.notify()
     db.refresh(item)
     return item
 
-@router.get("/")
+@router.get("/", response_model=List[InventoryItemOut])
 def list_inventory(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(InventoryItem).filter(InventoryItem.workspace_id == current_user.workspace_id).all() # Should order by name?
+    query = db.query(InventoryItem).filter(InventoryItem.workspace_id == current_user.workspace_id)
+    return paginate(query, [InventoryItem.name, InventoryItem.id], page, response)
+
+@router.get("/low-stock", response_model=List[InventoryItemOut])
+def list_low_stock(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    # Served by the partial index on low items only
+    query = db.query(InventoryItem).filter(InventoryItem.workspace_id == current_user.workspace_id, InventoryItem.is_low_stock == True)
+    return paginate(query, [InventoryItem.name, InventoryItem.id], page, response)
 
 class InventoryUsageCreate(BaseModel):
     item_id: int
-    quantity_used: int
-    booking_id: int = None # Optional linking
+    quantity_used: int = Field(gt=0)
+    booking_id: Optional[int] = None # Optional linking
 
-@router.post("/usage")
+@router.post("/usage", response_model=InventoryItemOut)
 def record_usage(
     usage_in: InventoryUsageCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    item = db.query(InventoryItem).filter(InventoryItem.id == usage_in.item_id, InventoryItem.workspace_id == current_user.workspace_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Inventory item not found")
-    
-    # Check quantity
-    if item.quantity < usage_in.quantity_used:
+    # One conditional UPDATE: the check and the decrement happen under the row
+    # lock, so concurrent usages cannot overwrite each other.
+    item = db.execute(
+        update(InventoryItem)
+        .where(
+            InventoryItem.id == usage_in.item_id,
+            InventoryItem.workspace_id == current_user.workspace_id,
+            InventoryItem.quantity >= usage_in.quantity_used,
+        )
+        .values(quantity=InventoryItem.quantity - usage_in.quantity_used)
+        .returning(
+            InventoryItem.id,
+            InventoryItem.workspace_id,
+            InventoryItem.name,
+            InventoryItem.quantity,
+            InventoryItem.low_stock_threshold,
+            InventoryItem.is_low_stock,
+        )
+        .execution_options(synchronize_session=False)
+    ).first()
+    if item is None:
+        exists = db.query(InventoryItem.id).filter(InventoryItem.id == usage_in.item_id, InventoryItem.workspace_id == current_user.workspace_id).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Inventory item not found")
         raise HTTPException(status_code=400, detail="Insufficient quantity")
 
-    item.quantity -= usage_in.quantity_used
+    # Only the usage that takes the item from above the threshold to at or
+    # below it raises the alert; later usages of an already-low item do not.
+    previous_quantity = item.quantity + usage_in.quantity_used
+    if item.quantity <= item.low_stock_threshold < previous_quantity:
+        outbox.add_event(db, events.INVENTORY_LOW, {"item_id": item.id, "workspace_id": item.workspace_id})
     
     if usage_in.booking_id:
-        from app.models.forms_inventory import InventoryUsage
         usage = InventoryUsage(
             booking_id=usage_in.booking_id,
             item_id=item.id,
@@ -68,24 +111,28 @@ def record_usage(
         db.add(usage)
     
     db.commit()
-    db.refresh(item)
+    outbox.notify()
     return item
 
-@router.put("/{item_id}")
+@router.put("/{item_id}", response_model=InventoryItemOut)
 def update_inventory_item(
     item_id: int,
     item_in: InventoryItemCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     item = db.query(InventoryItem).filter(InventoryItem.id == item_id, InventoryItem.workspace_id == current_user.workspace_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     
+    was_low = item.is_low_stock
     item.name = item_in.name
     item.quantity = item_in.quantity
     item.low_stock_threshold = item_in.low_stock_threshold
+    if not was_low and item_in.quantity <= item_in.low_stock_threshold:
+        outbox.add_event(db, events.INVENTORY_LOW, {"item_id": item.id, "workspace_id": item.workspace_id})
     
     db.commit()
+    outbox.notify()
     db.refresh(item)
     return item
@@ -1,21 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.public import ContactFormSubmit, ContactResponse, FormSubmissionCreate
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.schemas.public import BookingResponse, ContactFormSubmit, ContactResponse, FormSubmissionCreate, FormSubmissionResponse, SlotsResponse
 from pydantic import BaseModel
 from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
 from app.models.workspace import Workspace, WorkspaceStatus
+from app.models.operations import Service, Booking, BOOKING_OVERLAP_CONSTRAINT
 from app.models.forms_inventory import FormTemplate, FormSubmission
-from app.core import events
+from app.core import events, outbox
+from app.core.config import settings
+from app.services import contacts, counters, form_validation, slots
 
 router = APIRouter()
 
+# The public widget endpoints are async on the asyncpg engine: they take the
+# traffic spikes, and on the sync engine each request pinned a threadpool slot
+# for every round trip.
+
 @router.post("/workspaces/{workspace_id}/contact", response_model=ContactResponse)
-def submit_contact_form(
+async def submit_contact_form(
     workspace_id: int,
     form_in: ContactFormSubmit,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if workspace exists and is active (or draft if we are testing onboarding)
     # The requirement says "Step 1... Step 2... Step 3: Contact Form... Public form".
@@ -23,48 +33,39 @@ def submit_contact_form(
     # This suggests forms might NOT be live in draft mode?
     # But for "Onboarding Flow", the user steps seem to verify things.
     # Let's allow it for now, or just check existence.
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
+    workspace = await db.get(Workspace, workspace_id)
     if not workspace:
         raise HTTPException(status_code=404, detail="Workspace not found")
         
     if not form_in.email and not form_in.phone:
         raise HTTPException(status_code=400, detail="Email or Phone is required")
 
-    # Check for existing contact or create new
-    contact = None
-    if form_in.email:
-        contact = db.query(Contact).filter(Contact.email == form_in.email, Contact.workspace_id == workspace_id).first()
-    
-    if not contact and form_in.phone:
-        contact = db.query(Contact).filter(Contact.phone == form_in.phone, Contact.workspace_id == workspace_id).first()
-        
-    if not contact:
-        contact = Contact(
-            workspace_id=workspace_id,
-            name=form_in.name,
-            email=form_in.email,
-            phone=form_in.phone
+    try:
+        contact_id, created = await contacts.upsert_contact(
+            db, workspace_id, form_in.name, email=form_in.email, phone=form_in.phone
         )
-        db.add(contact)
-        db.commit()
-        db.refresh(contact)
-        
-        # Trigger NEW_CONTACT event
-        background_tasks.add_task(events.emit, events.NEW_CONTACT, {"contact_id": contact.id, "workspace_id": workspace_id})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Email or Phone is required")
+    if created:
+        # Trigger NEW_CONTACT event (written to the outbox in the same transaction)
+        outbox.add_event(db, events.NEW_CONTACT, {"contact_id": contact_id, "workspace_id": workspace_id})
+        await db.execute(counters.increment(workspace_id, contacts=1))
 
     # Create Conversation if message provided
     if form_in.message:
         # Find active conversation or create new
-        conversation = db.query(Conversation).filter(Conversation.contact_id == contact.id).first() # Simplified: one conv per contact
+        conversation = (await db.execute(
+            select(Conversation).where(Conversation.contact_id == contact_id).limit(1)
+        )).scalars().first() # Simplified: one conv per contact
         if not conversation:
             conversation = Conversation(
                 workspace_id=workspace_id,
-                contact_id=contact.id,
+                contact_id=contact_id,
                 status="active"
             )
             db.add(conversation)
-            db.commit()
-            db.refresh(conversation)
+            await db.flush()
+            await db.execute(counters.increment(workspace_id, active_conversations=1))
             
         message = Message(
             conversation_id=conversation.id,
@@ -73,36 +74,53 @@ def submit_contact_form(
             content=form_in.message
         )
         db.add(message)
-        db.commit()
 
-    return {"id": contact.id, "message": "Contact submitted successfully"}
+    await db.commit()
+    outbox.notify()
+
+    return {"id": contact_id, "message": "Contact submitted successfully"}
 
 class BookingCreate(BaseModel):
     service_id: int
     contact_id: int # In real flow, token or look up via session. For prototype, ID.
     start_time: str # ISO format
 
-@router.post("/workspaces/{workspace_id}/bookings", response_model=dict)
-def create_booking(
+@router.post("/workspaces/{workspace_id}/bookings", response_model=BookingResponse)
+async def create_booking(
     workspace_id: int,
     booking_in: BookingCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    workspace = await db.get(Workspace, workspace_id)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+    tz = slots.workspace_zone(workspace.timezone)
+
     # Validate Service
-    service = db.query(Service).filter(Service.id == booking_in.service_id, Service.workspace_id == workspace_id).first()
+    service = (await db.execute(
+        select(Service).where(Service.id == booking_in.service_id, Service.workspace_id == workspace_id)
+    )).scalars().first()
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
         
-    contact = db.query(Contact).filter(Contact.id == booking_in.contact_id).first()
+    contact = await db.get(Contact, booking_in.contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
         
     # Create Booking
-    # Simplified time parsing
-    from  dateutil import parser
-    start_time = parser.parse(booking_in.start_time)
-    end_time = start_time + __import__("datetime").timedelta(minutes=service.duration)
+    try:
+        start_time = datetime.fromisoformat(booking_in.start_time)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_time must be an ISO 8601 datetime")
+    if start_time.tzinfo is None:
+        # Times without an offset are wall-clock times at the business
+        start_time = start_time.replace(tzinfo=tz)
+    start_time = slots.as_utc(start_time)
+    if start_time <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=400, detail="Cannot book a time in the past")
+    if not await slots.is_free_slot(db, service, tz, start_time):
+        raise HTTPException(status_code=409, detail="Selected time is not available")
+    end_time = start_time + timedelta(minutes=service.duration)
     
     booking = Booking(
         service_id=service.id,
@@ -112,74 +130,115 @@ def create_booking(
         status="confirmed"
     )
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        # The check above is only advisory: a concurrent request can take the
+        # slot before this insert, and the database constraint decides.
+        if BOOKING_OVERLAP_CONSTRAINT not in str(e.orig):
+            raise
+        await db.rollback() # expires service, so use the request's id below
+        slots.invalidate(booking_in.service_id, start_time)
+        raise HTTPException(status_code=409, detail="Selected time is not available")
     
     # Trigger Booking Event
-    background_tasks.add_task(events.emit, events.BOOKING_CREATED, {"booking_id": booking.id, "workspace_id": workspace_id})
+    outbox.add_event(db, events.BOOKING_CREATED, {"booking_id": booking.id, "workspace_id": workspace_id})
+    await db.execute(counters.increment(workspace_id, bookings=1))
     
-    # Inventory Logic (Mock Usage)
-    # Decrease 1 from first item found? Or defined in Service?
-    # Requirement: "Usage per booking".
-    # Implementation: Just decrease first item for demo if mapped.
-    # We didn't implement Service->Inventory mapping in data model yet (Constraints said "No extra tables").
-    # So we'll skip automatic decrement unless we hardcode it or add the relation.
-    # Let's check if any inventory is "low" just to trigger event for demo.
-    items = db.query(InventoryItem).filter(InventoryItem.workspace_id == workspace_id).all()
-    for item in items:
-        if item.quantity <= item.low_stock_threshold:
-             background_tasks.add_task(events.emit, events.INVENTORY_LOW, {"item_id": item.id})
+    # Low stock is raised when usage is recorded (see routers/inventory.py),
+    # so booking does no inventory work.
+    await db.commit()
+    outbox.notify()
+    slots.invalidate(service.id, start_time)
 
     return {"id": booking.id, "status": "confirmed", "message": "Booking created"}
 
-@router.post("/forms/{template_id}/submit", response_model=dict)
-def submit_form_template(
+@router.get("/workspaces/{workspace_id}/services/{service_id}/slots", response_model=SlotsResponse)
+async def list_slots(
+    workspace_id: int,
+    service_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # start/end are local dates at the business, both inclusive; defaults to the next 30 days
+    workspace = await db.get(Workspace, workspace_id)
+    if not workspace:
+        raise HTTPException(status_code=404, detail="Workspace not found")
+    service = (await db.execute(
+        select(Service).where(Service.id == service_id, Service.workspace_id == workspace_id)
+    )).scalars().first()
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    tz = slots.workspace_zone(workspace.timezone)
+    now = datetime.now(timezone.utc)
+    first_day = start or now.astimezone(tz).date()
+    last_day = end or first_day + timedelta(days=29)
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (last_day - first_day).days >= settings.SLOT_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {settings.SLOT_MAX_RANGE_DAYS} days")
+
+    by_day = await slots.get_slots(db, service, tz, first_day, last_day)
+    return {
+        "service_id": service.id,
+        "duration": service.duration,
+        "timezone": str(tz),
+        "slots": [
+            {"start": slot_start.astimezone(tz).isoformat(), "end": slot_end.astimezone(tz).isoformat()}
+            for day in sorted(by_day)
+            for slot_start, slot_end in by_day[day]
+            if slot_start > now
+        ],
+    }
+
+@router.post("/forms/{template_id}/submit", response_model=FormSubmissionResponse)
+async def submit_form_template(
     template_id: int,
     submission_in: FormSubmissionCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 1. Get Template
-    template = db.query(FormTemplate).filter(FormTemplate.id == template_id).first()
+    template = await db.get(FormTemplate, template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Form template not found")
 
+    errors = form_validation.validate(template, submission_in.data)
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
     # 2. Find or Create Contact
-    contact = None
-    if submission_in.contact_email:
-        contact = db.query(Contact).filter(Contact.email == submission_in.contact_email, Contact.workspace_id == template.workspace_id).first()
-    if not contact and submission_in.contact_phone:
-        contact = db.query(Contact).filter(Contact.phone == submission_in.contact_phone, Contact.workspace_id == template.workspace_id).first()
-    
-    if not contact:
-        # Require at least one contact method if creating new contact?
-        # Or just store as anonymous? System usually requires contact for leads.
-        if not submission_in.contact_email and not submission_in.contact_phone:
-             raise HTTPException(status_code=400, detail="Email or Phone is required to create a contact")
-             
-        contact = Contact(
-            workspace_id=template.workspace_id,
-            name=submission_in.data.get("name") or submission_in.data.get("Name") or "Unknown",
+    if not submission_in.contact_email and not submission_in.contact_phone:
+        raise HTTPException(status_code=400, detail="Email or Phone is required to create a contact")
+    try:
+        contact_id, created = await contacts.upsert_contact(
+            db,
+            template.workspace_id,
+            submission_in.data.get("name") or submission_in.data.get("Name") or "Unknown",
             email=submission_in.contact_email,
-            phone=submission_in.contact_phone
+            phone=submission_in.contact_phone,
         )
-        db.add(contact)
-        db.commit()
-        db.refresh(contact)
-        background_tasks.add_task(events.emit, events.NEW_CONTACT, {"contact_id": contact.id, "workspace_id": template.workspace_id})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Email or Phone is required to create a contact")
+    if created:
+        outbox.add_event(db, events.NEW_CONTACT, {"contact_id": contact_id, "workspace_id": template.workspace_id})
+        await db.execute(counters.increment(template.workspace_id, contacts=1))
 
     # 3. Create Submission
     submission = FormSubmission(
         template_id=template.id,
-        contact_id=contact.id,
+        contact_id=contact_id,
         data=submission_in.data,
         status="pending"
     )
     db.add(submission)
-    db.commit()
-    db.refresh(submission)
+    await db.flush()
+    await db.execute(counters.increment(template.workspace_id, pending_forms=1))
 
     # 4. Trigger Automation
-    background_tasks.add_task(events.emit, events.FORM_SUBMITTED, {"submission_id": submission.id, "workspace_id": template.workspace_id})
+    outbox.add_event(db, events.FORM_SUBMITTED, {"submission_id": submission.id, "workspace_id": template.workspace_id, "template_id": template.id})
+    await db.commit()
+    outbox.notify()
 
     return {"id": submission.id, "message": "Form submitted successfully"}
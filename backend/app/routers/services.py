@@ -1,42 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import PageParams, paginate
 from app.routers import deps
-from app.models.user import User
 from app.models.operations import Service, Availability
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional
+from datetime import time, timedelta
+from app.schemas.operations import ServiceOut
+from app.services.slots import MAX_BOOKING_LENGTH
 
 router = APIRouter()
 
 class AvailabilityCreate(BaseModel):
-    day_of_week: int
-    start_time: str
-    end_time: str
+    day_of_week: int = Field(ge=0, le=6) # 0=Monday
+    start_time: time # "09:00", in the workspace timezone
+    end_time: time
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
 
 class ServiceCreate(BaseModel):
     name: str
-    duration: int
+    duration: int = Field(gt=0, le=MAX_BOOKING_LENGTH // timedelta(minutes=1)) # minutes
     location: Optional[str] = None
     availabilities: List[AvailabilityCreate]
 
-@router.post("/")
+@router.post("/", response_model=ServiceOut)
 def create_service(
     service_in: ServiceCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    workspace = current_user.workspace
-    
     service = Service(
-        workspace_id=workspace.id,
+        workspace_id=current_user.workspace_id,
         name=service_in.name,
         duration=service_in.duration,
         location=service_in.location
     )
     db.add(service)
-    db.commit()
-    db.refresh(service)
+    # One transaction: slot lookups must not see (and cache) the service without its availability
+    db.flush()
     
     for avail in service_in.availabilities:
         db_avail = Availability(
@@ -48,11 +55,15 @@ def create_service(
         db.add(db_avail)
     
     db.commit()
+    db.refresh(service)
     return service
 
-@router.get("/")
+@router.get("/", response_model=List[ServiceOut])
 def list_services(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(Service).filter(Service.workspace_id == current_user.workspace_id).all()
+    query = db.query(Service).filter(Service.workspace_id == current_user.workspace_id)
+    return paginate(query, [Service.id], page, response)
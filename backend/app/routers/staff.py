@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.pagination import PageParams, paginate
 from app.routers import deps
 from app.core import security
 from app.models.user import User, UserRole
 from pydantic import BaseModel, EmailStr
+from typing import List
+from app.schemas.user import StaffInvited, StaffOut
 
 router = APIRouter()
 
@@ -12,37 +17,43 @@ class StaffInvite(BaseModel):
     email: EmailStr
     password: str # In real app, would send invite link. Here we set password directly.
 
-@router.post("/")
-def invite_staff(
+@router.post("/", response_model=StaffInvited)
+async def invite_staff(
     invite: StaffInvite,
-    current_user: User = Depends(deps.get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Only owner can invite
     if current_user.role != UserRole.OWNER:
         raise HTTPException(status_code=403, detail="Only owners can invite staff")
         
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == invite.email).first()
+    existing_user = (await db.execute(select(User.id).where(User.email == invite.email))).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="User already exists")
         
     user = User(
         email=invite.email,
-        password_hash=security.get_password_hash(invite.password),
+        # bcrypt runs on the hashing pool without holding a request thread
+        password_hash=await security.get_password_hash_async(invite.password),
         role=UserRole.STAFF,
         workspace_id=current_user.workspace_id
     )
     db.add(user)
-    db.commit()
+    await db.commit()
+    # Keep the principal cache in step with user writes
+    deps.invalidate_user(user.id)
     return {"message": "Staff invited successfully", "email": user.email}
 
-@router.get("/")
+@router.get("/", response_model=List[StaffOut])
 def list_staff(
-    current_user: User = Depends(deps.get_current_active_user),
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(User).filter(
+    query = db.query(User).filter(
         User.workspace_id == current_user.workspace_id,
         User.role == UserRole.STAFF
-    ).all()
+    )
+    return paginate(query, [User.id], page, response)
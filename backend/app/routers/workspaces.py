@@ -1,26 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core import security
 from app.routers import deps
-from app.models.workspace import Workspace
+from app.models.workspace import Workspace, WorkspaceCounters
 from app.models.user import User, UserRole
-from app.schemas.workspace import WorkspaceCreate, Workspace as WorkspaceSchema
+from app.schemas.workspace import WorkspaceActivated, WorkspaceCreate, Workspace as WorkspaceSchema
 
 router = APIRouter()
 
 @router.post("/", response_model=WorkspaceSchema)
-def create_workspace(
+async def create_workspace(
     workspace_in: WorkspaceCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if user already exists
-    user = db.query(User).filter(User.email == workspace_in.owner_email).first()
+    user = (await db.execute(select(User.id).where(User.email == workspace_in.owner_email))).first()
     if user:
         raise HTTPException(
             status_code=400,
             detail="User with this email already exists"
         )
+
+    # Hashed before any write, on the hashing pool without holding a request
+    # thread; HashingBusy then leaves no workspace without an owner behind
+    password_hash = await security.get_password_hash_async(workspace_in.owner_password)
         
     # Create Workspace
     db_workspace = Workspace(
@@ -31,34 +37,36 @@ def create_workspace(
         status="draft" # Explicitly draft
     )
     db.add(db_workspace)
-    db.commit()
-    db.refresh(db_workspace)
+    await db.flush()
+    db.add(WorkspaceCounters(workspace_id=db_workspace.id))
+    await db.commit()
+    await db.refresh(db_workspace)
     
     # Create Owner
     db_user = User(
         email=workspace_in.owner_email,
-        password_hash=security.get_password_hash(workspace_in.owner_password),
+        password_hash=password_hash,
         role=UserRole.OWNER,
         workspace_id=db_workspace.id
     )
     db.add(db_user)
-    db.commit()
+    await db.commit()
     
     return db_workspace
 
 @router.get("/", response_model=list[WorkspaceSchema])
 def list_workspaces(
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     # Return user's workspace
     workspace = db.query(Workspace).filter(Workspace.id == current_user.workspace_id).first()
     return [workspace] if workspace else []
 
-@router.post("/{workspace_id}/activate")
+@router.post("/{workspace_id}/activate", response_model=WorkspaceActivated)
 def activate_workspace(
     workspace_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(get_db)
 ):
     workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
@@ -90,5 +98,7 @@ def activate_workspace(
         
     workspace.status = "active"
     db.commit()
+    # Cached principals carry the workspace status
+    deps.invalidate_workspace(workspace_id)
     
     return {"status": "active", "message": "Workspace activated successfully"}
@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class Detail(BaseModel):
+    # Acknowledgement for actions with nothing else to return
+    message: str
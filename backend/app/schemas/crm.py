@@ -0,0 +1,61 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from app.models.crm import MessageDirection, MessageType
+
+class ConversationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workspace_id: int
+    contact_id: int
+    status: Optional[str] = None
+    last_message_at: datetime
+    last_message_preview: Optional[str] = None
+    unread_count: int
+
+class InboxItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: Optional[str] = None
+    last_message_at: datetime
+    last_message_preview: Optional[str] = None
+    unread_count: int
+    contact_id: int
+    contact_name: str
+
+class ConversationRead(BaseModel):
+    id: int
+    unread_count: int
+
+class MessageOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    conversation_id: int
+    direction: MessageDirection
+    type: MessageType
+    content: str
+    timestamp: Optional[datetime] = None
+
+class MessageSearchHit(MessageOut):
+    contact_id: int
+    contact_name: str
+    rank: float
+
+class ContactImportStarted(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: str
+
+class ContactImportOut(ContactImportStarted):
+    format: str
+    total_rows: int
+    invalid_rows: int
+    inserted: int
+    duplicates: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict
+from app.models.forms_inventory import FormStatus
+
+class FormTemplateOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workspace_id: int
+    name: str
+    schema: Dict[str, Any]
+    version: int
+
+class FormSubmissionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    template_id: int
+    contact_id: int
+    data: Optional[Dict[str, Any]] = None
+    status: Optional[FormStatus] = None
+    submitted_at: Optional[datetime] = None
+    due_at: Optional[datetime] = None
+
+class InventoryItemOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workspace_id: int
+    name: str
+    quantity: int
+    low_stock_threshold: int
+    is_low_stock: Optional[bool] = None
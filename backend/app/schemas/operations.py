@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+class ServiceOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workspace_id: int
+    name: str
+    duration: int
+    location: Optional[str] = None
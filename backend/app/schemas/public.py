@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 
 class ContactFormSubmit(BaseModel):
     name: str
@@ -15,3 +15,22 @@ class FormSubmissionCreate(BaseModel):
     data: dict # Dynamic fields based on template schema
     contact_email: Optional[EmailStr] = None # To link to contact if provided
     contact_phone: Optional[str] = None
+
+class BookingResponse(BaseModel):
+    id: int
+    status: str
+    message: str
+
+class Slot(BaseModel):
+    start: str # ISO 8601 in the workspace timezone
+    end: str
+
+class SlotsResponse(BaseModel):
+    service_id: int
+    duration: int
+    timezone: str
+    slots: List[Slot]
+
+class FormSubmissionResponse(BaseModel):
+    id: int
+    message: str
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+class AlertOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    workspace_id: int
+    type: str
+    subject: str
+    message: str
+    is_read: bool
+    occurrences: int
+    created_at: Optional[datetime] = None
+    opened_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+class AlertRead(BaseModel):
+    id: int
+    is_read: bool
+
+class DashboardMetrics(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    bookings: int
+    contacts: int
+    active_conversations: int
+    pending_forms: int
+    unread_alerts: int
+
+class DashboardStats(BaseModel):
+    metrics: DashboardMetrics
+    alerts: List[AlertOut]
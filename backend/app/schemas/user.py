@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+from app.models.user import UserRole
+
+class StaffOut(BaseModel):
+    # Never password_hash
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+    role: UserRole
+    workspace_id: int
+
+class StaffInvited(BaseModel):
+    message: str
+    email: str
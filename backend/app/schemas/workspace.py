@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Any, Dict, Optional
 from enum import Enum
 
 class WorkspaceStatus(str, Enum):
@@ -17,8 +17,15 @@ class WorkspaceCreate(WorkspaceBase):
     owner_password: str
 
 class Workspace(WorkspaceBase):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     status: WorkspaceStatus
-    
-    class Config:
-        from_attributes = True
+
+class WorkspaceActivated(BaseModel):
+    status: WorkspaceStatus
+    message: str
+
+class IntegrationsUpdated(BaseModel):
+    message: str
+    settings: Dict[str, Any]
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import case, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.system import Alert
+from app.services import counters
+
+def raise_alert(db: Session, workspace_id: int, alert_type: str, subject: str, message: str, now: Optional[datetime] = None) -> bool:
+    """
+    Record an occurrence of the (workspace, type, subject) alert with a single
+    upsert. Repeats within the suppression window of the last recorded one are
+    dropped by the upsert's WHERE clause without writing the row; later ones
+    bump occurrences and last_seen_at, and reopen the alert if it was read.
+
+    Returns True when this call opened the alert (new, or reopened), in which
+    case the workspace's unread counter has been bumped. Does not commit.
+    """
+    now = now or datetime.now(timezone.utc)
+    window = timedelta(seconds=settings.ALERT_SUPPRESSION_WINDOW_SECONDS)
+
+    table = Alert.__table__
+    insert = dialect_insert(db, table)
+    stmt = insert.values(
+        workspace_id=workspace_id,
+        type=alert_type,
+        subject=subject,
+        message=message,
+        is_read=False,
+        occurrences=1,
+        created_at=now,
+        opened_at=now,
+        last_seen_at=now,
+    )
+    reopen = table.c.is_read == True
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["workspace_id", "type", "subject"],
+        set_={
+            "occurrences": table.c.occurrences + 1,
+            "last_seen_at": now,
+            "message": insert.excluded.message,
+            "is_read": False,
+            "opened_at": case((reopen, now), else_=table.c.opened_at),
+        },
+        where=or_(table.c.last_seen_at == None, table.c.last_seen_at <= now - window),
+    ).returning(table.c.opened_at, table.c.last_seen_at)
+
+    row = db.execute(stmt).first()
+    if row is None:
+        return False # suppressed
+    opened = row.opened_at == row.last_seen_at
+    if opened:
+        db.execute(counters.increment(workspace_id, unread_alerts=1))
+    return opened
+
+def mark_read(db: Session, workspace_id: int, alert_id: int) -> bool:
+    """Mark an alert read; False if it does not exist in the workspace. Does not commit."""
+    result = db.query(Alert).filter(
+        Alert.id == alert_id, Alert.workspace_id == workspace_id, Alert.is_read == False
+    ).update({Alert.is_read: True}, synchronize_session=False)
+    if result:
+        db.execute(counters.increment(workspace_id, unread_alerts=-1))
+        return True
+    return db.query(Alert.id).filter(Alert.id == alert_id, Alert.workspace_id == workspace_id).first() is not None
@@ -1,12 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.core import events
 from app.core.database import SessionLocal
 from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
 from app.models.operations import Booking, Service
-from app.models.system import Alert
 from app.models.workspace import Workspace
-from app.models.workspace import Workspace
-from app.models.forms_inventory import InventoryItem, AutomationRule, AutomationActionType, FormSubmission
+from app.services import alerts, counters, delivery
+from app.services.rule_index import rule_index
+from app.models.forms_inventory import InventoryItem, AutomationActionType, FormSubmission, FormTemplate
 from typing import Dict, Any
 
 def get_db_session():
@@ -35,6 +35,7 @@ def send_welcome_message(payload: Dict[str, Any]):
         if not conversation:
             conversation = Conversation(workspace_id=workspace_id, contact_id=contact_id, status="active")
             db.add(conversation)
+            db.execute(counters.increment(workspace_id, active_conversations=1))
             db.commit()
             db.refresh(conversation)
             
@@ -46,6 +47,10 @@ def send_welcome_message(payload: Dict[str, Any]):
         )
         db.add(msg)
         db.commit()
+        if contact.phone:
+            delivery.send_or_defer(workspace_id, "sms", contact.phone, content, kind="welcome")
+        else:
+            delivery.send_or_defer(workspace_id, "email", contact.email, content, subject="Thanks for reaching out", kind="welcome")
         print(f"[AUTOMATION] Sent welcome message to {contact.email or contact.phone}")
     finally:
         db.close()
@@ -72,6 +77,12 @@ def handle_booking_created(payload: Dict[str, Any]):
             db.add(msg)
             db.commit()
             print(f"[AUTOMATION] Sent booking confirmation to Contact {booking.contact_id}")
+
+        contact = booking.contact
+        if contact and contact.email:
+            delivery.send_or_defer(booking.service.workspace_id, "email", contact.email, msg_content, subject="Booking confirmed", kind="booking_confirmation")
+        elif contact and contact.phone:
+            delivery.send_or_defer(booking.service.workspace_id, "sms", contact.phone, msg_content, kind="booking_confirmation")
             
         # 2. Schedule Forms (Mock: just Log it)
         print(f"[AUTOMATION] Scheduled post-booking forms for Booking {booking.id}")
@@ -86,14 +97,16 @@ def handle_inventory_low(payload: Dict[str, Any]):
         item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
         if not item: return
         
-        alert = Alert(
-            workspace_id=item.workspace_id,
-            type="inventory_low",
-            message=f"Inventory item '{item.name}' is low ({item.quantity} remaining)."
+        opened = alerts.raise_alert(
+            db,
+            item.workspace_id,
+            "inventory_low",
+            f"inventory_item:{item.id}",
+            f"Inventory item '{item.name}' is low ({item.quantity} remaining)."
         )
-        db.add(alert)
         db.commit()
-        print(f"[AUTOMATION] Created Low Stock Alert for {item.name}")
+        if opened:
+            print(f"[AUTOMATION] Created Low Stock Alert for {item.name}")
     finally:
         db.close()
 
@@ -108,31 +121,43 @@ def handle_form_submitted(payload: Dict[str, Any]):
     db = SessionLocal()
     try:
         submission_id = payload.get("submission_id")
-        submission = db.query(FormSubmission).filter(FormSubmission.id == submission_id).first()
-        if not submission: return
+        workspace_id = payload.get("workspace_id")
+        template_id = payload.get("template_id")
+        submission = None
+        if template_id is None or workspace_id is None:
+            # Events written before the payload carried the template
+            submission = db.query(FormSubmission).options(joinedload(FormSubmission.contact)).filter(FormSubmission.id == submission_id).first()
+            if not submission: return
+            template_id = submission.template_id
+            workspace_id = db.query(FormTemplate.workspace_id).filter(FormTemplate.id == template_id).scalar()
 
-        # Check for rules
         # Rule trigger: form_template_id matches submission.template_id
-        rules = db.query(AutomationRule).filter(
-            AutomationRule.form_template_id == submission.template_id,
-            AutomationRule.is_active == 1
-        ).all()
+        rules = rule_index.rules_for(db, workspace_id, template_id)
+        if not rules:
+            return
 
         for rule in rules:
+            recipient = rule.action_config.get("recipient", "contact")
+            body = rule.action_config.get("template") or "We received your submission and will be in touch shortly."
+            contact = None
+            if recipient == "contact":
+                # Get contact (loaded once, with the submission)
+                if submission is None:
+                    submission = db.query(FormSubmission).options(joinedload(FormSubmission.contact)).filter(FormSubmission.id == submission_id).first()
+                contact = submission.contact if submission else None
+
             if rule.action_type == AutomationActionType.SEND_EMAIL:
-                # Mock sending email
-                recipient = rule.action_config.get("recipient")
-                if recipient == "contact":
-                    # Get contact email
-                    contact = submission.contact
-                    if contact and contact.email:
-                        print(f"[AUTOMATION] Rule '{rule.name}' triggered. Sending Request Received Email to {contact.email}")
-                else:
-                    print(f"[AUTOMATION] Rule '{rule.name}' triggered. Sending Notification Email to {recipient}")
+                to = contact.email if contact else (None if recipient == "contact" else recipient)
+                subject = rule.action_config.get("subject") or "Request received"
+                if delivery.send_or_defer(workspace_id, "email", to, body, subject=subject, kind=f"rule:{rule.id}"):
+                    print(f"[AUTOMATION] Rule '{rule.name}' triggered. Queued email to {to}")
             
             elif rule.action_type == AutomationActionType.SEND_SMS:
-                 print(f"[AUTOMATION] Rule '{rule.name}' triggered. Sending SMS to contact.")
+                to = contact.phone if contact else (None if recipient == "contact" else recipient)
+                if delivery.send_or_defer(workspace_id, "sms", to, body, kind=f"rule:{rule.id}"):
+                    print(f"[AUTOMATION] Rule '{rule.name}' triggered. Queued SMS to {to}")
     except Exception as e:
         print(f"[AUTOMATION] Error processing form submission rules: {e}")
+        raise # fails the bus future, so the outbox retries the event
     finally:
         db.close()
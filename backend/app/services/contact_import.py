@@ -0,0 +1,261 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from app.core import events, outbox
+from app.core.config import settings
+from app.core.database import SessionLocal, dialect_insert
+from app.models.crm import Contact, ContactImport, ContactImportRow, normalize_email, normalize_phone
+from app.models.system import OutboxEvent
+from app.services import counters
+
+FORMATS = ("csv", "ndjson")
+
+# Accepted column names, matched case-insensitively
+NAME_COLUMNS = ("name", "full_name", "full name")
+EMAIL_COLUMNS = ("email", "email_address", "email address")
+PHONE_COLUMNS = ("phone", "phone_number", "phone number", "mobile")
+
+# COPY columns, in staging table order
+STAGE_COLUMNS = ("import_id", "line", "name", "email", "phone", "email_normalized", "phone_normalized")
+
+# Rows per multi-row INSERT where COPY is not available; keeps bind parameters under SQLite's limit
+INSERT_CHUNK = 1000
+
+class ImportAbandoned(Exception):
+    """The sweeper failed this import while it was still running."""
+
+def heartbeat(db: Session, job: ContactImport):
+    """Record progress before a commit; stops the import if the sweeper has already failed it."""
+    touched = db.execute(
+        update(ContactImport.__table__)
+        .where(ContactImport.id == job.id, ContactImport.status == "running")
+        .values(heartbeat_at=datetime.now(timezone.utc))
+    ).rowcount
+    if not touched:
+        raise ImportAbandoned(f"Import {job.id} is no longer running")
+
+def _pick(record: Dict[str, Any], names) -> Optional[str]:
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+def read_records(stream: BinaryIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per input row with lowercased keys, without loading the whole file."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for record in csv.DictReader(text):
+            yield {(key or "").strip().lower(): value for key, value in record.items()}
+    elif fmt == "ndjson":
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield {str(key).lower(): value for key, value in record.items()} if isinstance(record, dict) else {}
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}, expected one of {', '.join(FORMATS)}")
+
+def stage_row(import_id: int, line: int, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    email = _pick(record, EMAIL_COLUMNS)
+    phone = _pick(record, PHONE_COLUMNS)
+    email_key = normalize_email(email)
+    phone_key = normalize_phone(phone)
+    if not email_key and not phone_key:
+        return None
+    name = _pick(record, NAME_COLUMNS)
+    if not name:
+        name = " ".join(part for part in (_pick(record, ("first_name",)), _pick(record, ("last_name",))) if part)
+    return {
+        "import_id": import_id,
+        "line": line,
+        "name": name or email or phone,
+        "email": email if email_key else None,
+        "phone": phone if phone_key else None,
+        "email_normalized": email_key,
+        "phone_normalized": phone_key,
+    }
+
+def _copy_rows(db: Session, rows: List[Dict[str, Any]]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in STAGE_COLUMNS])
+    buffer.seek(0)
+    # The DBAPI connection of the session's transaction, so the COPY commits with it
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY contact_import_rows ({', '.join(STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+def _insert_rows(db: Session, rows: List[Dict[str, Any]]):
+    for i in range(0, len(rows), INSERT_CHUNK):
+        db.execute(insert(ContactImportRow.__table__).values(rows[i:i + INSERT_CHUNK]))
+
+def stage(db: Session, job: ContactImport, records: Iterable[Dict[str, Any]]):
+    """
+    Load parsed records into contact_import_rows in batches: COPY on Postgres,
+    multi-row INSERTs elsewhere. Rows without an email or phone are counted
+    as invalid and skipped. Commits per batch.
+    """
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        if batch:
+            (_copy_rows if use_copy else _insert_rows)(db, batch)
+            batch.clear()
+        heartbeat(db, job)
+        db.commit()
+
+    for line, record in enumerate(records, start=1):
+        job.total_rows += 1
+        row = stage_row(job.id, line, record)
+        if row is None:
+            job.invalid_rows += 1
+            continue
+        batch.append(row)
+        if len(batch) >= settings.CONTACT_IMPORT_STAGE_ROWS:
+            flush()
+    flush()
+
+def welcome_schedule(start: datetime, sent: int, count: int) -> List[datetime]:
+    """available_at for the next count welcome events, releasing them in batches at the configured rate."""
+    batch = settings.CONTACT_IMPORT_WELCOME_BATCH
+    seconds_per_batch = 60 * batch / settings.CONTACT_IMPORT_WELCOME_PER_MINUTE
+    return [start + timedelta(seconds=((sent + i) // batch) * seconds_per_batch) for i in range(count)]
+
+def merge(db: Session, job: ContactImport):
+    """
+    Move staged rows into contacts with one INSERT ... SELECT ... ON CONFLICT
+    DO NOTHING per chunk. The unique indexes on the normalized email and phone
+    skip rows matching an existing contact, or an earlier row of the file, so
+    no per-row lookups are needed. Welcome events for the new contacts are
+    written to the outbox in the same transaction, spread out by available_at.
+    """
+    staging = ContactImportRow.__table__
+    contacts = Contact.__table__
+    now = datetime.now(timezone.utc)
+    last_id = 0
+    while True:
+        chunk = (
+            select(staging.c.id)
+            .where(staging.c.import_id == job.id, staging.c.id > last_id)
+            .order_by(staging.c.id)
+            .limit(settings.CONTACT_IMPORT_MERGE_ROWS)
+        ).subquery()
+        bounds = db.execute(select(func.max(chunk.c.id))).scalar()
+        if bounds is None:
+            break
+        source = (
+            select(
+                literal(job.workspace_id), staging.c.name, staging.c.email, staging.c.phone,
+                staging.c.email_normalized, staging.c.phone_normalized, literal(now),
+            )
+            .where(staging.c.import_id == job.id, staging.c.id > last_id, staging.c.id <= bounds)
+            .order_by(staging.c.id) # earlier rows of the file win
+        )
+        stmt = dialect_insert(db, contacts).from_select(
+            ["workspace_id", "name", "email", "phone", "email_normalized", "phone_normalized", "created_at"], source
+        ).on_conflict_do_nothing().returning(contacts.c.id)
+        new_ids = db.execute(stmt).scalars().all()
+        staged = db.execute(
+            delete(staging).where(staging.c.import_id == job.id, staging.c.id > last_id, staging.c.id <= bounds)
+        ).rowcount
+
+        if new_ids:
+            db.execute(counters.increment(job.workspace_id, contacts=len(new_ids)))
+            if job.send_welcome:
+                schedule = welcome_schedule(now, job.inserted, len(new_ids))
+                db.execute(insert(OutboxEvent.__table__), [
+                    {
+                        "event_type": events.NEW_CONTACT,
+                        "payload": {"contact_id": contact_id, "workspace_id": job.workspace_id},
+                        "status": "pending",
+                        "attempts": 0,
+                        "available_at": available_at,
+                    }
+                    for contact_id, available_at in zip(sorted(new_ids), schedule)
+                ])
+        job.inserted += len(new_ids)
+        job.duplicates += staged - len(new_ids)
+        heartbeat(db, job)
+        db.commit()
+        last_id = bounds
+
+def _fail(db: Session, import_id: int, error: str, statuses: Optional[Iterable[str]] = None) -> int:
+    """Mark an import failed and drop its staging rows; with statuses, only if it is still in one of them."""
+    stmt = update(ContactImport.__table__).where(ContactImport.id == import_id)
+    if statuses is not None:
+        stmt = stmt.where(ContactImport.status.in_(tuple(statuses)))
+    failed = db.execute(stmt.values(status="failed", error=error, finished_at=datetime.now(timezone.utc))).rowcount
+    if failed:
+        db.execute(delete(ContactImportRow.__table__).where(ContactImportRow.import_id == import_id))
+    db.commit()
+    return failed
+
+def run_import(import_id: int, stream: BinaryIO):
+    """Stage and merge one import; records the outcome on the ContactImport row."""
+    db = SessionLocal()
+    try:
+        claimed = db.execute(
+            update(ContactImport.__table__)
+            .where(ContactImport.id == import_id, ContactImport.status == "pending")
+            .values(status="running", heartbeat_at=datetime.now(timezone.utc))
+        ).rowcount
+        db.commit()
+        if not claimed:
+            print(f"[IMPORT] Import {import_id} is no longer pending, skipping")
+            return
+        job = db.get(ContactImport, import_id)
+        stage(db, job, read_records(stream, job.format))
+        merge(db, job)
+        heartbeat(db, job)
+        job.status = "completed"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        print(f"[IMPORT] Import {job.id}: {job.inserted} new, {job.duplicates} duplicates, {job.invalid_rows} invalid of {job.total_rows} rows")
+    except ImportAbandoned as e:
+        db.rollback()
+        print(f"[IMPORT] {e}")
+    except Exception as e:
+        db.rollback()
+        print(f"[IMPORT] Import {import_id} failed: {e}")
+        _fail(db, import_id, str(e))
+    finally:
+        db.close()
+    outbox.notify()
+
+def sweep_stale():
+    """
+    Periodic job: fail imports that have made no progress for
+    CONTACT_IMPORT_STALE_AFTER seconds (the worker running them restarted or
+    died) and clear their staging rows. A worker that is in fact still running
+    notices at its next heartbeat and stops.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.CONTACT_IMPORT_STALE_AFTER)
+    db = SessionLocal()
+    try:
+        stale = db.execute(
+            select(ContactImport.id).where(
+                ContactImport.status.in_(("pending", "running")),
+                func.coalesce(ContactImport.heartbeat_at, ContactImport.created_at) < cutoff,
+            )
+        ).scalars().all()
+        for import_id in stale:
+            # Re-checks the status so a job finishing meanwhile is left alone
+            if _fail(db, import_id, "Import stopped making progress", statuses=("pending", "running")):
+                print(f"[IMPORT] Import {import_id} stalled, marked failed")
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from sqlalchemy import case, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import dialect_insert
+from app.models.crm import Contact, normalize_email, normalize_phone
+
+async def upsert_contact(
+    db: AsyncSession,
+    workspace_id: int,
+    name: str,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+) -> Tuple[int, bool]:
+    """
+    Find the workspace's contact for email/phone, creating it if there is none,
+    and return (contact_id, created). An email match wins over a phone match,
+    and an existing contact is returned unchanged.
+
+    With a single identifier this is one INSERT ... ON CONFLICT DO UPDATE ...
+    RETURNING round trip; the no-op update makes the existing row come back,
+    and created is told apart by xmax = 0 on Postgres (no prior row version),
+    or on SQLite by the created_at this call tried to insert.
+    With both, either unique index can conflict and ON CONFLICT DO UPDATE only
+    takes one, so the insert does nothing on any conflict and a follow-up
+    SELECT picks the match. Concurrent callers wait on the unique index rather
+    than creating duplicates. Does not commit.
+    """
+    email_key = normalize_email(email)
+    phone_key = normalize_phone(phone)
+    if not email_key and not phone_key:
+        raise ValueError("Email or phone is required")
+
+    now = datetime.now(timezone.utc)
+    table = Contact.__table__
+    insert = dialect_insert(db, table)
+    stmt = insert.values(
+        workspace_id=workspace_id,
+        name=name,
+        email=email if email_key else None,
+        phone=phone if phone_key else None,
+        email_normalized=email_key,
+        phone_normalized=phone_key,
+        created_at=now,
+    )
+
+    if email_key and phone_key:
+        row = (await db.execute(stmt.on_conflict_do_nothing().returning(table.c.id))).first()
+        if row is not None:
+            return row.id, True
+        contact_id = (await db.execute(
+            select(table.c.id)
+            .where(
+                table.c.workspace_id == workspace_id,
+                or_(table.c.email_normalized == email_key, table.c.phone_normalized == phone_key),
+            )
+            .order_by(case((table.c.email_normalized == email_key, 0), else_=1))
+            .limit(1)
+        )).scalar_one()
+        return contact_id, False
+
+    key = "email_normalized" if email_key else "phone_normalized"
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["workspace_id", key],
+        set_={key: insert.excluded[key]},
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        row = (await db.execute(stmt.returning(table.c.id, literal_column("xmax = 0").label("created")))).one()
+        return row.id, row.created
+    row = (await db.execute(stmt.returning(table.c.id, table.c.created_at))).one()
+    return row.id, _same_instant(row.created_at, now)
+
+def _same_instant(value: Optional[datetime], expected: datetime) -> bool:
+    # SQLite hands timestamps back without an offset; they were written as UTC
+    if value is None:
+        return False
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value == expected
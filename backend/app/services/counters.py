@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+from typing import Dict
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal, dialect_insert
+from app.models.crm import Contact, Conversation
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.models.operations import Booking, Service
+from app.models.system import Alert
+from app.models.workspace import Workspace, WorkspaceCounters
+
+COUNTER_FIELDS = ("bookings", "contacts", "active_conversations", "pending_forms", "unread_alerts")
+
+def increment(workspace_id: int, **deltas: int):
+    """
+    UPDATE statement adding deltas to a workspace's counters. Callers execute it
+    in the same transaction as the write it accounts for, on either session type:
+
+        db.execute(counters.increment(ws_id, contacts=1))
+        await db.execute(counters.increment(ws_id, contacts=1))
+
+    A workspace without a counters row is left alone; its row is built from the
+    source tables on the next dashboard read or reconciliation.
+    """
+    unknown = set(deltas) - set(COUNTER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown counters: {', '.join(sorted(unknown))}")
+    columns = WorkspaceCounters.__table__.c
+    return (
+        update(WorkspaceCounters)
+        .where(WorkspaceCounters.workspace_id == workspace_id)
+        .values({columns[name]: columns[name] + delta for name, delta in deltas.items() if delta})
+    )
+
+def count_from_source(db: Session, workspace_id: int) -> Dict[str, int]:
+    bookings = db.query(func.count(Booking.id)).join(Service, Booking.service_id == Service.id).filter(
+        Service.workspace_id == workspace_id
+    ).scalar()
+    contacts = db.query(func.count(Contact.id)).filter(Contact.workspace_id == workspace_id).scalar()
+    active_conversations = db.query(func.count(Conversation.id)).filter(
+        Conversation.workspace_id == workspace_id, Conversation.status == "active"
+    ).scalar()
+    pending_forms = db.query(func.count(FormSubmission.id)).join(
+        FormTemplate, FormSubmission.template_id == FormTemplate.id
+    ).filter(FormTemplate.workspace_id == workspace_id, FormSubmission.status == "pending").scalar()
+    unread_alerts = db.query(func.count(Alert.id)).filter(
+        Alert.workspace_id == workspace_id, Alert.is_read == False
+    ).scalar()
+    return {
+        "bookings": bookings,
+        "contacts": contacts,
+        "active_conversations": active_conversations,
+        "pending_forms": pending_forms,
+        "unread_alerts": unread_alerts,
+    }
+
+def reconcile(db: Session, workspace_id: int) -> Dict[str, int]:
+    """
+    Recount a workspace from the source tables and overwrite its counters row
+    (creating it if needed). Returns the fields that had drifted, as
+    {field: correct - stored}. Does not commit.
+
+    The row is locked before the recount. Under READ COMMITTED an increment
+    committed before the lock is taken is in the recount, and one that comes
+    later waits for this transaction and applies on top of the new values, so
+    reconciling never loses a concurrent increment.
+    """
+    table = WorkspaceCounters.__table__
+    created = db.execute(
+        dialect_insert(db, table)
+        .values(workspace_id=workspace_id, **{name: 0 for name in COUNTER_FIELDS})
+        .on_conflict_do_nothing(index_elements=["workspace_id"])
+    ).rowcount
+    stored = db.execute(
+        select(*(table.c[name] for name in COUNTER_FIELDS)).where(table.c.workspace_id == workspace_id).with_for_update()
+    ).one()
+    actual = count_from_source(db, workspace_id)
+    drift = {} if created else {
+        name: actual[name] - stored[i] for i, name in enumerate(COUNTER_FIELDS) if stored[i] != actual[name]
+    }
+    db.execute(
+        update(table).where(table.c.workspace_id == workspace_id)
+        .values(reconciled_at=datetime.now(timezone.utc), **actual)
+    )
+    return drift
+
+def get_counters(db: Session, workspace_id: int) -> WorkspaceCounters:
+    counters = db.get(WorkspaceCounters, workspace_id)
+    if counters is None:
+        # First read for a workspace created before counters existed
+        reconcile(db, workspace_id)
+        db.commit()
+        counters = db.get(WorkspaceCounters, workspace_id)
+    return counters
+
+def reconcile_all():
+    """
+    Periodic drift repair. Each workspace is recounted in its own short
+    transaction, holding only that workspace's counters row.
+    """
+    db = SessionLocal()
+    try:
+        workspace_ids = [row[0] for row in db.query(Workspace.id).all()]
+        for workspace_id in workspace_ids:
+            try:
+                drift = reconcile(db, workspace_id)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"[COUNTERS] Failed to reconcile workspace {workspace_id}: {e}")
+                continue
+            if drift:
+                print(f"[COUNTERS] Corrected drift for workspace {workspace_id}: {drift}")
+    finally:
+        db.close()
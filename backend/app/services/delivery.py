@@ -0,0 +1,448 @@
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.workspace import Workspace
+from app.services import integration_log
+
+@dataclass
+class OutboundMessage:
+    workspace_id: int
+    channel: str # "email" or "sms"
+    to: str
+    body: str
+    subject: Optional[str] = None
+    kind: str = "message" # What triggered it, for the integration log
+    attempts: int = 0
+
+@dataclass
+class DeliveryResult:
+    ok: bool
+    detail: str
+    retryable: bool = False
+
+class DeliveryError(Exception):
+    """The workspace has no usable configuration for the channel."""
+
+class DeliveryBusy(Exception):
+    """The delivery queue stayed full; the caller should retry later."""
+
+class Provider:
+    name = "base"
+    max_batch = 1
+
+    def send(self, config: Dict[str, Any], messages: List[OutboundMessage]) -> List[DeliveryResult]:
+        raise NotImplementedError
+
+class HTTPProvider(Provider):
+    """A provider behind one pooled, keep-alive HTTP client shared by every worker thread."""
+
+    base_url = ""
+
+    def __init__(self):
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        base_url=self.base_url,
+                        timeout=settings.DELIVERY_HTTP_TIMEOUT,
+                        limits=httpx.Limits(
+                            max_connections=settings.DELIVERY_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.DELIVERY_MAX_CONNECTIONS,
+                        ),
+                    )
+        return self._client
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def post(self, count: int, url: str, **kwargs) -> Tuple[Optional[httpx.Response], List[DeliveryResult]]:
+        try:
+            response = self.client.post(url, **kwargs)
+        except httpx.HTTPError as e:
+            return None, [DeliveryResult(False, f"{type(e).__name__}: {e}", retryable=True)] * count
+        if response.status_code >= 300:
+            # Throttling and server errors are worth another try, the rest is on our side
+            retryable = response.status_code == 429 or response.status_code >= 500
+            result = DeliveryResult(False, f"HTTP {response.status_code}: {response.text[:200]}", retryable)
+            return None, [result] * count
+        return response, []
+
+class ResendProvider(HTTPProvider):
+    name = "resend"
+    max_batch = 100 # Resend's batch endpoint limit
+
+    def __init__(self):
+        super().__init__()
+        self.base_url = settings.RESEND_API_URL
+
+    def send(self, config, messages):
+        sender = config.get("from") or settings.DELIVERY_DEFAULT_FROM
+        emails = [{"from": sender, "to": [m.to], "subject": m.subject or "", "text": m.body} for m in messages]
+        response, failed = self.post(
+            len(messages), "/emails/batch", json=emails,
+            headers={"Authorization": f"Bearer {config.get('api_key', '')}"},
+        )
+        if failed:
+            return failed
+        ids = [item.get("id") for item in (response.json().get("data") or [])]
+        ids += [None] * (len(messages) - len(ids))
+        return [DeliveryResult(True, f"resend id {message_id}") for message_id in ids]
+
+class TwilioProvider(HTTPProvider):
+    name = "twilio"
+    max_batch = 1 # One API call per SMS
+
+    def __init__(self):
+        super().__init__()
+        self.base_url = settings.TWILIO_API_URL
+
+    def send(self, config, messages):
+        results = []
+        account = config.get("account_sid", "")
+        for message in messages:
+            response, failed = self.post(
+                1, f"/2010-04-01/Accounts/{account}/Messages.json",
+                data={"To": message.to, "From": config.get("from", ""), "Body": message.body},
+                auth=(account, config.get("auth_token", "")),
+            )
+            results.extend(failed or [DeliveryResult(True, f"twilio sid {response.json().get('sid')}")])
+        return results
+
+class MockProvider(Provider):
+    """Used when a channel is configured with a bare key string (the onboarding demo keys)."""
+
+    name = "mock"
+    max_batch = 100
+
+    def send(self, config, messages):
+        for message in messages:
+            print(f"[DELIVERY] (mock) {message.channel} to {message.to}: {message.body[:60]}")
+        return [DeliveryResult(True, "mock delivery") for _ in messages]
+
+providers: Dict[str, Provider] = {p.name: p for p in (ResendProvider(), TwilioProvider(), MockProvider())}
+DEFAULT_PROVIDERS = {"email": "resend", "sms": "twilio"}
+
+config_cache = TTLCache(maxsize=10000, ttl=settings.DELIVERY_CONFIG_TTL)
+
+def channel_settings(workspace_id: int) -> Dict[str, Any]:
+    cached = config_cache.get(workspace_id)
+    if cached is None:
+        db = SessionLocal()
+        try:
+            cached = db.query(Workspace.settings).filter(Workspace.id == workspace_id).scalar() or {}
+        finally:
+            db.close()
+        config_cache.set(workspace_id, cached)
+    return cached
+
+def invalidate_config(workspace_id: int):
+    config_cache.pop(workspace_id)
+
+def resolve(workspace_id: int, channel: str) -> Tuple[Provider, Dict[str, Any]]:
+    config = channel_settings(workspace_id).get(channel)
+    if not config:
+        raise DeliveryError(f"Channel {channel} not configured")
+    if isinstance(config, str):
+        return providers["mock"], {"api_key": config}
+    name = config.get("provider") or DEFAULT_PROVIDERS.get(channel)
+    if name not in providers:
+        raise DeliveryError(f"Unknown {channel} provider {name!r}")
+    return providers[name], config
+
+def record_results(results: List[Tuple[OutboundMessage, str, DeliveryResult]]):
+    """One IntegrationLog row per final outcome, through the buffered writer."""
+    for message, provider, result in results:
+        integration_log.writer.write(
+            message.workspace_id,
+            message.channel,
+            "success" if result.ok else "failure",
+            f"{message.kind} to {message.to} via {provider}: {result.detail}",
+        )
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, wanted: int) -> Tuple[int, float]:
+        """Take up to `wanted` tokens. Returns (granted, seconds until the rest would be available)."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            granted = min(wanted, int(self.tokens))
+            self.tokens -= granted
+            missing = wanted - granted
+            return granted, (missing - self.tokens) / self.rate if missing else 0.0
+
+class DeliveryService:
+    """
+    Queue-fed delivery workers. send() only enqueues, so request handlers and
+    event handlers never wait on a provider. Each worker collects up to
+    batch_size messages (waiting at most linger seconds), groups them per
+    workspace and channel, applies the workspace's token bucket, and sends in
+    chunks of the provider's batch limit. Retryable failures come back through
+    a delay heap with exponential backoff and jitter; messages over the rate
+    limit are deferred the same way without using up an attempt. Queued and
+    delayed messages live in memory only.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        put_timeout: float,
+        batch_size: int,
+        linger: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        rate: float,
+        burst: int,
+    ):
+        self.workers = workers
+        self.put_timeout = put_timeout
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate = rate
+        self.burst = burst
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._delayed: List[Tuple[float, int, OutboundMessage]] = []
+        self._delayed_cond = threading.Condition()
+        self._seq = itertools.count()
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+        self.counts = {"sent": 0, "failed": 0, "retried": 0, "deferred": 0, "requests": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"delivery-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            scheduler = threading.Thread(target=self._scheduler, name="delivery-scheduler", daemon=True)
+            scheduler.start()
+            self._threads.append(scheduler)
+        print(f"[DELIVERY] Started {self.workers} delivery workers (batch size {self.batch_size})")
+
+    def stop(self, timeout: float = 10.0):
+        """Send what is already queued, then stop. Delayed retries are dropped."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            threads, self._threads = self._threads, []
+        for _ in range(self.workers):
+            self._queue.put(None)
+        with self._delayed_cond:
+            if self._delayed:
+                print(f"[DELIVERY] Dropping {len(self._delayed)} delayed messages on shutdown")
+            self._delayed.clear()
+            self._delayed_cond.notify_all()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+    def send(self, message: OutboundMessage):
+        """Queue a message. When the service is not running (tests, scripts) it is sent inline, once."""
+        if not self._running:
+            self.process([message], inline=True)
+            return
+        try:
+            self._queue.put(message, timeout=self.put_timeout)
+        except queue.Full:
+            raise DeliveryBusy("Delivery queue is full")
+
+    def send_now(self, message: OutboundMessage) -> DeliveryResult:
+        """Single synchronous attempt, bypassing the queue and rate limit (integration tests)."""
+        try:
+            provider, config = resolve(message.workspace_id, message.channel)
+        except DeliveryError as e:
+            return DeliveryResult(False, str(e))
+        result = provider.send(config, [message])[0]
+        self._count("sent" if result.ok else "failed")
+        record_results([(message, provider.name, result)])
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._delayed_cond:
+            delayed = len(self._delayed)
+        return dict(self.counts, running=self._running, queue_depth=self._queue.qsize(), delayed=delayed)
+
+    def process(self, batch: List[OutboundMessage], inline: bool = False):
+        groups: Dict[Tuple[int, str], List[OutboundMessage]] = {}
+        for message in batch:
+            groups.setdefault((message.workspace_id, message.channel), []).append(message)
+
+        final: List[Tuple[OutboundMessage, str, DeliveryResult]] = []
+        for (workspace_id, channel), messages in groups.items():
+            try:
+                provider, config = resolve(workspace_id, channel)
+            except DeliveryError as e:
+                final.extend((m, "-", DeliveryResult(False, str(e))) for m in messages)
+                continue
+
+            if not inline:
+                granted, wait = self._bucket(workspace_id).take(len(messages))
+                if granted < len(messages):
+                    self._count("deferred", len(messages) - granted)
+                    self._delay(messages[granted:], wait)
+                    messages = messages[:granted]
+
+            for i in range(0, len(messages), provider.max_batch):
+                chunk = messages[i:i + provider.max_batch]
+                self._count("requests", 1 if provider.max_batch > 1 else len(chunk))
+                try:
+                    results = provider.send(config, chunk)
+                except Exception as e:
+                    results = [DeliveryResult(False, f"{type(e).__name__}: {e}", retryable=True)] * len(chunk)
+                for message, result in zip(chunk, results):
+                    message.attempts += 1
+                    if not result.ok and result.retryable and not inline and message.attempts < self.max_attempts:
+                        self._count("retried")
+                        self._delay([message], self._backoff(message.attempts))
+                        continue
+                    final.append((message, provider.name, result))
+
+        for _, _, result in final:
+            self._count("sent" if result.ok else "failed")
+        record_results(final)
+
+    def defer(self, message: OutboundMessage, seconds: float):
+        """Send a message later through the delay heap instead of the queue."""
+        self._count("deferred")
+        self._delay([message], seconds)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * (0.5 + random.random() / 2)
+
+    def _bucket(self, workspace_id: int) -> TokenBucket:
+        bucket = self._buckets.get(workspace_id)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(workspace_id, TokenBucket(self.rate, self.burst))
+        return bucket
+
+    def _count(self, field: str, delta: int = 1):
+        with self._lock:
+            self.counts[field] += delta
+
+    def _delay(self, messages: List[OutboundMessage], seconds: float):
+        due = time.monotonic() + seconds
+        with self._delayed_cond:
+            for message in messages:
+                heapq.heappush(self._delayed, (due, next(self._seq), message))
+            self._delayed_cond.notify()
+
+    def _scheduler(self):
+        while self._running:
+            ready = []
+            with self._delayed_cond:
+                if not self._delayed:
+                    self._delayed_cond.wait(1.0)
+                    continue
+                wait = self._delayed[0][0] - time.monotonic()
+                if wait > 0:
+                    self._delayed_cond.wait(wait)
+                    continue
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    ready.append(heapq.heappop(self._delayed)[2])
+            for message in ready:
+                self._queue.put(message)
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                self.process(batch)
+            except Exception as e:
+                print(f"[DELIVERY] Error processing batch of {len(batch)}: {e}")
+            if stop:
+                break
+
+service = DeliveryService(
+    workers=settings.DELIVERY_WORKERS,
+    queue_size=settings.DELIVERY_QUEUE_SIZE,
+    put_timeout=settings.DELIVERY_QUEUE_PUT_TIMEOUT,
+    batch_size=settings.DELIVERY_BATCH_SIZE,
+    linger=settings.DELIVERY_LINGER_MS / 1000,
+    max_attempts=settings.DELIVERY_MAX_ATTEMPTS,
+    backoff_base=settings.DELIVERY_BACKOFF_BASE,
+    backoff_max=settings.DELIVERY_BACKOFF_MAX,
+    rate=settings.DELIVERY_RATE_PER_WORKSPACE,
+    burst=settings.DELIVERY_RATE_BURST,
+)
+
+def send(workspace_id: int, channel: str, to: Optional[str], body: str, subject: Optional[str] = None, kind: str = "message") -> bool:
+    """Queue a message; False (and nothing sent) when there is no recipient address."""
+    if not to:
+        return False
+    service.send(OutboundMessage(workspace_id=workspace_id, channel=channel, to=to, body=body, subject=subject, kind=kind))
+    return True
+
+def send_or_defer(workspace_id: int, channel: str, to: Optional[str], body: str, subject: Optional[str] = None, kind: str = "message") -> bool:
+    """
+    send() for callers whose own writes are already committed: when the queue
+    is full the message waits on the delay heap instead of raising, so the
+    caller is not retried and its writes are not repeated.
+    """
+    if not to:
+        return False
+    message = OutboundMessage(workspace_id=workspace_id, channel=channel, to=to, body=body, subject=subject, kind=kind)
+    try:
+        service.send(message)
+    except DeliveryBusy:
+        print(f"[DELIVERY] Queue full, deferring {kind} message for workspace {workspace_id}")
+        service.defer(message, service.backoff_base)
+    return True
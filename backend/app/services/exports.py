@@ -0,0 +1,128 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator
+from sqlalchemy import Select, select
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.crm import Contact, Conversation, Message
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.models.operations import Booking, Service
+
+FORMATS = ("ndjson", "csv")
+
+def messages_query(workspace_id: int) -> Select:
+    return (
+        select(
+            Message.id, Message.conversation_id, Conversation.contact_id, Message.direction,
+            Message.type, Message.content, Message.timestamp,
+        )
+        .join(Conversation, Conversation.id == Message.conversation_id)
+        .where(Conversation.workspace_id == workspace_id)
+        .order_by(Message.id)
+    )
+
+def conversations_query(workspace_id: int) -> Select:
+    return (
+        select(
+            Conversation.id, Conversation.contact_id, Contact.name.label("contact_name"),
+            Contact.email.label("contact_email"), Contact.phone.label("contact_phone"),
+            Conversation.status, Conversation.unread_count, Conversation.last_message_at,
+        )
+        .join(Contact, Contact.id == Conversation.contact_id)
+        .where(Conversation.workspace_id == workspace_id)
+        .order_by(Conversation.id)
+    )
+
+def bookings_query(workspace_id: int) -> Select:
+    return (
+        select(
+            Booking.id, Booking.service_id, Service.name.label("service_name"), Booking.contact_id,
+            Booking.start_time, Booking.end_time, Booking.status,
+        )
+        .join(Service, Service.id == Booking.service_id)
+        .where(Service.workspace_id == workspace_id)
+        .order_by(Booking.id)
+    )
+
+def form_submissions_query(workspace_id: int) -> Select:
+    return (
+        select(
+            FormSubmission.id, FormSubmission.template_id, FormTemplate.name.label("template_name"),
+            FormSubmission.contact_id, FormSubmission.status, FormSubmission.submitted_at,
+            FormSubmission.due_at, FormSubmission.data,
+        )
+        .join(FormTemplate, FormTemplate.id == FormSubmission.template_id)
+        .where(FormTemplate.workspace_id == workspace_id)
+        .order_by(FormSubmission.id)
+    )
+
+EXPORTS: Dict[str, Callable[[int], Select]] = {
+    "messages": messages_query,
+    "conversations": conversations_query,
+    "bookings": bookings_query,
+    "form_submissions": form_submissions_query,
+}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _csv_cell(value: Any) -> Any:
+    value = _plain(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+def rows(kind: str, workspace_id: int) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the export's rows from a session of its own; the request's session
+    is gone by the time the response body is produced. yield_per fetches in
+    batches through a server-side cursor on Postgres, so memory does not grow
+    with the size of the export.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(EXPORTS[kind](workspace_id).execution_options(yield_per=settings.EXPORT_YIELD_PER))
+        for row in result:
+            yield dict(row._mapping)
+    finally:
+        db.close()
+
+def encode(records: Iterator[Dict[str, Any]], fmt: str, columns) -> Iterator[str]:
+    """Render rows as NDJSON or CSV (with a header row), in chunks of about EXPORT_CHUNK_BYTES."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+    for record in records:
+        if writer:
+            writer.writerow([_csv_cell(record[column]) for column in columns])
+        else:
+            buffer.write(json.dumps(record, default=_plain, separators=(",", ":")))
+            buffer.write("\n")
+        if buffer.tell() >= settings.EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def gzipped(chunks: Iterator[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+def stream(kind: str, workspace_id: int, fmt: str, gzip: bool = False) -> Iterator[Any]:
+    columns = [column.name for column in EXPORTS[kind](workspace_id).selected_columns]
+    chunks = encode(rows(kind, workspace_id), fmt, columns)
+    return gzipped(chunks) if gzip else chunks
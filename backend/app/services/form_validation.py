@@ -0,0 +1,176 @@
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# A template schema is either the form builder's {"fields": [...]}, each field
+# {"name", "type", "required"?, "options"?, "min"?, "max"?, "max_length"?,
+# "pattern"?}, or a small JSON Schema subset ({"type": "object", "properties",
+# "required"}) which is translated to fields. Answers not in the schema are
+# kept. Unknown field types accept any value.
+
+Error = Dict[str, Any]
+Check = Callable[[Any], Optional[str]] # message, or None when the value is fine
+
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE = re.compile(r"^\+?[0-9 ().-]{5,20}$")
+
+TEXT_TYPES = ("text", "string", "textarea")
+
+class SchemaError(ValueError):
+    pass
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_iso_date(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+def _type_check(field_type: Optional[str], field: Dict[str, Any]) -> Optional[Check]:
+    if field_type in TEXT_TYPES:
+        return lambda v: None if isinstance(v, str) else "must be a string"
+    if field_type == "email":
+        return lambda v: None if isinstance(v, str) and EMAIL.match(v) else "must be an email address"
+    if field_type == "phone":
+        return lambda v: None if isinstance(v, str) and PHONE.match(v) else "must be a phone number"
+    if field_type == "number":
+        return lambda v: None if _is_number(v) else "must be a number"
+    if field_type == "integer":
+        return lambda v: None if _is_number(v) and float(v).is_integer() else "must be an integer"
+    if field_type in ("boolean", "checkbox"):
+        return lambda v: None if isinstance(v, bool) else "must be true or false"
+    if field_type == "date":
+        return lambda v: None if _is_iso_date(v) else "must be a date (YYYY-MM-DD)"
+    if field_type == "select":
+        options = frozenset(field.get("options") or ())
+        return lambda v: None if v in options else f"must be one of {sorted(options)}"
+    if field_type == "multiselect":
+        options = frozenset(field.get("options") or ())
+        def check(v):
+            if not isinstance(v, list):
+                return "must be a list"
+            if options and not all(item in options for item in v):
+                return f"items must be among {sorted(options)}"
+            return None
+        return check
+    return None
+
+def _compile_field(field: Dict[str, Any]) -> Tuple[str, bool, List[Check]]:
+    name = field.get("name")
+    if not isinstance(name, str) or not name:
+        raise SchemaError("Every field needs a name")
+    field_type = field.get("type")
+    if field_type == "select" and not field.get("options"):
+        raise SchemaError(f"Field {name!r}: select fields need options")
+
+    checks: List[Check] = []
+    type_check = _type_check(field_type, field)
+    if type_check:
+        checks.append(type_check)
+    # Constraints only run once the type check has passed
+    if field.get("min") is not None:
+        low = field["min"]
+        checks.append(lambda v: None if v >= low else f"must be at least {low}")
+    if field.get("max") is not None:
+        high = field["max"]
+        checks.append(lambda v: None if v <= high else f"must be at most {high}")
+    if field.get("max_length") is not None:
+        limit = field["max_length"]
+        if not isinstance(limit, int):
+            raise SchemaError(f"Field {name!r}: max_length must be an integer")
+        checks.append(lambda v: None if len(v) <= limit else f"must be at most {limit} characters")
+    if field.get("pattern"):
+        try:
+            pattern = re.compile(field["pattern"])
+        except re.error as e:
+            raise SchemaError(f"Field {name!r}: invalid pattern: {e}")
+        checks.append(lambda v: None if pattern.search(v) else "has an invalid format")
+    return name, bool(field.get("required")), checks
+
+def _json_schema_fields(schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    required = set(schema.get("required") or ())
+    fields = []
+    for name, prop in (schema.get("properties") or {}).items():
+        prop = prop or {}
+        kind = prop.get("type")
+        field: Dict[str, Any] = {"name": name, "required": name in required}
+        if "enum" in prop:
+            field.update(type="select", options=prop["enum"])
+        elif kind == "array":
+            field.update(type="multiselect", options=(prop.get("items") or {}).get("enum"))
+        elif kind == "string":
+            field["type"] = {"email": "email", "date": "date"}.get(prop.get("format"), "string")
+            field.update(max_length=prop.get("maxLength"), pattern=prop.get("pattern"))
+        elif kind in ("number", "integer", "boolean"):
+            field.update(type=kind, min=prop.get("minimum"), max=prop.get("maximum"))
+        fields.append(field)
+    return fields
+
+def schema_fields(schema: Any) -> List[Dict[str, Any]]:
+    if not isinstance(schema, dict):
+        raise SchemaError("Schema must be an object")
+    if "fields" in schema:
+        fields = schema["fields"]
+        if not isinstance(fields, list) or not all(isinstance(f, dict) for f in fields):
+            raise SchemaError("fields must be a list of objects")
+        return fields
+    if schema.get("type") == "object" or "properties" in schema:
+        return _json_schema_fields(schema)
+    return []
+
+class Validator:
+    """A template schema compiled to per-field check functions."""
+
+    def __init__(self, schema: Any):
+        self.fields = [_compile_field(field) for field in schema_fields(schema)]
+
+    def __call__(self, data: Any) -> List[Error]:
+        if not isinstance(data, dict):
+            return [{"loc": ["data"], "msg": "must be an object", "type": "value_error"}]
+        errors = []
+        for name, required, checks in self.fields:
+            value = data.get(name)
+            if value is None or value == "":
+                if required:
+                    errors.append({"loc": ["data", name], "msg": "is required", "type": "value_error.missing"})
+                continue
+            for check in checks:
+                try:
+                    message = check(value)
+                except TypeError: # a constraint that does not apply to this value's type
+                    message = "has an invalid value"
+                if message:
+                    errors.append({"loc": ["data", name], "msg": message, "type": "value_error"})
+                    break
+        return errors
+
+# Keyed by (template_id, version): an edited template is recompiled the first
+# time each worker sees its new version, so no cross-process invalidation is needed.
+validators = TTLCache(maxsize=settings.FORM_VALIDATOR_CACHE_SIZE, ttl=settings.FORM_VALIDATOR_CACHE_TTL)
+
+def get_validator(template_id: int, version: int, schema: Any) -> Validator:
+    key = (template_id, version)
+    validator = validators.get(key)
+    if validator is None:
+        try:
+            validator = Validator(schema)
+        except SchemaError as e:
+            # Stored before schemas were checked on save; accept submissions as before
+            print(f"[FORMS] Template {template_id} v{version} has an invalid schema, not validating: {e}")
+            validator = Validator({})
+        validators.set(key, validator)
+    return validator
+
+def validate(template, data: Any) -> List[Error]:
+    """Errors for a submission to template, empty when it is valid."""
+    return get_validator(template.id, template.version, template.schema)(data)
+
+def invalidate(template_id: int):
+    validators.discard_where(lambda key, _: key[0] == template_id)
@@ -0,0 +1,193 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.system import IntegrationLog
+
+# Rows per INSERT statement; keeps the bind parameter count well under driver limits
+INSERT_CHUNK = 1000
+
+class BufferedLogWriter:
+    """
+    Collects IntegrationLog rows in memory and writes them with multi-row
+    INSERTs in one transaction, when max_rows have accumulated or every
+    flush_interval seconds, instead of one commit per message. Rows are stamped
+    when they are written to the buffer, not when they reach the database.
+
+    When the writer is not running (tests, scripts) every write is flushed
+    immediately. If the buffer grows past max_buffer because the database is
+    slow or down, the caller flushes inline, and rows from a failed flush are
+    kept for the next one only while there is room.
+    """
+
+    def __init__(self, max_rows: int, flush_interval: float, max_buffer: int):
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counts = {"written": 0, "flushes": 0, "dropped": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="integration-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def write(self, workspace_id: int, integration_type: str, status: str, details: Optional[str] = None):
+        row = {
+            "workspace_id": workspace_id,
+            "integration_type": integration_type,
+            "status": status,
+            "details": details,
+            "timestamp": datetime.now(timezone.utc),
+        }
+        with self._lock:
+            self._buffer.append(row)
+            pending = len(self._buffer)
+        if not self.running or pending >= self.max_buffer:
+            self.flush()
+        elif pending >= self.max_rows:
+            self._wake.set()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            db = SessionLocal()
+            try:
+                for i in range(0, len(rows), INSERT_CHUNK):
+                    db.execute(insert(IntegrationLog.__table__).values(rows[i:i + INSERT_CHUNK]))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                with self._lock:
+                    room = max(0, self.max_buffer - len(self._buffer))
+                    kept = rows[-room:] if room else []
+                    self._buffer[:0] = kept
+                    self.counts["dropped"] += len(rows) - len(kept)
+                print(f"[INTEGRATION_LOG] Flush of {len(rows)} rows failed, kept {len(kept)}: {e}")
+                return 0
+            finally:
+                db.close()
+            with self._lock:
+                self.counts["written"] += len(rows)
+                self.counts["flushes"] += 1
+            return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counts, buffered=len(self._buffer), running=self.running)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+writer = BufferedLogWriter(
+    max_rows=settings.INTEGRATION_LOG_FLUSH_ROWS,
+    flush_interval=settings.INTEGRATION_LOG_FLUSH_MS / 1000,
+    max_buffer=settings.INTEGRATION_LOG_MAX_BUFFER,
+)
+
+# Partition maintenance. On Postgres integration_logs is range-partitioned by
+# month on timestamp (see the migration); partitions are created ahead of time
+# and old ones are dropped whole. Elsewhere retention falls back to deletes.
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+def partition_name(month: date) -> str:
+    return f"integration_logs_p{month:%Y%m}"
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'integration_logs'::regclass)"
+    )).scalar()
+
+def ensure_partitions(db: Session, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    month = _month_start(today or datetime.now(timezone.utc).date())
+    created = []
+    for _ in range(months_ahead + 1):
+        following = _next_month(month)
+        name = partition_name(month)
+        exists = db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar()
+        if not exists:
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF integration_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+            ))
+            created.append(name)
+        month = following
+    return created
+
+def drop_expired_partitions(db: Session, cutoff: datetime) -> List[str]:
+    """Drop monthly partitions whose whole range is older than cutoff."""
+    names = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'integration_logs'"
+    )).scalars().all()
+    dropped = []
+    for name in sorted(names):
+        suffix = name.rsplit("_p", 1)[-1]
+        if not suffix.isdigit() or len(suffix) != 6:
+            continue # the default partition
+        month = date(int(suffix[:4]), int(suffix[4:]), 1)
+        if _next_month(month) <= cutoff.date():
+            db.execute(text(f"ALTER TABLE integration_logs DETACH PARTITION {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+def maintain(now: Optional[datetime] = None):
+    """Periodic job: create upcoming partitions and apply retention."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=settings.INTEGRATION_LOG_RETENTION_DAYS)
+    db = SessionLocal()
+    try:
+        if is_partitioned(db):
+            created = ensure_partitions(db, settings.INTEGRATION_LOG_PARTITIONS_AHEAD, now.date())
+            dropped = drop_expired_partitions(db, cutoff)
+            db.commit()
+            if created or dropped:
+                print(f"[INTEGRATION_LOG] Created partitions {created}, dropped {dropped}")
+        else:
+            deleted = db.query(IntegrationLog).filter(IntegrationLog.timestamp < cutoff).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                print(f"[INTEGRATION_LOG] Deleted {deleted} rows older than {cutoff:%Y-%m-%d}")
+    except Exception as e:
+        db.rollback()
+        print(f"[INTEGRATION_LOG] Maintenance failed: {e}")
+    finally:
+        db.close()
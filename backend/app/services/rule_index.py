@@ -0,0 +1,97 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.forms_inventory import AutomationActionType, AutomationRule
+from app.models.workspace import Workspace
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: int
+    name: str
+    form_template_id: Optional[int]
+    action_type: AutomationActionType
+    action_config: Dict[str, Any]
+
+@dataclass
+class _Entry:
+    version: int
+    checked_at: float
+    by_template: Dict[int, Tuple[CompiledRule, ...]]
+
+class RuleIndex:
+    """
+    Per-workspace map of form template id -> active automation rules, kept in
+    memory by every worker. Rule writes bump workspaces.automation_rules_version
+    in the same transaction; a worker re-reads that single column at most every
+    check_interval seconds and reloads the workspace's rules when it changed,
+    so an edit made through any worker reaches all of them within that bound.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._entries: Dict[int, _Entry] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def rules_for(self, db: Session, workspace_id: int, template_id: int) -> Tuple[CompiledRule, ...]:
+        return self._entry(db, workspace_id).by_template.get(template_id, ())
+
+    def invalidate(self, workspace_id: int):
+        with self._lock:
+            self._entries.pop(workspace_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _entry(self, db: Session, workspace_id: int) -> _Entry:
+        now = time.monotonic()
+        entry = self._entries.get(workspace_id)
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry
+
+        version = db.query(Workspace.automation_rules_version).filter(Workspace.id == workspace_id).scalar() or 0
+        if entry is not None and entry.version == version:
+            entry.checked_at = now
+            return entry
+
+        # Version is read before the rules: a change in between leaves a newer
+        # rule set under an older version, which only causes one extra reload.
+        entry = _Entry(version=version, checked_at=now, by_template=self._load(db, workspace_id))
+        with self._lock:
+            self._entries[workspace_id] = entry
+            self.loads += 1
+        return entry
+
+    def _load(self, db: Session, workspace_id: int) -> Dict[int, Tuple[CompiledRule, ...]]:
+        rules = (
+            db.query(AutomationRule)
+            .filter(AutomationRule.workspace_id == workspace_id, AutomationRule.is_active == 1)
+            .order_by(AutomationRule.id)
+            .all()
+        )
+        by_template: Dict[int, list] = {}
+        for rule in rules:
+            by_template.setdefault(rule.form_template_id, []).append(CompiledRule(
+                id=rule.id,
+                name=rule.name,
+                form_template_id=rule.form_template_id,
+                action_type=rule.action_type,
+                action_config=dict(rule.action_config or {}),
+            ))
+        return {template_id: tuple(compiled) for template_id, compiled in by_template.items()}
+
+rule_index = RuleIndex(check_interval=settings.RULE_INDEX_CHECK_INTERVAL)
+
+def bump_version(db: Session, workspace_id: int):
+    """Mark the workspace's rules as changed. Call inside the transaction that changes them."""
+    db.execute(
+        update(Workspace)
+        .where(Workspace.id == workspace_id)
+        .values(automation_rules_version=Workspace.automation_rules_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,55 @@
+import re
+from typing import Any, Dict, List
+from fastapi import Response
+from sqlalchemy import Float, cast, column, func, literal_column, table
+from sqlalchemy.orm import Session
+from app.core.pagination import PageParams, paginate
+from app.models.crm import MESSAGE_SEARCH_CONFIG, Contact, Conversation, Message
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+messages_fts = table("messages_fts", column("rowid"))
+
+def fts5_query(q: str) -> str:
+    # Each word as a quoted phrase (implicitly ANDed), so user input cannot hit FTS5 syntax
+    return " ".join('"' + word.replace('"', '""') + '"' for word in _WORDS.findall(q))
+
+def has_terms(q: str) -> bool:
+    return bool(_WORDS.search(q))
+
+def search_messages(db: Session, workspace_id: int, q: str, page: PageParams, response: Response) -> List[Dict[str, Any]]:
+    """
+    Messages of the workspace matching q, best match first, keyset-paginated
+    on (rank, id). Postgres parses q with websearch_to_tsquery (quotes, OR and
+    -word work) against the GIN-indexed search_vector and ranks with ts_rank;
+    SQLite matches all words through FTS5 and ranks with bm25.
+    """
+    query = db.query(
+        Message.id,
+        Message.conversation_id,
+        Message.direction,
+        Message.type,
+        Message.content,
+        Message.timestamp,
+        Conversation.contact_id,
+        Contact.name.label("contact_name"),
+    ).join(Conversation, Conversation.id == Message.conversation_id).join(
+        Contact, Contact.id == Conversation.contact_id
+    ).filter(Conversation.workspace_id == workspace_id)
+
+    if db.get_bind().dialect.name == "postgresql":
+        vector = literal_column("messages.search_vector")
+        tsquery = func.websearch_to_tsquery(MESSAGE_SEARCH_CONFIG, q)
+        query = query.filter(vector.op("@@")(tsquery))
+        # ts_rank is float4; as double precision its value survives the JSON
+        # cursor exactly, so rows tied on rank are neither skipped nor repeated
+        rank = cast(func.ts_rank(vector, tsquery), Float(53))
+    else:
+        query = query.join(messages_fts, messages_fts.c.rowid == Message.id).filter(
+            literal_column("messages_fts").op("MATCH")(fts5_query(q))
+        )
+        rank = -func.bm25(literal_column("messages_fts")) # bm25 is lower for better matches
+
+    rank = rank.label("rank")
+    rows = paginate(query.add_columns(rank), [rank, Message.id], page, response, descending=True)
+    return [row._asdict() for row in rows]
@@ -0,0 +1,148 @@
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.operations import Availability, Booking, BookingStatus, Service
+
+Interval = Tuple[datetime, datetime]
+
+# Free slots of one service on one local day: (service_id, date) -> [(start, end)] in UTC
+slot_cache = TTLCache(maxsize=settings.SLOT_CACHE_SIZE, ttl=settings.SLOT_CACHE_TTL)
+
+# Bookings are never longer than this (ServiceCreate caps duration to it), so
+# the range query can stay on the (service_id, start_time) index instead of
+# filtering on end_time alone.
+MAX_BOOKING_LENGTH = timedelta(days=1)
+
+def workspace_zone(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"[SLOTS] Unknown timezone {name!r}, falling back to UTC")
+        return ZoneInfo("UTC")
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def availability_windows(availabilities: Iterable[Availability], days: Sequence[date], tz: ZoneInfo) -> List[Tuple[date, datetime, datetime]]:
+    """Weekly windows expanded onto concrete local days, as sorted UTC intervals tagged with their day."""
+    by_weekday: Dict[int, List[Tuple[time, time]]] = {}
+    for availability in availabilities:
+        by_weekday.setdefault(availability.day_of_week, []).append((availability.start_time, availability.end_time))
+
+    windows = []
+    for day in days:
+        for start, end in by_weekday.get(day.weekday(), []):
+            local_start = datetime.combine(day, start, tzinfo=tz)
+            local_end = datetime.combine(day, end, tzinfo=tz)
+            if local_end > local_start:
+                windows.append((day, as_utc(local_start), as_utc(local_end)))
+    windows.sort(key=lambda w: (w[1], w[2]))
+
+    # Overlapping windows on the same day would otherwise yield duplicate slots
+    merged: List[Tuple[date, datetime, datetime]] = []
+    for day, start, end in windows:
+        if merged and merged[-1][0] == day and start <= merged[-1][2]:
+            merged[-1] = (day, merged[-1][1], max(merged[-1][2], end))
+        else:
+            merged.append((day, start, end))
+    return merged
+
+def sweep(windows: Sequence[Tuple[date, datetime, datetime]], busy: Sequence[Interval], duration: timedelta) -> Dict[date, List[Interval]]:
+    """
+    Cut each window into back-to-back slots of `duration` starting at the window
+    start, skipping slots that overlap a busy interval. Windows and busy
+    intervals are both sorted by start, so one pass over each is enough: the
+    busy pointer only moves forward, and a blocked slot jumps straight to the
+    first grid position after the booking ends.
+    """
+    slots: Dict[date, List[Interval]] = {}
+    j = 0
+    for day, window_start, window_end in windows:
+        day_slots = slots.setdefault(day, [])
+        start = window_start
+        while start + duration <= window_end:
+            end = start + duration
+            while j < len(busy) and busy[j][1] <= start:
+                j += 1
+            # The earliest-starting remaining booking may not be the one that
+            # blocks this slot, so look at every booking that starts before it ends
+            k, blocked_until = j, None
+            while k < len(busy) and busy[k][0] < end:
+                if busy[k][1] > start:
+                    blocked_until = max(blocked_until or busy[k][1], busy[k][1])
+                k += 1
+            if blocked_until is None:
+                day_slots.append((start, end))
+                start = end
+            else:
+                steps = -(-(blocked_until - window_start) // duration)  # ceiling division
+                start = window_start + steps * duration
+    return slots
+
+async def load_busy(db: AsyncSession, service_id: int, range_start: datetime, range_end: datetime) -> List[Interval]:
+    result = await db.execute(
+        select(Booking.start_time, Booking.end_time)
+        .where(
+            Booking.service_id == service_id,
+            Booking.start_time >= range_start - MAX_BOOKING_LENGTH,
+            Booking.start_time < range_end,
+            Booking.status != BookingStatus.CANCELLED,
+        )
+        .order_by(Booking.start_time)
+    )
+    busy = [(as_utc(start), as_utc(end)) for start, end in result.all()]
+    return [interval for interval in busy if interval[1] > range_start]
+
+async def compute_slots(db: AsyncSession, service: Service, tz: ZoneInfo, days: Sequence[date]) -> Dict[date, List[Interval]]:
+    """Free slots for the given local days straight from the database (no cache)."""
+    availabilities = (await db.execute(
+        select(Availability).where(Availability.service_id == service.id)
+    )).scalars().all()
+    windows = availability_windows(availabilities, days, tz)
+    result: Dict[date, List[Interval]] = {day: [] for day in days}
+    if not windows:
+        return result
+    busy = await load_busy(db, service.id, windows[0][1], max(w[2] for w in windows))
+    result.update(sweep(windows, busy, timedelta(minutes=service.duration)))
+    return result
+
+async def get_slots(db: AsyncSession, service: Service, tz: ZoneInfo, first_day: date, last_day: date) -> Dict[date, List[Interval]]:
+    """Free slots per local day in [first_day, last_day], served from the per-day cache where possible."""
+    days = [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+    slots: Dict[date, List[Interval]] = {}
+    missing = []
+    for day in days:
+        cached = slot_cache.get((service.id, day))
+        if cached is None:
+            missing.append(day)
+        else:
+            slots[day] = cached
+    if missing:
+        # One availability query and one booking range query cover every uncached day
+        fresh = await compute_slots(db, service, tz, missing)
+        for day in missing:
+            slot_cache.set((service.id, day), fresh[day])
+            slots[day] = fresh[day]
+    return slots
+
+async def is_free_slot(db: AsyncSession, service: Service, tz: ZoneInfo, start: datetime) -> bool:
+    """Whether `start` is the start of a free slot, checked against the database rather than the cache."""
+    start = as_utc(start)
+    day = start.astimezone(tz).date()
+    day_slots = (await compute_slots(db, service, tz, [day]))[day]
+    i = bisect_left(day_slots, (start,))
+    return i < len(day_slots) and day_slots[i][0] == start
+
+def invalidate(service_id: int, start: datetime):
+    """Drop cached days a booking at `start` may fall on (the local date is within a day of the UTC date)."""
+    utc_day = as_utc(start).date()
+    for offset in (-1, 0, 1):
+        slot_cache.pop((service_id, utc_day + timedelta(days=offset)))
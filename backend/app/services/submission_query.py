@@ -0,0 +1,193 @@
+import hashlib
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import case, cast, func, select, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Query, Session
+from app.core.database import SessionLocal, engine
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.services import alerts
+
+# Filters are given as field:op:value, e.g. allergies:contains:pollen, age:gte:30
+FILTER_OPS = ("eq", "contains", "gt", "gte", "lt", "lte")
+RANGE_OPS = {"gt": "__gt__", "gte": "__ge__", "lt": "__lt__", "lte": "__le__"}
+RANGE_TYPES = ("number", "date")
+
+class FilterError(ValueError):
+    pass
+
+def template_fields(schema: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    fields = (schema or {}).get("fields") or []
+    return {field["name"]: field for field in fields if isinstance(field, dict) and field.get("name")}
+
+def parse_filter(raw: str) -> Tuple[str, str, str]:
+    parts = raw.split(":", 2)
+    if len(parts) != 3 or not parts[0] or parts[1] not in FILTER_OPS:
+        raise FilterError(f"Invalid filter {raw!r}, expected field:op:value with op one of {', '.join(FILTER_OPS)}")
+    return parts[0], parts[1], parts[2]
+
+def coerce(value: str, field_type: Optional[str]) -> Any:
+    if field_type == "number":
+        try:
+            number = float(value)
+        except ValueError:
+            raise FilterError(f"{value!r} is not a number")
+        return int(number) if number.is_integer() else number
+    if field_type == "boolean":
+        if value.lower() not in ("true", "false"):
+            raise FilterError(f"{value!r} is not true or false")
+        return value.lower() == "true"
+    if field_type == "date":
+        try:
+            date.fromisoformat(value[:10])
+        except ValueError:
+            raise FilterError(f"{value!r} is not an ISO date")
+    return value
+
+def _contains(name: str, value: Any):
+    # data @> {"name": value}, answered from the GIN index
+    return FormSubmission.data.op("@>")(cast({name: value}, JSONB))
+
+def _has_element(name: str, value: Any):
+    # SQLite: the answer is a JSON array holding value
+    elements = func.json_each(FormSubmission.data, f'$."{name}"').table_valued("value")
+    return select(1).select_from(elements).where(elements.c.value == value).exists()
+
+def _number(name: str, postgres: bool):
+    # Blank or malformed answers (optional fields, rows saved before validation)
+    # are NULL rather than cast: the cast fails on Postgres and reads as 0 on SQLite
+    if postgres:
+        is_number = func.jsonb_typeof(FormSubmission.data[name]) == "number"
+    else:
+        is_number = func.json_type(FormSubmission.data, f'$."{name}"').in_(("integer", "real"))
+    return case((is_number, FormSubmission.data[name].as_float()))
+
+def _extract(name: str, field_type: Optional[str], postgres: bool):
+    element = FormSubmission.data[name]
+    if field_type == "number":
+        return _number(name, postgres)
+    if field_type == "boolean":
+        return element.as_boolean()
+    return element.as_string()
+
+def filter_clause(db: Session, name: str, op: str, raw_value: str, fields: Dict[str, Dict[str, Any]]):
+    field = fields.get(name) or {}
+    field_type = field.get("type")
+    value = coerce(raw_value, field_type)
+    postgres = db.get_bind().dialect.name == "postgresql"
+
+    if op == "eq":
+        if postgres and not (field.get("indexed") and field_type not in ("number", "boolean")):
+            return _contains(name, value)
+        # Matches the expression index of an indexed field on Postgres
+        return _extract(name, field_type, postgres) == value
+    if op == "contains":
+        return _contains(name, [value]) if postgres else _has_element(name, value)
+    if field_type not in RANGE_TYPES:
+        raise FilterError(f"{op} needs {name!r} declared as a number or date field in the template")
+    # ISO dates compare correctly as strings
+    return getattr(_extract(name, field_type, postgres), RANGE_OPS[op])(value)
+
+def apply_filters(db: Session, query: Query, filters: Sequence[str], schema: Optional[Dict[str, Any]]) -> Query:
+    """
+    Narrow a FormSubmission query by answers. Equality and containment work on
+    any field; range operators need the field's type (number or date) from the
+    template schema, so they require the query to be scoped to one template.
+    Raises FilterError on a malformed filter.
+    """
+    fields = template_fields(schema)
+    for raw in filters:
+        query = query.filter(filter_clause(db, *parse_filter(raw), fields))
+    return query
+
+# Fields a template marks "indexed": true get a partial expression index on
+# Postgres, ON form_submissions ((data ->> 'field')) WHERE template_id = N,
+# which serves equality and date ranges on that field within the template
+# without adding a column per field. Numbers and booleans are left to the GIN
+# index: a cast in the index would make submissions with a malformed answer
+# fail to insert.
+
+INDEX_PREFIX = "ix_form_submissions_t"
+INDEXED_TYPES = (None, "text", "string", "email", "phone", "select", "date")
+
+def field_index_name(template_id: int, field_name: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", field_name.lower()).strip("_")[:24]
+    digest = hashlib.sha1(field_name.encode()).hexdigest()[:8]
+    return f"{INDEX_PREFIX}{template_id}_{slug}_{digest}"
+
+def desired_field_indexes(template_id: int, schema: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    return {
+        field_index_name(template_id, name): name
+        for name, field in template_fields(schema).items()
+        if field.get("indexed") and field.get("type") in INDEXED_TYPES
+    }
+
+# One sync at a time per worker; each reads the template's current schema, so the last save wins
+_sync_lock = threading.Lock()
+
+def sync_field_indexes(template_id: int, schema: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Create and drop this template's field indexes to match its schema. Runs
+    outside any transaction with CONCURRENTLY, so submissions keep flowing
+    while an index builds. An index left INVALID by a failed build is dropped
+    and built again. A no-op except on Postgres. Returns the DDL run.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    wanted = desired_field_indexes(template_id, schema)
+    statements = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = dict(conn.execute(
+            text(
+                "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = 'form_submissions'::regclass AND c.relname LIKE :prefix"
+            ),
+            {"prefix": f"{INDEX_PREFIX}{template_id}\\_%"},
+        ).all())
+        valid = {name for name, is_valid in existing.items() if is_valid}
+        for name in sorted(set(existing) - valid):
+            statements.append(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        for name in sorted(valid - set(wanted)):
+            statements.append(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        for name, field_name in sorted(wanted.items()):
+            if name in valid:
+                continue
+            literal = field_name.replace("'", "''")
+            statements.append(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON form_submissions "
+                f"((data ->> '{literal}')) WHERE template_id = {int(template_id)}"
+            )
+        for statement in statements:
+            conn.execute(text(statement.replace(":", "\\:"))) # field names are not bind parameters
+    if statements:
+        print(f"[FORMS] Synced field indexes for template {template_id}: {statements}")
+    return statements
+
+def sync_template_indexes(template_id: int):
+    """
+    Background job queued when a template is saved. An index build can take
+    minutes on a large table, so it runs after the response; a failure is
+    raised as a workspace alert rather than failing the save, and the next
+    save of the template retries it.
+    """
+    with _sync_lock:
+        db = SessionLocal()
+        try:
+            template = db.get(FormTemplate, template_id)
+            if template is None:
+                return
+            workspace_id, name, schema = template.workspace_id, template.name, template.schema
+            db.rollback() # no transaction held open while indexes build
+            try:
+                sync_field_indexes(template_id, schema)
+            except Exception as e:
+                print(f"[FORMS] Field index sync for template {template_id} failed: {e}")
+                alerts.raise_alert(
+                    db, workspace_id, "form_index_failed", f"form_template:{template_id}",
+                    f"Search indexes for form '{name}' could not be built; filtering its submissions may be slow. Save the form again to retry.",
+                )
+                db.commit()
+        finally:
+            db.close()
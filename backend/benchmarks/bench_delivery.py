@@ -0,0 +1,98 @@
+"""
+Delivery throughput against the local fake provider: queues a burst of
+confirmation-style emails and SMS across several workspaces and reports
+how fast they drain, how many provider requests batching saved, and how
+long send() blocked the caller.
+
+    python -m benchmarks.bench_delivery --messages 5000 --workspaces 10 --latency-ms 50 --failure-rate 0.02
+"""
+import argparse
+import os
+import time
+
+from benchmarks import common
+from benchmarks.fake_provider import FakeProvider
+
+def run(args):
+    provider = FakeProvider(latency=args.latency_ms / 1000, failure_rate=args.failure_rate).start()
+    # Settings are read at import, so point the providers at the fake first
+    os.environ["RESEND_API_URL"] = provider.url
+    os.environ["TWILIO_API_URL"] = provider.url
+    os.environ["DELIVERY_RATE_PER_WORKSPACE"] = str(args.rate)
+    os.environ["DELIVERY_BACKOFF_BASE"] = "0.2"
+    common.reset_schema()
+
+    from app.core.database import SessionLocal
+    from app.models.system import IntegrationLog
+    from app.models.workspace import Workspace
+    from app.services import delivery
+
+    db = SessionLocal()
+    workspaces = [
+        Workspace(
+            name=f"Clinic {i}", contact_email=f"clinic{i}@example.com", status="active",
+            settings={
+                "email": {"provider": "resend", "api_key": "re_bench"},
+                "sms": {"provider": "twilio", "account_sid": "ACbench", "auth_token": "bench", "from": "+15550100"},
+            },
+        )
+        for i in range(args.workspaces)
+    ]
+    db.add_all(workspaces)
+    db.commit()
+    workspace_ids = [ws.id for ws in workspaces]
+    db.close()
+
+    service = delivery.service
+    service.start()
+    enqueue_latency = []
+    started = time.perf_counter()
+    for i in range(args.messages):
+        sms = i % 100 < args.sms_percent
+        t0 = time.perf_counter()
+        delivery.send(
+            workspace_ids[i % len(workspace_ids)],
+            "sms" if sms else "email",
+            "+15550199" if sms else f"contact{i}@example.com",
+            f"Booking confirmed #{i}",
+            subject="Booking confirmed",
+            kind="booking_confirmation",
+        )
+        enqueue_latency.append(time.perf_counter() - t0)
+    enqueued = time.perf_counter() - started
+
+    while True:
+        stats = service.stats()
+        if stats["sent"] + stats["failed"] >= args.messages:
+            break
+        if time.perf_counter() - started > args.timeout:
+            print("Timed out waiting for deliveries")
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    service.stop()
+
+    db = SessionLocal()
+    logged = db.query(IntegrationLog).count()
+    db.close()
+    provider.stop()
+
+    stats = service.stats()
+    common.print_latency("send() (enqueue)", enqueue_latency, enqueued)
+    print(f"delivered={stats['sent']} failed={stats['failed']} retried={stats['retried']} deferred={stats['deferred']}")
+    print(f"provider requests={provider.requests} (for {args.messages} messages) logs written={logged}")
+    print(f"drained in {elapsed:.2f}s: {stats['sent'] / elapsed * 60:,.0f} messages/minute")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--workspaces", type=int, default=10)
+    parser.add_argument("--sms-percent", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=100, help="per-workspace messages/second")
+    parser.add_argument("--timeout", type=float, default=300)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Fires many simultaneous bookings at one slot and checks that exactly one
+wins: every other request must get 409, never a 500 and never a second row.
+
+    python -m benchmarks.bench_double_booking --requests 300 --concurrency 300
+
+Point DATABASE_URL at Postgres to exercise the exclusion constraint; the
+default SQLite database exercises the trigger fallback.
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from benchmarks import common
+
+async def run(args):
+    common.reset_schema()
+
+    from httpx import ASGITransport, AsyncClient
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models.crm import Contact
+    from app.models.operations import Availability, Booking, Service
+    from app.models.workspace import Workspace
+
+    # Next Monday at 10:00 UTC, inside the seeded availability window
+    today = date.today()
+    monday = today + timedelta(days=7 - today.weekday())
+    slot = datetime.combine(monday, dt_time(10), tzinfo=timezone.utc)
+
+    db = SessionLocal()
+    ws = Workspace(name="Bench Clinic", contact_email="bench@example.com", timezone="UTC", status="active")
+    db.add(ws)
+    db.flush()
+    service = Service(workspace_id=ws.id, name="Consultation", duration=60)
+    db.add(service)
+    db.flush()
+    db.add(Availability(service_id=service.id, day_of_week=0, start_time=dt_time(9), end_time=dt_time(17)))
+    contacts = [Contact(workspace_id=ws.id, name=f"Contact {i}", email=f"c{i}@example.com") for i in range(args.requests)]
+    db.add_all(contacts)
+    db.commit()
+    workspace_id, service_id = ws.id, service.id
+    contact_ids = [c.id for c in contacts]
+    db.close()
+
+    latency = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    start_gate = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def book(contact_id):
+            async with semaphore:
+                await start_gate.wait()
+                started = time.perf_counter()
+                resp = await client.post(
+                    f"/api/v1/public/workspaces/{workspace_id}/bookings",
+                    json={"service_id": service_id, "contact_id": contact_id, "start_time": slot.isoformat()},
+                )
+                latency.append(time.perf_counter() - started)
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+        tasks = [asyncio.create_task(book(contact_id)) for contact_id in contact_ids]
+        await asyncio.sleep(0)  # let every task reach the gate
+        started = time.perf_counter()
+        start_gate.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    booked = db.query(Booking).filter(Booking.service_id == service_id).count()
+    db.close()
+
+    common.print_latency("booking one slot", latency, elapsed)
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    print(f"bookings stored for the slot: {booked}")
+    ok = booked == 1 and statuses.get(200) == 1 and statuses.get(409, 0) == args.requests - 1
+    print("PASS" if ok else "FAIL: expected exactly one 200 and 409 for the rest")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=300)
+    ok = asyncio.run(run(parser.parse_args()))
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
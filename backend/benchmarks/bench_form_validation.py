@@ -0,0 +1,70 @@
+"""
+Per-submission cost of validating form data against a template schema:
+the cached compiled validator used by submit_form_template, against
+compiling the schema on every submission (what re-interpreting it per
+request costs). Half the submissions are invalid.
+
+    python -m benchmarks.bench_form_validation --fields 30 --submissions 50000
+"""
+import argparse
+import time
+
+from benchmarks import common
+
+FIELD_KINDS = [
+    ({"type": "text", "max_length": 200}, "Some answer"),
+    ({"type": "email"}, "ada@example.com"),
+    ({"type": "phone"}, "+1 555 010 0199"),
+    ({"type": "integer", "min": 0, "max": 130}, 42),
+    ({"type": "date"}, "2030-01-05"),
+    ({"type": "select", "options": ["a", "b", "c", "d"]}, "c"),
+    ({"type": "multiselect", "options": ["x", "y", "z"]}, ["x", "z"]),
+    ({"type": "boolean"}, True),
+]
+
+def make_schema(count: int):
+    fields, answers = [], {}
+    for i in range(count):
+        spec, answer = FIELD_KINDS[i % len(FIELD_KINDS)]
+        name = f"field_{i}"
+        fields.append(dict(spec, name=name, required=i % 3 == 0))
+        answers[name] = answer
+    return {"fields": fields}, answers
+
+def measure(validate, submissions):
+    latency = []
+    started = time.perf_counter()
+    for data in submissions:
+        t0 = time.perf_counter()
+        validate(data)
+        latency.append(time.perf_counter() - t0)
+    return latency, time.perf_counter() - started
+
+def run(args):
+    from app.services import form_validation
+
+    schema, valid = make_schema(args.fields)
+    invalid = dict(valid, field_0=None, field_3=500, field_4="soon")
+    submissions = [valid if i % 2 else invalid for i in range(args.submissions)]
+    errors = sum(1 for data in submissions[:2] if form_validation.Validator(schema)(data))
+    assert errors == 1, "expected exactly one of the two sample submissions to fail"
+
+    form_validation.validators.clear()
+    cached, cached_elapsed = measure(lambda data: form_validation.get_validator(1, 1, schema)(data), submissions)
+    uncached, uncached_elapsed = measure(lambda data: form_validation.Validator(schema)(data), submissions)
+
+    print(f"{args.fields} fields, {args.submissions} submissions")
+    common.print_latency("compiled + cached", cached, cached_elapsed)
+    common.print_latency("compiled per submission", uncached, uncached_elapsed)
+    per_cached = cached_elapsed / len(cached) * 1e6
+    per_uncached = uncached_elapsed / len(uncached) * 1e6
+    print(f"per submission: {per_cached:.1f}us cached vs {per_uncached:.1f}us uncached ({per_uncached / per_cached:.1f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--submissions", type=int, default=50000)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Many threads recording usage against the same inventory item. The item
+starts with exactly enough stock for every request, so the final quantity
+must be zero and exactly one INVENTORY_LOW event must have been recorded.
+--naive runs the old read-check-write sequence for comparison.
+
+    python -m benchmarks.bench_inventory_contention --threads 32 --requests 5000
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import common
+
+def naive_usage(item_id: int, quantity_used: int):
+    # The pre-atomic implementation: read, check in Python, write back
+    from app.core.database import SessionLocal
+    from app.models.forms_inventory import InventoryItem
+
+    db = SessionLocal()
+    try:
+        item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+        if item.quantity < quantity_used:
+            return 400
+        item.quantity -= quantity_used
+        db.commit()
+        return 200
+    finally:
+        db.close()
+
+def run(args):
+    common.reset_schema()
+
+    from fastapi import HTTPException
+    from app.core.database import SessionLocal
+    from app.models.forms_inventory import InventoryItem
+    from app.models.system import OutboxEvent
+    from app.models.user import UserRole
+    from app.models.workspace import Workspace
+    from app.routers import deps
+    from app.routers.inventory import InventoryUsageCreate, record_usage
+
+    db = SessionLocal()
+    ws = Workspace(name="Bench Clinic", contact_email="bench@example.com", status="active")
+    db.add(ws)
+    db.flush()
+    item = InventoryItem(workspace_id=ws.id, name="Gloves", quantity=args.requests, low_stock_threshold=args.requests // 10)
+    db.add(item)
+    db.commit()
+    item_id, workspace_id = item.id, ws.id
+    db.close()
+
+    principal = deps.Principal(id=1, email="bench@example.com", role=UserRole.OWNER, workspace_id=workspace_id, workspace_status="active")
+    latency = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def atomic_usage(_):
+        # Calls the endpoint function directly so the numbers reflect the
+        # database work rather than the HTTP stack
+        db = SessionLocal()
+        try:
+            record_usage(InventoryUsageCreate(item_id=item_id, quantity_used=1), principal, db)
+            return 200
+        except HTTPException as e:
+            return e.status_code
+        finally:
+            db.close()
+
+    def one(i):
+        started = time.perf_counter()
+        try:
+            status = naive_usage(item_id, 1) if args.naive else atomic_usage(i)
+        except Exception as e:
+            status = type(e).__name__
+        elapsed = time.perf_counter() - started
+        with lock:
+            latency.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    final = db.query(InventoryItem.quantity).filter(InventoryItem.id == item_id).scalar()
+    low_events = db.query(OutboxEvent).filter(OutboxEvent.event_type == "INVENTORY_LOW").count()
+    db.close()
+
+    succeeded = statuses.get(200, 0)
+    lost = final - (args.requests - succeeded)
+    common.print_latency("naive usage" if args.naive else "atomic usage", latency, elapsed)
+    print(f"status codes: {statuses}")
+    print(f"start={args.requests} succeeded={succeeded} final={final} lost updates={lost}")
+    print(f"INVENTORY_LOW events: {low_events}")
+    ok = lost == 0 and (args.naive or low_events == 1)
+    print("PASS" if ok else "FAIL")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--naive", action="store_true")
+    ok = run(parser.parse_args())
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Login throughput under a storm of concurrent logins, plus the latency of an
+unrelated cheap endpoint measured at the same time (it should stay flat,
+since bcrypt runs on the bounded hashing pool rather than the event loop).
+
+    python -m benchmarks.bench_login --users 200 --concurrency 100 --requests 1000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import common
+
+async def run(args):
+    common.reset_schema()
+
+    from httpx import ASGITransport, AsyncClient
+    from app.core import security
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models.user import User, UserRole
+    from app.models.workspace import Workspace
+
+    db = SessionLocal()
+    ws = Workspace(name="Bench Clinic", contact_email="bench@example.com", status="active")
+    db.add(ws)
+    db.flush()
+    # One hash shared by every seeded user keeps seeding fast at any cost factor
+    password_hash = security.pwd_context.hash("password")
+    db.add_all([
+        User(email=f"staff{i}@example.com", password_hash=password_hash, role=UserRole.STAFF, workspace_id=ws.id)
+        for i in range(args.users)
+    ])
+    db.commit()
+    db.close()
+
+    login_latency, probe_latency = [], []
+    statuses = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    done = asyncio.Event()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def login(i):
+            async with semaphore:
+                started = time.perf_counter()
+                resp = await client.post(
+                    "/api/v1/login/access-token",
+                    data={"username": f"staff{i % args.users}@example.com", "password": "password"},
+                )
+                login_latency.append(time.perf_counter() - started)
+                statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                probe_latency.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    print(f"bcrypt rounds={security.settings.BCRYPT_ROUNDS} hashing workers={security.hashing.workers} "
+          f"max pending={security.hashing.max_pending}")
+    common.print_latency("login", login_latency, elapsed)
+    common.print_latency("GET / during storm", probe_latency, elapsed)
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Cost of turning a large list of ORM rows into a JSON response: a route with no
+response model (FastAPI walks each object with jsonable_encoder, then
+json.dumps) against the same route with a declared response model (validated
+from attributes and dumped straight to bytes by pydantic-core). Both routes
+return the same preloaded messages, so only serialization differs.
+
+    python -m benchmarks.bench_serialization --rows 500 --requests 200
+"""
+import argparse
+import time
+from typing import List
+
+from benchmarks import common
+
+def seed(count: int):
+    from app.core.database import SessionLocal
+    from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
+    from app.models.workspace import Workspace
+
+    db = SessionLocal()
+    ws = Workspace(name="Bench Clinic", contact_email="bench@example.com", status="active")
+    db.add(ws)
+    db.flush()
+    contact = Contact(workspace_id=ws.id, name="Ada", email="ada@example.com")
+    db.add(contact)
+    db.flush()
+    conversation = Conversation(workspace_id=ws.id, contact_id=contact.id, status="active")
+    db.add(conversation)
+    db.flush()
+    db.add_all([
+        Message(
+            conversation_id=conversation.id,
+            direction=MessageDirection.INBOUND if i % 2 else MessageDirection.OUTBOUND,
+            type=MessageType.EMAIL,
+            content=f"Message {i}: could we move my appointment to later in the week?",
+        )
+        for i in range(count)
+    ])
+    db.commit()
+    messages = db.query(Message).order_by(Message.id).all()
+    db.close() # loaded attributes stay readable on the detached rows
+    return messages
+
+def measure(client, path: str, requests: int):
+    latency = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        resp = client.get(path)
+        latency.append(time.perf_counter() - t0)
+        assert resp.status_code == 200, resp.text
+    return latency, time.perf_counter() - started, resp.json()
+
+def run(args):
+    common.reset_schema()
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.schemas.crm import MessageOut
+
+    messages = seed(args.rows)
+
+    bench = FastAPI()
+
+    @bench.get("/untyped")
+    def untyped():
+        return messages
+
+    @bench.get("/typed", response_model=List[MessageOut])
+    def typed():
+        return messages
+
+    with TestClient(bench) as client:
+        before, before_elapsed, before_body = measure(client, "/untyped", args.requests)
+        after, after_elapsed, after_body = measure(client, "/typed", args.requests)
+
+    assert len(before_body) == len(after_body) == args.rows
+    print(f"{args.rows} messages per response, {args.requests} requests")
+    common.print_latency("jsonable_encoder (before)", before, before_elapsed)
+    common.print_latency("response model (after)", after, after_elapsed)
+    print(f"per response: {before_elapsed / args.requests * 1000:.2f}ms before vs "
+          f"{after_elapsed / args.requests * 1000:.2f}ms after ({before_elapsed / after_elapsed:.1f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500) # PAGE_SIZE_MAX
+    parser.add_argument("--requests", type=int, default=200)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
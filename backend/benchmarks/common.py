@@ -0,0 +1,60 @@
+"""
+Shared setup for the benchmark scripts. Import it before anything from `app`:
+unless DATABASE_URL is already set it points the app at a throwaway SQLite
+database, so the benchmarks run anywhere. Set DATABASE_URL to benchmark
+against Postgres.
+
+Run from the backend directory, e.g. `python -m benchmarks.bench_login`.
+"""
+import os
+import statistics
+import sys
+import tempfile
+from typing import Dict, List
+
+sys.path.append(os.getcwd())
+
+THROWAWAY_DATABASE = not os.environ.get("DATABASE_URL")
+if THROWAWAY_DATABASE:
+    _db_dir = tempfile.mkdtemp(prefix="careops-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+def reset_schema(force: bool = False):
+    """
+    Drop and recreate every table. Refused for a DATABASE_URL that was given
+    unless its database name contains "bench" or force is set, so a
+    benchmark never wipes a development or production database by accident.
+    """
+    from sqlalchemy.engine import make_url
+    from app.core.database import Base, engine
+    import app.models  # noqa: F401 - registers every table on Base
+
+    name = make_url(os.environ["DATABASE_URL"]).database or ""
+    if not (THROWAWAY_DATABASE or force or "bench" in os.path.basename(name).lower()):
+        sys.exit(f"Refusing to drop every table in '{name}': point DATABASE_URL at a database whose name contains 'bench' (benchmarks.run also takes --reset)")
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    pick = lambda q: round(ordered[min(last, int(q * len(ordered)))] * 1000, 2)
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "mean": round(statistics.fmean(ordered) * 1000, 2),
+        "max": round(ordered[-1] * 1000, 2),
+    }
+
+def print_latency(label: str, samples: List[float], elapsed: float):
+    summary = percentiles(samples)
+    rate = len(samples) / elapsed if elapsed else 0.0
+    print(
+        f"{label:<28} n={len(samples):<6} {rate:8.1f} req/s  "
+        f"p50={summary['p50']}ms p95={summary['p95']}ms p99={summary['p99']}ms max={summary['max']}ms"
+    )
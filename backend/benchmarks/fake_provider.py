@@ -0,0 +1,116 @@
+"""
+Local stand-in for the Resend and Twilio APIs, for tests and benchmarks.
+Implements just the endpoints the delivery service calls, with optional
+latency and a failure rate (HTTP 503) to exercise retries.
+
+    python -m benchmarks.fake_provider --port 8025 --latency-ms 50 --failure-rate 0.01
+
+then start the API with RESEND_API_URL=http://127.0.0.1:8025 and
+TWILIO_API_URL=http://127.0.0.1:8025.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+TWILIO_PATH = re.compile(r"^/2010-04-01/Accounts/[^/]+/Messages\.json$")
+
+class FakeProvider:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_next = 0 # Fail this many upcoming requests regardless of failure_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.emails = []
+        self.sms = []
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeProvider":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-provider", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                fail = True
+            else:
+                fail = random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            return fail
+
+    def _handler(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive, so client pooling is visible
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if provider.latency:
+                    time.sleep(provider.latency)
+                if provider._should_fail():
+                    return self._reply(503, {"message": "temporarily unavailable"})
+
+                if self.path == "/emails/batch":
+                    emails = json.loads(raw or b"[]")
+                    with provider.lock:
+                        provider.emails.extend(emails)
+                    return self._reply(200, {"data": [{"id": str(uuid.uuid4())} for _ in emails]})
+                if TWILIO_PATH.match(self.path):
+                    form = {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+                    with provider.lock:
+                        provider.sms.append(form)
+                    return self._reply(201, {"sid": "SM" + uuid.uuid4().hex, "status": "queued"})
+                self._reply(404, {"message": "not found"})
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    args = parser.parse_args()
+    provider = FakeProvider(args.host, args.port, args.latency_ms / 1000, args.failure_rate)
+    print(f"Fake provider listening on {provider.url}")
+    try:
+        provider.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
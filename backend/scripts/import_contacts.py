@@ -0,0 +1,61 @@
+"""
+Bulk-import contacts into a workspace from a CSV (with a header row) or
+NDJSON file, using the same staging and merge as the import endpoint.
+
+    python scripts/import_contacts.py --workspace 1 contacts.csv
+    python scripts/import_contacts.py --workspace 1 --format ndjson --no-welcome contacts.ndjson
+    zcat contacts.csv.gz | python scripts/import_contacts.py --workspace 1 -
+
+Run from the backend directory. Welcome events go to the outbox and are sent
+by a running API's dispatcher.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.models.crm import ContactImport
+from app.models.workspace import Workspace
+from app.services import contact_import
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--workspace", type=int, required=True)
+    parser.add_argument("--format", choices=contact_import.FORMATS, help="defaults to the file extension, else csv")
+    parser.add_argument("--no-welcome", action="store_true", help="do not send welcome messages to new contacts")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    db = SessionLocal()
+    try:
+        if not db.get(Workspace, args.workspace):
+            sys.exit(f"Workspace {args.workspace} not found")
+        job = ContactImport(workspace_id=args.workspace, format=fmt, send_welcome=not args.no_welcome, status="pending")
+        db.add(job)
+        db.commit()
+        import_id = job.id
+    finally:
+        db.close()
+
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        contact_import.run_import(import_id, stream)
+    finally:
+        stream.close()
+
+    db = SessionLocal()
+    try:
+        job = db.get(ContactImport, import_id)
+        print(f"Import {job.id} {job.status}: {job.total_rows} rows, {job.inserted} new, "
+              f"{job.duplicates} duplicates, {job.invalid_rows} invalid")
+        if job.error:
+            print(f"Error: {job.error}")
+            sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
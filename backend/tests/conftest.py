@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before anything imports settings.
+_db_dir = tempfile.mkdtemp(prefix="careops-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def fresh_schema():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so startup hooks (event bus workers,
+    # outbox dispatcher) stay off and tests drive them explicitly.
+    return TestClient(app)
+
+
+@pytest.fixture
+def workspace(db):
+    from app.models.workspace import Workspace
+
+    ws = Workspace(name="Test Clinic", contact_email="clinic@example.com", timezone="UTC", status="active")
+    db.add(ws)
+    db.commit()
+    db.refresh(ws)
+    return ws
+
+
+@pytest.fixture
+def owner(db, workspace):
+    from app.core import security
+    from app.models.user import User, UserRole
+
+    user = User(email="owner@example.com", password_hash=security.get_password_hash("secret"), role=UserRole.OWNER, workspace_id=workspace.id)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def auth_headers(owner):
+    from app.core import security
+
+    return {"Authorization": f"Bearer {security.create_access_token(owner.id)}"}
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    from app.routers import deps
+
+    deps.principal_cache.clear()
+    yield
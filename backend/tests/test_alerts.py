@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.models.system import Alert
+from app.models.workspace import WorkspaceCounters
+from app.services import alerts
+
+T0 = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+WINDOW = timedelta(seconds=settings.ALERT_SUPPRESSION_WINDOW_SECONDS)
+
+
+def raise_low(db, workspace, now, subject="inventory_item:1"):
+    opened = alerts.raise_alert(db, workspace.id, "inventory_low", subject, "Gloves are low", now=now)
+    db.commit()
+    return opened
+
+
+def test_repeats_coalesce_into_one_row(db, workspace):
+    db.add(WorkspaceCounters(workspace_id=workspace.id))
+    db.commit()
+
+    assert raise_low(db, workspace, T0) is True
+    # Inside the window: suppressed, nothing written
+    assert raise_low(db, workspace, T0 + WINDOW / 2) is False
+    # After the window: counted, but the alert is still open
+    assert raise_low(db, workspace, T0 + WINDOW * 2) is False
+    raise_low(db, workspace, T0, subject="inventory_item:2")
+
+    rows = db.query(Alert).order_by(Alert.subject).all()
+    assert [(a.subject, a.occurrences) for a in rows] == [("inventory_item:1", 2), ("inventory_item:2", 1)]
+    assert db.get(WorkspaceCounters, workspace.id).unread_alerts == 2
+
+
+def test_read_alert_reopens_after_window(client, db, workspace, auth_headers):
+    client.get("/api/v1/workspaces/dashboard/stats", headers=auth_headers)  # creates the counters row
+    raise_low(db, workspace, T0)
+    alert = db.query(Alert).one()
+
+    assert client.post(f"/api/v1/workspaces/dashboard/alerts/{alert.id}/read", headers=auth_headers).status_code == 200
+    stats = client.get("/api/v1/workspaces/dashboard/stats", headers=auth_headers).json()
+    assert stats["alerts"] == [] and stats["metrics"]["unread_alerts"] == 0
+
+    assert raise_low(db, workspace, T0 + WINDOW * 2) is True
+    stats = client.get("/api/v1/workspaces/dashboard/stats", headers=auth_headers).json()
+    assert [a["occurrences"] for a in stats["alerts"]] == [2]
+    assert stats["metrics"]["unread_alerts"] == 1
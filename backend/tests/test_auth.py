@@ -0,0 +1,62 @@
+import threading
+
+from passlib.context import CryptContext
+
+from app.core import security
+from app.models.user import User
+
+
+def login(client, email, password):
+    return client.post("/api/v1/login/access-token", data={"username": email, "password": password})
+
+
+def test_login_rehashes_outdated_cost(client, db, owner):
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash("secret")
+    owner.password_hash = old_hash
+    db.commit()
+
+    resp = login(client, owner.email, "secret")
+    assert resp.status_code == 200
+    assert resp.json()["token_type"] == "bearer"
+
+    db.expire_all()
+    new_hash = db.query(User).filter(User.id == owner.id).one().password_hash
+    assert new_hash != old_hash
+    assert new_hash.startswith(f"$2b${security.settings.BCRYPT_ROUNDS:02d}$")
+    assert login(client, owner.email, "secret").status_code == 200
+
+
+def test_wrong_password_is_rejected(client, owner):
+    assert login(client, owner.email, "nope").status_code == 400
+    assert login(client, "missing@example.com", "secret").status_code == 400
+
+
+def test_saturated_hashing_pool_returns_503(client, owner, monkeypatch):
+    release = threading.Event()
+    pool = security.HashingExecutor(workers=1, max_pending=0)
+    monkeypatch.setattr(security, "hashing", pool)
+    blocker = pool.submit(release.wait, 5)
+    try:
+        resp = login(client, owner.email, "secret")
+    finally:
+        release.set()
+        blocker.result()
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+
+
+def test_new_workspace_owner_and_invited_staff_can_log_in(client):
+    resp = client.post("/api/v1/workspaces/", json={
+        "name": "Clinic", "contact_email": "hello@clinic.example.com",
+        "owner_email": "boss@clinic.example.com", "owner_password": "owner-pw",
+    })
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["status"] == "draft"
+
+    token = login(client, "boss@clinic.example.com", "owner-pw").json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = client.post("/api/v1/workspaces/staff/", json={"email": "nurse@clinic.example.com", "password": "staff-pw"}, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert client.post("/api/v1/workspaces/staff/", json={"email": "nurse@clinic.example.com", "password": "x"}, headers=headers).status_code == 400
+    assert login(client, "nurse@clinic.example.com", "staff-pw").status_code == 200
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.crm import Contact, ContactImport, ContactImportRow
+from app.models.system import OutboxEvent
+from app.services import contact_import
+
+CSV = (
+    "Name,Email,Phone\n"
+    "Ada,ada@example.com,\n"
+    "Ada again, ADA@example.com ,\n"
+    "Grace,,+1 (555) 010-0199\n"
+    "Alan,alan@example.com,555 0111\n"
+    "Nobody,,\n"
+    "Existing,existing@example.com,\n"
+)
+
+
+def test_import_dedups_and_schedules_welcome_events(client, db, workspace, auth_headers, monkeypatch):
+    monkeypatch.setattr(contact_import.settings, "CONTACT_IMPORT_WELCOME_BATCH", 2)
+    monkeypatch.setattr(contact_import.settings, "CONTACT_IMPORT_WELCOME_PER_MINUTE", 2)
+    db.add(Contact(workspace_id=workspace.id, name="Existing", email="Existing@Example.com"))
+    db.commit()
+
+    resp = client.post("/api/v1/workspaces/contacts/import?format=csv", content=CSV.encode(), headers=auth_headers)
+    assert resp.status_code == 202
+
+    job = client.get(f"/api/v1/workspaces/contacts/import/{resp.json()['id']}", headers=auth_headers).json()
+    assert job["status"] == "completed"
+    assert (job["total_rows"], job["inserted"], job["duplicates"], job["invalid_rows"]) == (6, 3, 2, 1)
+
+    assert sorted(c.name for c in db.query(Contact)) == ["Ada", "Alan", "Existing", "Grace"]
+    assert db.query(ContactImportRow).count() == 0
+
+    # Two events per minute: the third new contact is welcomed a minute later
+    scheduled = sorted(e.available_at for e in db.query(OutboxEvent).filter(OutboxEvent.event_type == "NEW_CONTACT"))
+    assert len(scheduled) == 3
+    assert scheduled[1] == scheduled[0]
+    assert scheduled[2] - scheduled[0] == timedelta(minutes=1)
+
+
+def test_import_ndjson_without_welcome(client, db, workspace, auth_headers):
+    body = '{"name": "Ada", "email": "ada@example.com"}\nnot json\n{"name": "Grace", "phone": "5550100"}\n'
+    resp = client.post(
+        "/api/v1/workspaces/contacts/import?format=ndjson&send_welcome=false", content=body.encode(), headers=auth_headers
+    )
+    job = client.get(f"/api/v1/workspaces/contacts/import/{resp.json()['id']}", headers=auth_headers).json()
+
+    assert (job["status"], job["inserted"], job["invalid_rows"]) == ("completed", 2, 1)
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_sweeper_fails_stalled_imports_and_clears_staging(db, workspace):
+    now = datetime.now(timezone.utc)
+    stalled = ContactImport(workspace_id=workspace.id, format="csv", status="running", heartbeat_at=now - timedelta(hours=1))
+    active = ContactImport(workspace_id=workspace.id, format="csv", status="running", heartbeat_at=now)
+    db.add_all([stalled, active])
+    db.flush()
+    db.add_all([ContactImportRow(import_id=job.id, line=1, name="Ada", email="ada@example.com") for job in (stalled, active)])
+    db.commit()
+
+    contact_import.sweep_stale()
+    db.expire_all()
+
+    assert (stalled.status, stalled.error) == ("failed", "Import stopped making progress")
+    assert active.status == "running"
+    assert [row.import_id for row in db.query(ContactImportRow)] == [active.id]
+
+    # The worker of the swept job stops at its next heartbeat instead of completing
+    with pytest.raises(contact_import.ImportAbandoned):
+        contact_import.heartbeat(db, stalled)
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.core.database import AsyncSessionLocal
+from app.models.crm import Contact
+from app.models.system import OutboxEvent
+from app.services import contacts
+
+
+def upsert(workspace_id, name, email=None, phone=None):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            result = await contacts.upsert_contact(db, workspace_id, name, email=email, phone=phone)
+            await db.commit()
+            return result
+
+    return asyncio.run(run())
+
+
+def test_upsert_matches_normalized_identifiers(db, workspace):
+    contact_id, created = upsert(workspace.id, "Ada", email="Ada@Example.com")
+    assert created
+
+    assert upsert(workspace.id, "Ada", email=" ada@example.COM ") == (contact_id, False)
+
+    phone_id, created = upsert(workspace.id, "Grace", phone="+1 (555) 010-0199")
+    assert created and phone_id != contact_id
+    assert upsert(workspace.id, "Grace", phone="+15550100199") == (phone_id, False)
+
+    assert db.query(Contact).count() == 2
+    assert db.get(Contact, contact_id).email == "Ada@Example.com"
+
+
+def test_upsert_with_email_and_phone_prefers_email_match(db, workspace):
+    by_email, _ = upsert(workspace.id, "Ada", email="ada@example.com")
+    by_phone, _ = upsert(workspace.id, "Grace", phone="5550100")
+
+    assert upsert(workspace.id, "Ada", email="ada@example.com", phone="5550100") == (by_email, False)
+    assert upsert(workspace.id, "Grace", email="grace@example.com", phone="555-0100") == (by_phone, False)
+
+    new_id, created = upsert(workspace.id, "Alan", email="alan@example.com", phone="5550111")
+    assert created
+    assert db.query(Contact).count() == 3
+
+
+def test_public_forms_emit_one_new_contact_event(client, db, workspace):
+    url = f"/api/v1/public/workspaces/{workspace.id}/contact"
+    first = client.post(url, json={"name": "Ada", "email": "ADA@example.com"})
+    second = client.post(url, json={"name": "Ada", "email": "ada@example.com", "phone": "555 0100"})
+
+    assert first.json()["id"] == second.json()["id"]
+    assert db.query(Contact).count() == 1
+    assert db.query(OutboxEvent).filter(OutboxEvent.event_type == "NEW_CONTACT").count() == 1
+
+    blank = client.post(url, json={"name": "Nobody", "phone": " - "})
+    assert blank.status_code == 400
@@ -0,0 +1,62 @@
+from app.core import outbox
+from app.models.crm import Contact
+from app.models.workspace import WorkspaceCounters
+from app.services import counters
+
+
+def dashboard(client, auth_headers):
+    return client.get("/api/v1/workspaces/dashboard/stats", headers=auth_headers).json()
+
+
+def test_dashboard_builds_counters_on_first_read(client, db, workspace, auth_headers):
+    db.add_all([Contact(workspace_id=workspace.id, name=f"c{i}", email=f"c{i}@example.com") for i in range(3)])
+    db.commit()
+
+    assert dashboard(client, auth_headers)["metrics"]["contacts"] == 3
+    assert db.get(WorkspaceCounters, workspace.id) is not None
+
+
+def test_write_paths_keep_counters_current(client, db, workspace, auth_headers):
+    dashboard(client, auth_headers)  # creates the counters row
+
+    response = client.post(
+        f"/api/v1/public/workspaces/{workspace.id}/contact",
+        json={"name": "Ada", "email": "ada@example.com", "message": "Hello"},
+    )
+    assert response.status_code == 200
+    outbox.dispatcher.run_once()  # welcome message reuses the conversation
+
+    metrics = dashboard(client, auth_headers)["metrics"]
+    assert metrics["contacts"] == 1
+    assert metrics["active_conversations"] == 1
+
+    conversation_id = client.get("/api/v1/workspaces/conversations/", headers=auth_headers).json()[0]["id"]
+    client.post(
+        f"/api/v1/workspaces/conversations/{conversation_id}/messages",
+        json={"content": "Hi Ada", "type": "email"},
+        headers=auth_headers,
+    )
+    assert dashboard(client, auth_headers)["metrics"]["active_conversations"] == 0
+
+
+def test_reconcile_corrects_drift(db, workspace):
+    db.add(Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com"))
+    db.add(WorkspaceCounters(workspace_id=workspace.id, contacts=7))
+    db.commit()
+
+    counters.reconcile_all()
+
+    db.expire_all()
+    assert db.get(WorkspaceCounters, workspace.id).contacts == 1
+
+
+def test_reconcile_creates_missing_row_and_reports_drift(db, workspace):
+    db.add(Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com"))
+    db.commit()
+
+    assert counters.reconcile(db, workspace.id) == {}
+    db.execute(counters.increment(workspace.id, contacts=2))
+    assert counters.reconcile(db, workspace.id) == {"contacts": -2}
+    db.commit()
+    db.expire_all()
+    assert db.get(WorkspaceCounters, workspace.id).contacts == 1
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+
+from app.core import database
+from app.core.database import InstrumentedQueuePool, PoolStats, async_connect_args, async_database_uri
+
+
+def test_async_url_translates_libpq_parameters():
+    url = "postgresql://ops:secret@db:5432/ops?sslmode=require&connect_timeout=5&application_name=api&gssencmode=disable"
+
+    async_url = make_url(async_database_uri(url))
+    assert async_url.drivername == "postgresql+asyncpg"
+    assert async_url.password == "secret"
+    assert dict(async_url.query) == {}
+    assert async_connect_args(url) == {"ssl": "require", "timeout": 5.0, "server_settings": {"application_name": "api"}}
+
+    plain = "postgresql://ops@db/ops?prepared_statement_cache_size=0"
+    assert dict(make_url(async_database_uri(plain)).query) == {"prepared_statement_cache_size": "0"}
+    assert async_connect_args(plain) == {}
+    assert async_database_uri("sqlite:///./ops.db") == "sqlite+aiosqlite:///./ops.db"
+    assert async_connect_args("sqlite:///./ops.db") == {}
+
+
+def test_pool_status_reports_checkouts_and_timeouts(tmp_path, monkeypatch):
+    stats = PoolStats()
+    monkeypatch.setattr(InstrumentedQueuePool, "stats", stats)
+    monkeypatch.setattr(database, "pool_stats", stats)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    monkeypatch.setattr(database, "engine", engine)
+
+    first, second = engine.connect(), engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    status = database.get_pool_status()
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert (status["checked_out"], status["overflow"]) == (2, 1)
+    assert (status["checkouts"], status["timeouts"]) == (3, 1)
+    assert status["max_wait_ms"] >= 50
+    assert sum(status["wait_histogram"].values()) == 3
+
+    first.close()
+    second.close()
+    assert database.get_pool_status()["checked_out"] == 0
+    engine.dispose()
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from benchmarks.fake_provider import FakeProvider
+from app.models.system import IntegrationLog
+from app.services import delivery
+
+EMAIL = {"provider": "resend", "api_key": "re_test", "from": "Clinic <hi@clinic.test>"}
+SMS = {"provider": "twilio", "account_sid": "AC123", "auth_token": "secret", "from": "+15550100"}
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    server = FakeProvider().start()
+    for name in ("resend", "twilio"):
+        provider = delivery.providers[name]
+        provider.close()
+        monkeypatch.setattr(provider, "base_url", server.url)
+    delivery.config_cache.clear()
+    yield server
+    for name in ("resend", "twilio"):
+        delivery.providers[name].close()
+    server.stop()
+
+
+@pytest.fixture
+def configured(db, workspace):
+    workspace.settings = {"email": EMAIL, "sms": SMS}
+    db.commit()
+    return workspace
+
+
+def make_service(**kwargs):
+    options = dict(
+        workers=2, queue_size=100, put_timeout=0.1, batch_size=50, linger=0.01,
+        max_attempts=3, backoff_base=0.01, backoff_max=0.05, rate=1000, burst=1000,
+    )
+    options.update(kwargs)
+    return delivery.DeliveryService(**options)
+
+
+def message(workspace, channel="email", to="ada@example.com", i=0):
+    return delivery.OutboundMessage(workspace_id=workspace.id, channel=channel, to=to, body=f"Hello {i}", subject="Hi")
+
+
+def logs(db, status=None):
+    query = db.query(IntegrationLog)
+    if status:
+        query = query.filter(IntegrationLog.status == status)
+    return query.count()
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_emails_are_batched_and_sms_sent_individually(fake_provider, db, configured):
+    service = make_service()
+    service.process([message(configured, i=i) for i in range(5)] + [message(configured, "sms", "+15550111")])
+
+    assert fake_provider.requests == 2
+    assert len(fake_provider.emails) == 5
+    assert fake_provider.sms[0]["To"] == "+15550111"
+    assert logs(db, "success") == 6
+
+
+def test_retryable_failures_are_retried_with_backoff(fake_provider, db, configured):
+    fake_provider.fail_next = 2
+    service = make_service()
+    service.start()
+    try:
+        service.send(message(configured))
+        assert wait_for(lambda: service.stats()["sent"] == 1)
+    finally:
+        service.stop()
+
+    assert service.stats()["retried"] == 2
+    assert logs(db, "success") == 1 and logs(db, "failure") == 0
+
+
+def test_rate_limit_defers_instead_of_dropping(fake_provider, db, configured):
+    service = make_service(rate=50, burst=5)
+    service.start()
+    try:
+        for i in range(10):
+            service.send(message(configured, i=i))
+        assert wait_for(lambda: service.stats()["sent"] == 10)
+    finally:
+        service.stop()
+
+    assert service.stats()["deferred"] >= 5
+    assert len(fake_provider.emails) == 10
+
+
+def test_unconfigured_channel_is_logged_as_failure(db, workspace):
+    delivery.config_cache.clear()
+    make_service().process([message(workspace)])
+    assert logs(db, "failure") == 1
+
+
+def test_integration_test_endpoint_uses_configured_provider(fake_provider, client, db, configured, auth_headers):
+    response = client.post("/api/v1/workspaces/me/integrations/test", json={"channel": "email"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert fake_provider.emails[0]["to"] == ["clinic@example.com"]
+
+    fake_provider.fail_next = 1
+    response = client.post("/api/v1/workspaces/me/integrations/test", json={"channel": "email"}, headers=auth_headers)
+    assert response.status_code == 400
+    assert logs(db, "success") == 1 and logs(db, "failure") == 1
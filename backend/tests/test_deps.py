@@ -0,0 +1,53 @@
+from app.models.workspace import WorkspaceStatus
+from app.routers import deps
+
+
+def test_principal_is_cached_until_invalidated(db, owner, workspace):
+    principal = deps.get_current_user(db=db, token=_token(owner))
+    assert principal.workspace_id == workspace.id
+    assert deps.principal_cache.get(owner.id) == principal
+
+    workspace.status = WorkspaceStatus.DRAFT
+    db.commit()
+    assert deps.get_current_user(db=db, token=_token(owner)).workspace_status == WorkspaceStatus.ACTIVE
+
+    deps.invalidate_workspace(workspace.id)
+    assert deps.get_current_user(db=db, token=_token(owner)).workspace_status == WorkspaceStatus.DRAFT
+
+
+def test_activation_invalidates_cached_workspace_status(client, db, owner, workspace, auth_headers):
+    from datetime import time
+    from app.models.operations import Availability, Service
+
+    workspace.status = WorkspaceStatus.DRAFT
+    workspace.settings = {"email": "key"}
+    service = Service(workspace_id=workspace.id, name="Consultation", duration=30)
+    db.add(service)
+    db.flush()
+    db.add(Availability(service_id=service.id, day_of_week=0, start_time=time(9), end_time=time(17)))
+    db.commit()
+
+    assert client.get("/api/v1/workspaces/", headers=auth_headers).status_code == 200
+    assert deps.principal_cache.get(owner.id).workspace_status == WorkspaceStatus.DRAFT
+
+    resp = client.post(f"/api/v1/workspaces/{workspace.id}/activate", headers=auth_headers)
+    assert resp.status_code == 200
+    assert deps.principal_cache.get(owner.id) is None
+
+
+def _token(user):
+    from app.core import security
+
+    return security.create_access_token(user.id)
+
+
+def test_internal_stats_are_owner_only(client, db, workspace, auth_headers):
+    from app.core import security
+    from app.models.user import User, UserRole
+
+    assert client.get("/api/v1/internal/events", headers=auth_headers).status_code == 200
+    db.add(User(email="staff@example.com", password_hash=security.get_password_hash("pw"), role=UserRole.STAFF, workspace_id=workspace.id))
+    db.commit()
+    token = client.post("/api/v1/login/access-token", data={"username": "staff@example.com", "password": "pw"}).json()["access_token"]
+    for path in ("events", "db-pool", "delivery"):
+        assert client.get(f"/api/v1/internal/{path}", headers={"Authorization": f"Bearer {token}"}).status_code == 403
@@ -0,0 +1,53 @@
+from datetime import datetime, time, timezone
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.crm import Contact
+from app.models.operations import Availability, Booking, Service
+from app.services import slots
+
+
+def utc(hour, minute=0):
+    return datetime(2030, 1, 7, hour, minute, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def service(db, workspace):
+    service = Service(workspace_id=workspace.id, name="Consultation", duration=60)
+    db.add(service)
+    db.flush()
+    db.add(Availability(service_id=service.id, day_of_week=0, start_time=time(9), end_time=time(17)))
+    db.add(Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com"))
+    db.commit()
+    return service
+
+
+def test_storage_rejects_overlapping_bookings(db, service):
+    db.add(Booking(service_id=service.id, contact_id=1, start_time=utc(10), end_time=utc(11)))
+    db.commit()
+
+    db.add(Booking(service_id=service.id, contact_id=1, start_time=utc(10, 30), end_time=utc(11, 30)))
+    with pytest.raises(IntegrityError, match="bookings_no_overlap"):
+        db.commit()
+    db.rollback()
+
+    # Back-to-back and cancelled bookings are fine
+    db.add(Booking(service_id=service.id, contact_id=1, start_time=utc(11), end_time=utc(12)))
+    db.add(Booking(service_id=service.id, contact_id=1, start_time=utc(10), end_time=utc(11), status="cancelled"))
+    db.commit()
+
+
+def test_lost_race_returns_conflict(client, workspace, service, monkeypatch):
+    # Simulate two requests that both passed the availability check
+    async def always_free(*args):
+        return True
+
+    monkeypatch.setattr(slots, "is_free_slot", always_free)
+    url = f"/api/v1/public/workspaces/{workspace.id}/bookings"
+    booking = {"service_id": service.id, "contact_id": 1, "start_time": "2030-01-07T10:00:00+00:00"}
+
+    assert client.post(url, json=booking).status_code == 200
+    response = client.post(url, json=booking)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Selected time is not available"
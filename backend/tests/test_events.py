@@ -0,0 +1,115 @@
+import threading
+import time
+
+from app.core import events
+
+
+def make_bus(**kwargs):
+    options = dict(workers=4, queue_size=100, put_timeout=0.05)
+    options.update(kwargs)
+    return events.EventBus(**options)
+
+
+def test_emit_runs_handlers_off_the_caller_thread(monkeypatch):
+    monkeypatch.setattr(events, "subscribers", {})
+    seen = []
+    events.subscribe("PING", lambda payload: seen.append((payload["n"], threading.current_thread().name)))
+
+    bus = make_bus()
+    bus.start()
+    try:
+        futures = [bus.submit("PING", {"n": i}) for i in range(20)]
+        assert all(f.result(timeout=5) for f in futures)
+    finally:
+        bus.stop()
+
+    assert sorted(n for n, _ in seen) == list(range(20))
+    assert all(name.startswith("event-worker-") for _, name in seen)
+    assert bus.stats()["events"]["PING"]["processed"] == 20
+
+
+def test_per_type_concurrency_limit(monkeypatch):
+    monkeypatch.setattr(events, "subscribers", {})
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def slow(payload):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+
+    events.subscribe("SLOW", slow)
+    bus = make_bus(type_concurrency={"SLOW": 2})
+    bus.start()
+    try:
+        futures = [bus.submit("SLOW", {}) for _ in range(10)]
+        for f in futures:
+            f.result(timeout=5)
+    finally:
+        bus.stop()
+
+    assert active["peak"] == 2
+
+
+def test_limited_type_does_not_starve_other_types(monkeypatch):
+    monkeypatch.setattr(events, "subscribers", {})
+    release = threading.Event()
+    events.subscribe("SLOW", lambda payload: release.wait(5))
+    events.subscribe("FAST", lambda payload: None)
+
+    bus = make_bus(workers=2, type_concurrency={"SLOW": 1})
+    bus.start()
+    try:
+        slow = [bus.submit("SLOW", {}) for _ in range(5)]
+        # One SLOW handler runs; the rest are parked, not holding workers
+        assert bus.submit("FAST", {}).result(timeout=2) is True
+        assert bus.stats()["parked"] == {"SLOW": 4}
+        release.set()
+        assert all(f.result(timeout=5) for f in slow)
+    finally:
+        release.set()
+        bus.stop()
+
+    assert bus.stats()["parked"] == {}
+
+
+def test_full_queue_falls_back_to_caller(monkeypatch):
+    monkeypatch.setattr(events, "subscribers", {})
+    release = threading.Event()
+    callers = []
+
+    def handler(payload):
+        if payload.get("block"):
+            release.wait(5)
+        callers.append(threading.current_thread().name)
+
+    events.subscribe("BURST", handler)
+    bus = make_bus(workers=1, queue_size=1)
+    bus.start()
+    try:
+        bus.submit("BURST", {"block": True})
+        time.sleep(0.05)  # let the worker pick up the blocking event
+        bus.submit("BURST", {})  # fills the queue
+        inline = bus.submit("BURST", {})  # no room left
+        assert inline.done()
+        assert callers == [threading.current_thread().name]
+        release.set()
+    finally:
+        bus.stop()
+
+    assert bus.stats()["events"]["BURST"]["inline"] == 1
+
+
+def test_failing_handler_marks_event_failed(monkeypatch):
+    monkeypatch.setattr(events, "subscribers", {})
+
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    events.subscribe("BROKEN", broken)
+    bus = make_bus()
+    assert bus.submit("BROKEN", {}).result(timeout=5) is False
+    assert bus.stats()["events"]["BROKEN"]["failed"] == 1
@@ -0,0 +1,60 @@
+import csv
+import gzip
+import io
+import json
+
+from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.services import exports
+
+
+def seed_messages(db, workspace, count):
+    contact = Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com")
+    db.add(contact)
+    db.flush()
+    conversation = Conversation(workspace_id=workspace.id, contact_id=contact.id, status="active")
+    db.add(conversation)
+    db.flush()
+    db.add_all([
+        Message(conversation_id=conversation.id, direction=MessageDirection.INBOUND, type=MessageType.SMS, content=f"Hello, #{i}")
+        for i in range(count)
+    ])
+    db.commit()
+    return contact
+
+
+def test_messages_export_streams_ndjson_in_chunks(client, db, workspace, auth_headers, monkeypatch):
+    monkeypatch.setattr(exports.settings, "EXPORT_YIELD_PER", 10)
+    monkeypatch.setattr(exports.settings, "EXPORT_CHUNK_BYTES", 512)
+    seed_messages(db, workspace, 50)
+
+    chunks = list(exports.stream("messages", workspace.id, "ndjson"))
+    assert len(chunks) > 1
+
+    resp = client.get("/api/v1/workspaces/exports/messages", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(lines) == 50
+    assert lines[0]["content"] == "Hello, #0"
+    assert lines[0]["direction"] == "inbound"
+
+
+def test_form_submissions_export_as_gzipped_csv(client, db, workspace, auth_headers):
+    contact = seed_messages(db, workspace, 0)
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema={"fields": []})
+    db.add(template)
+    db.flush()
+    db.add(FormSubmission(template_id=template.id, contact_id=contact.id, data={"Name": "Ada", "allergies": ["pollen"]}))
+    db.commit()
+
+    resp = client.get("/api/v1/workspaces/exports/form_submissions?format=csv&gzip=true", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-disposition"] == 'attachment; filename="form_submissions.csv.gz"'
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(resp.content).decode())))
+    assert len(rows) == 1
+    assert rows[0]["template_name"] == "Intake"
+    assert json.loads(rows[0]["data"]) == {"Name": "Ada", "allergies": ["pollen"]}
+
+    assert client.get("/api/v1/workspaces/exports/users", headers=auth_headers).status_code == 404
@@ -0,0 +1,70 @@
+import pytest
+
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.services import form_validation
+
+SCHEMA = {"fields": [
+    {"name": "Name", "type": "text", "required": True, "max_length": 40},
+    {"name": "age", "type": "integer", "min": 0, "max": 130},
+    {"name": "visit", "type": "date"},
+    {"name": "reason", "type": "select", "options": ["checkup", "pain"]},
+]}
+
+
+@pytest.fixture(autouse=True)
+def clear_validators():
+    # Template ids repeat across tests' fresh schemas
+    form_validation.validators.clear()
+    yield
+
+
+def submit(client, template_id, data):
+    return client.post(f"/api/v1/public/forms/{template_id}/submit", json={"data": data, "contact_email": "ada@example.com"})
+
+
+def test_submissions_are_validated_against_the_template(client, db, workspace):
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema=SCHEMA)
+    db.add(template)
+    db.commit()
+
+    assert submit(client, template.id, {"Name": "Ada", "age": 36, "visit": "2030-01-05", "reason": "pain", "extra": 1}).status_code == 200
+
+    resp = submit(client, template.id, {"age": 200, "visit": "next week", "reason": "other"})
+    assert resp.status_code == 422
+    assert {tuple(error["loc"]): error["msg"] for error in resp.json()["detail"]} == {
+        ("data", "Name"): "is required",
+        ("data", "age"): "must be at most 130",
+        ("data", "visit"): "must be a date (YYYY-MM-DD)",
+        ("data", "reason"): "must be one of ['checkup', 'pain']",
+    }
+    assert db.query(FormSubmission).count() == 1
+
+
+def test_json_schema_subset():
+    validator = form_validation.Validator({
+        "type": "object",
+        "required": ["email"],
+        "properties": {
+            "email": {"type": "string", "format": "email"},
+            "score": {"type": "number", "minimum": 1},
+            "tags": {"type": "array", "items": {"enum": ["a", "b"]}},
+        },
+    })
+    assert validator({"email": "ada@example.com", "score": 2, "tags": ["a"]}) == []
+    assert [e["loc"][1] for e in validator({"email": "nope", "score": 0, "tags": ["c"]})] == ["email", "score", "tags"]
+
+
+def test_template_update_bumps_version_and_recompiles(client, db, workspace, auth_headers):
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema={"fields": [{"name": "Name", "type": "text"}]})
+    db.add(template)
+    db.commit()
+    assert submit(client, template.id, {}).status_code == 200
+
+    url = f"/api/v1/workspaces/forms/{template.id}"
+    resp = client.put(url, json={"schema": {"fields": [{"name": "Name", "type": "text", "required": True}]}}, headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["version"] == 2
+    assert submit(client, template.id, {}).status_code == 422
+
+    bad = client.put(url, json={"schema": {"fields": [{"type": "text"}]}}, headers=auth_headers)
+    assert bad.status_code == 400
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
+
+START = datetime(2020, 1, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def add_message(db, conversation, direction, content, minute):
+    # Explicit timestamps: SQLite's CURRENT_TIMESTAMP only has second resolution
+    db.add(Message(
+        conversation_id=conversation.id,
+        direction=direction,
+        type=MessageType.EMAIL,
+        content=content,
+        timestamp=START + timedelta(minutes=minute),
+    ))
+    db.commit()
+
+
+def test_inbox_is_sorted_by_latest_message_with_unread_counts(client, db, workspace, auth_headers):
+    conversations = []
+    for name in ("Ada", "Grace"):
+        contact = Contact(workspace_id=workspace.id, name=name, email=f"{name.lower()}@example.com")
+        db.add(contact)
+        db.flush()
+        conversation = Conversation(workspace_id=workspace.id, contact_id=contact.id, status="active")
+        db.add(conversation)
+        db.commit()
+        conversations.append(conversation)
+    ada, grace = conversations
+
+    add_message(db, grace, MessageDirection.INBOUND, "Is parking available?", minute=1)
+    add_message(db, ada, MessageDirection.INBOUND, "Hello", minute=2)
+    add_message(db, ada, MessageDirection.INBOUND, "Can I move my appointment to Friday afternoon?", minute=3)
+
+    inbox = client.get("/api/v1/workspaces/conversations/inbox", headers=auth_headers).json()
+    assert [c["contact_name"] for c in inbox] == ["Ada", "Grace"]
+    assert inbox[0]["last_message_preview"] == "Can I move my appointment to Friday afternoon?"
+    assert [c["unread_count"] for c in inbox] == [2, 1]
+
+    # A staff reply is the latest activity and clears the unread count
+    resp = client.post(f"/api/v1/workspaces/conversations/{grace.id}/messages", json={"content": "Yes, free parking."}, headers=auth_headers)
+    assert resp.status_code == 200
+    inbox = client.get("/api/v1/workspaces/conversations/inbox", headers=auth_headers).json()
+    assert [(c["contact_name"], c["unread_count"], c["last_message_preview"]) for c in inbox] == [
+        ("Grace", 0, "Yes, free parking."),
+        ("Ada", 2, "Can I move my appointment to Friday afternoon?"),
+    ]
+
+    assert client.post(f"/api/v1/workspaces/conversations/{ada.id}/read", headers=auth_headers).status_code == 200
+    unread = client.get("/api/v1/workspaces/conversations/inbox", params={"unread_only": True}, headers=auth_headers).json()
+    assert unread == []
@@ -0,0 +1,47 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models.system import IntegrationLog
+from app.services import integration_log
+
+
+def test_writer_buffers_until_flush(db, workspace):
+    writer = integration_log.BufferedLogWriter(max_rows=100, flush_interval=60, max_buffer=1000)
+    writer.start()
+    try:
+        for i in range(10):
+            writer.write(workspace.id, "email", "success", f"message {i}")
+        assert db.query(IntegrationLog).count() == 0
+        assert writer.stats()["buffered"] == 10
+    finally:
+        writer.stop()  # flushes
+
+    assert db.query(IntegrationLog).count() == 10
+    assert writer.stats()["flushes"] == 1
+
+
+def test_writer_flushes_when_batch_is_full(db, workspace):
+    writer = integration_log.BufferedLogWriter(max_rows=5, flush_interval=60, max_buffer=1000)
+    writer.start()
+    try:
+        for i in range(5):
+            writer.write(workspace.id, "sms", "failure")
+        deadline = time.monotonic() + 5
+        while db.query(IntegrationLog).count() < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        writer.stop()
+    assert db.query(IntegrationLog).count() == 5
+
+
+def test_retention_deletes_old_rows_without_partitions(db, workspace):
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        IntegrationLog(workspace_id=workspace.id, integration_type="email", status="success", timestamp=now - timedelta(days=400)),
+        IntegrationLog(workspace_id=workspace.id, integration_type="email", status="success", timestamp=now),
+    ])
+    db.commit()
+
+    integration_log.maintain(now)
+
+    assert db.query(IntegrationLog).count() == 1
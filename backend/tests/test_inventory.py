@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.forms_inventory import InventoryItem
+from app.models.system import OutboxEvent
+
+
+def add_item(db, workspace, quantity, threshold=5):
+    item = InventoryItem(workspace_id=workspace.id, name="Gloves", quantity=quantity, low_stock_threshold=threshold)
+    db.add(item)
+    db.commit()
+    return item
+
+
+def use(client, auth_headers, item, quantity):
+    return client.post("/api/v1/workspaces/inventory/usage", json={"item_id": item.id, "quantity_used": quantity}, headers=auth_headers)
+
+
+def low_stock_events(db):
+    return db.query(OutboxEvent).filter(OutboxEvent.event_type == "INVENTORY_LOW").count()
+
+
+def test_usage_decrements_and_rejects_overdraw(client, db, workspace, auth_headers):
+    item = add_item(db, workspace, quantity=10)
+
+    response = use(client, auth_headers, item, 3)
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 7
+
+    assert use(client, auth_headers, item, 8).status_code == 400
+    db.refresh(item)
+    assert item.quantity == 7
+
+
+def test_low_stock_event_only_on_crossing(client, db, workspace, auth_headers):
+    item = add_item(db, workspace, quantity=8, threshold=5)
+
+    use(client, auth_headers, item, 2)  # 6, still above
+    assert low_stock_events(db) == 0
+    use(client, auth_headers, item, 1)  # 5, crosses
+    use(client, auth_headers, item, 1)  # 4, already low
+    assert low_stock_events(db) == 1
+
+
+def test_concurrent_usage_loses_no_updates(client, db, workspace, auth_headers):
+    item = add_item(db, workspace, quantity=40, threshold=10)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda _: use(client, auth_headers, item, 1).status_code, range(50)))
+
+    db.refresh(item)
+    assert statuses.count(200) == 40
+    assert statuses.count(400) == 10
+    assert item.quantity == 0
+    assert low_stock_events(db) == 1
+
+
+def test_low_stock_list_follows_quantity_changes(client, db, workspace, auth_headers):
+    gloves = add_item(db, workspace, quantity=3, threshold=5)
+    add_item(db, workspace, quantity=50, threshold=5)
+
+    def low_stock():
+        return [i["id"] for i in client.get("/api/v1/workspaces/inventory/low-stock", headers=auth_headers).json()]
+
+    assert low_stock() == [gloves.id]
+
+    restock = {"name": "Gloves", "quantity": 100, "low_stock_threshold": 5}
+    client.put(f"/api/v1/workspaces/inventory/{gloves.id}", json=restock, headers=auth_headers)
+    assert low_stock() == []
+
+    use(client, auth_headers, gloves, 96)
+    assert low_stock() == [gloves.id]
+    assert low_stock_events(db) == 1
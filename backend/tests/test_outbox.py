@@ -0,0 +1,117 @@
+from app.core import events, outbox
+from app.models.crm import Contact
+from app.models.system import OutboxEvent
+
+
+def test_contact_form_writes_event_in_same_transaction(client, db, workspace):
+    resp = client.post(
+        f"/api/v1/public/workspaces/{workspace.id}/contact",
+        json={"name": "Ada", "email": "ada@example.com", "message": "Hello"},
+    )
+    assert resp.status_code == 200
+
+    contact = db.query(Contact).one()
+    pending = db.query(OutboxEvent).all()
+    assert [(e.event_type, e.payload["contact_id"], e.status) for e in pending] == [
+        (events.NEW_CONTACT, contact.id, "pending")
+    ]
+
+
+def test_dispatcher_drains_batch_and_retries_failures(db, monkeypatch):
+    handled = []
+
+    def handler(payload):
+        if payload["n"] == 3:
+            raise RuntimeError("downstream unavailable")
+        handled.append(payload["n"])
+
+    monkeypatch.setattr(events, "subscribers", {})
+    events.subscribe("TEST_EVENT", handler)
+    for n in range(5):
+        outbox.add_event(db, "TEST_EVENT", {"n": n})
+    db.commit()
+
+    dispatcher = outbox.OutboxDispatcher(batch_size=100, poll_interval=0.1, max_attempts=3, retention_hours=1)
+    assert dispatcher.run_once() == 5
+    assert sorted(handled) == [0, 1, 2, 4]
+
+    db.expire_all()
+    rows = {e.payload["n"]: e for e in db.query(OutboxEvent).all()}
+    assert all(rows[n].status == "dispatched" for n in (0, 1, 2, 4))
+    assert rows[3].status == "pending"
+    assert rows[3].attempts == 1
+
+    # The failed event is backed off, so an immediate second pass claims nothing
+    assert dispatcher.run_once() == 0
+
+
+def test_full_delivery_queue_defers_the_send_without_repeating_the_handler(db, workspace, monkeypatch):
+    from app.models.crm import Message
+    from app.services import automation, delivery
+
+    # A "running" service whose one-slot queue is already taken
+    busy = delivery.DeliveryService(
+        workers=1, queue_size=1, put_timeout=0.01, batch_size=1, linger=0.01,
+        max_attempts=3, backoff_base=60, backoff_max=60, rate=1000, burst=1000,
+    )
+    busy._running = True
+    busy._queue.put(None)
+    monkeypatch.setattr(delivery, "service", busy)
+    monkeypatch.setattr(events, "subscribers", {})
+    events.subscribe(events.NEW_CONTACT, automation.send_welcome_message)
+
+    contact = Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com")
+    db.add(contact)
+    db.flush()
+    outbox.add_event(db, events.NEW_CONTACT, {"contact_id": contact.id, "workspace_id": workspace.id})
+    db.commit()
+
+    dispatcher = outbox.OutboxDispatcher(batch_size=100, poll_interval=0.1, max_attempts=3, retention_hours=1)
+    assert dispatcher.run_once() == 1
+    db.expire_all()
+    assert db.query(OutboxEvent).one().status == "dispatched"
+    assert dispatcher.run_once() == 0
+
+    assert db.query(Message).count() == 1
+    assert [m.to for _, _, m in busy._delayed] == ["ada@example.com"]
+    assert busy.counts["deferred"] == 1
+
+
+def test_slow_handler_keeps_its_lease_and_is_settled_when_it_finishes(db, monkeypatch):
+    from concurrent.futures import Future
+
+    pending = Future()
+    monkeypatch.setattr(events.bus, "submit", lambda event_type, payload: pending)
+    outbox.add_event(db, "TEST_EVENT", {"n": 1})
+    db.commit()
+
+    dispatcher = outbox.OutboxDispatcher(batch_size=100, poll_interval=0.1, max_attempts=3, retention_hours=1, wait_timeout=0.01)
+    assert dispatcher.run_once() == 1
+    db.expire_all()
+    event = db.query(OutboxEvent).one()
+    assert event.status == "processing" and event.claimed_at is not None
+    # Leased, so the next pass does not hand it out again
+    assert dispatcher.run_once() == 0
+
+    pending.set_result(True)
+    db.expire_all()
+    assert db.query(OutboxEvent).one().status == "dispatched"
+
+
+def test_failed_form_submission_handler_is_retried(db, workspace, monkeypatch):
+    from app.services import automation
+
+    def broken(db, workspace_id, template_id):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(automation.rule_index, "rules_for", broken)
+    monkeypatch.setattr(events, "subscribers", {})
+    events.subscribe(events.FORM_SUBMITTED, automation.handle_form_submitted)
+    outbox.add_event(db, events.FORM_SUBMITTED, {"submission_id": 1, "workspace_id": workspace.id, "template_id": 1})
+    db.commit()
+
+    dispatcher = outbox.OutboxDispatcher(batch_size=100, poll_interval=0.1, max_attempts=3, retention_hours=1)
+    assert dispatcher.run_once() == 1
+    db.expire_all()
+    event = db.query(OutboxEvent).one()
+    assert (event.status, event.attempts) == ("pending", 1)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
+from app.models.forms_inventory import InventoryItem
+
+
+def collect(client, url, headers, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(url, params=params, headers=headers)
+        assert resp.status_code == 200, resp.text
+        pages.append(resp.json())
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_inventory_pages_follow_name_then_id(client, db, workspace, auth_headers):
+    names = ["gauze", "alcohol", "gauze", "masks", "alcohol", "gloves", "gauze"]
+    db.add_all([InventoryItem(workspace_id=workspace.id, name=n, quantity=10) for n in names])
+    db.commit()
+
+    pages = collect(client, "/api/v1/workspaces/inventory/", auth_headers, limit=3)
+    assert [len(p) for p in pages] == [3, 3, 1]
+    items = [item for p in pages for item in p]
+    assert [(i["name"], i["id"]) for i in items] == sorted((i["name"], i["id"]) for i in items)
+    assert len({i["id"] for i in items}) == len(names)
+
+
+def test_messages_page_through_timestamp_ties(client, db, workspace, auth_headers):
+    contact = Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com")
+    db.add(contact)
+    db.flush()
+    conversation = Conversation(workspace_id=workspace.id, contact_id=contact.id, status="active")
+    db.add(conversation)
+    db.flush()
+    base = datetime(2030, 1, 1, 9, 0, tzinfo=timezone.utc)
+    for i in range(10):
+        db.add(Message(
+            conversation_id=conversation.id,
+            direction=MessageDirection.INBOUND,
+            type=MessageType.EMAIL,
+            content=f"message {i}",
+            timestamp=base + timedelta(minutes=i // 3),  # groups of three share a timestamp
+        ))
+    db.commit()
+
+    url = f"/api/v1/workspaces/conversations/{conversation.id}/messages"
+    ascending = [m["content"] for p in collect(client, url, auth_headers, limit=4) for m in p]
+    assert ascending == [f"message {i}" for i in range(10)]
+
+    resp = client.get(url, params={"limit": 4, "order": "desc"}, headers=auth_headers)
+    assert [m["content"] for m in resp.json()] == [f"message {i}" for i in (9, 8, 7, 6)]
+
+
+def test_invalid_cursor_and_page_size(client, auth_headers):
+    assert client.get("/api/v1/workspaces/forms/", params={"cursor": "garbage"}, headers=auth_headers).status_code == 400
+    assert client.get("/api/v1/workspaces/forms/", params={"limit": 100000}, headers=auth_headers).status_code == 422
+
+
+def test_inbox_pages_through_conversations_without_messages(client, db, workspace, auth_headers):
+    contacts = [Contact(workspace_id=workspace.id, name=f"C{i}", email=f"c{i}@example.com") for i in range(5)]
+    db.add_all(contacts)
+    db.flush()
+    db.add_all([Conversation(workspace_id=workspace.id, contact_id=c.id, status="active") for c in contacts])
+    db.commit()
+    assert db.query(Conversation).filter(Conversation.last_message_at.is_(None)).count() == 0
+
+    for url in ("/api/v1/workspaces/conversations/", "/api/v1/workspaces/conversations/inbox"):
+        pages = collect(client, url, auth_headers, limit=2)
+        assert [len(p) for p in pages] == [2, 2, 1]
+        assert len({c["id"] for p in pages for c in p}) == 5
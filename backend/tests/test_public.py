@@ -0,0 +1,45 @@
+from datetime import time
+
+from app.models.crm import Contact, Conversation, Message
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.models.operations import Availability, Booking, Service
+from app.models.system import OutboxEvent
+
+
+def test_contact_form_reuses_existing_contact(client, db, workspace):
+    url = f"/api/v1/public/workspaces/{workspace.id}/contact"
+    first = client.post(url, json={"name": "Ada", "email": "ada@example.com", "message": "Hi"})
+    second = client.post(url, json={"name": "Ada", "email": "ada@example.com", "message": "Again"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["id"] == second.json()["id"]
+    assert db.query(Contact).count() == 1
+    assert db.query(Conversation).count() == 1
+    assert db.query(Message).count() == 2
+    assert db.query(OutboxEvent).count() == 1
+
+
+def test_booking_and_form_submission(client, db, workspace):
+    service = Service(workspace_id=workspace.id, name="Consultation", duration=30)
+    db.add(service)
+    db.flush()
+    db.add(Availability(service_id=service.id, day_of_week=0, start_time=time(9), end_time=time(17)))
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema={"fields": [{"name": "Name", "type": "text"}]})
+    db.add(template)
+    db.commit()
+
+    resp = client.post(f"/api/v1/public/forms/{template.id}/submit", json={"data": {"Name": "Grace"}, "contact_email": "grace@example.com"})
+    assert resp.status_code == 200
+    contact = db.query(Contact).filter(Contact.email == "grace@example.com").one()
+    assert contact.name == "Grace"
+    assert db.query(FormSubmission).count() == 1
+
+    resp = client.post(
+        f"/api/v1/public/workspaces/{workspace.id}/bookings",
+        json={"service_id": service.id, "contact_id": contact.id, "start_time": "2030-01-07T10:00:00+00:00"},
+    )
+    assert resp.status_code == 200
+    booking = db.query(Booking).one()
+    assert (booking.end_time - booking.start_time).total_seconds() == 30 * 60
+
+    assert sorted(e.event_type for e in db.query(OutboxEvent)) == ["BOOKING_CREATED", "FORM_SUBMITTED", "NEW_CONTACT"]
@@ -0,0 +1,43 @@
+from fastapi.routing import APIRoute
+
+from app.core import security
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.workspace import WorkspaceCounters
+
+
+def test_every_json_route_declares_a_response_model():
+    # Exports stream their own bytes
+    missing = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.response_model is None and not route.path.startswith("/api/v1/workspaces/exports")
+    ]
+    assert missing == []
+
+
+def test_staff_list_does_not_expose_password_hashes(client, db, workspace, auth_headers):
+    db.add(User(email="staff@example.com", password_hash=security.get_password_hash("pw"), role=UserRole.STAFF, workspace_id=workspace.id))
+    db.commit()
+
+    resp = client.get("/api/v1/workspaces/staff/", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json() == [{"id": resp.json()[0]["id"], "email": "staff@example.com", "role": "staff", "workspace_id": workspace.id}]
+
+
+def test_dashboard_and_services_serialize_through_their_models(client, db, workspace, auth_headers):
+    if not db.get(WorkspaceCounters, workspace.id):
+        db.add(WorkspaceCounters(workspace_id=workspace.id))
+        db.commit()
+
+    stats = client.get("/api/v1/workspaces/dashboard/stats", headers=auth_headers).json()
+    assert set(stats["metrics"]) == {"bookings", "contacts", "active_conversations", "pending_forms", "unread_alerts"}
+    assert stats["alerts"] == []
+
+    created = client.post(
+        "/api/v1/workspaces/services/",
+        json={"name": "Consultation", "duration": 30, "availabilities": [{"day_of_week": 0, "start_time": "09:00", "end_time": "12:00"}]},
+        headers=auth_headers,
+    ).json()
+    assert created == {"id": created["id"], "workspace_id": workspace.id, "name": "Consultation", "duration": 30, "location": None}
+    assert client.get("/api/v1/workspaces/services/", headers=auth_headers).json() == [created]
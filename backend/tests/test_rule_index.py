@@ -0,0 +1,51 @@
+import pytest
+
+from app.models.forms_inventory import FormTemplate
+from app.services.rule_index import RuleIndex, rule_index
+
+
+@pytest.fixture(autouse=True)
+def clear_rule_index():
+    rule_index.clear()
+    yield
+
+
+@pytest.fixture
+def template(db, workspace):
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema={"fields": []})
+    db.add(template)
+    db.commit()
+    return template
+
+
+def create_rule(client, auth_headers, template, name):
+    rule = {"name": name, "form_template_id": template.id, "action_type": "send_email", "action_config": {"recipient": "contact"}}
+    return client.post("/api/v1/workspaces/automation/", json=rule, headers=auth_headers).json()
+
+
+def test_index_is_loaded_once_and_reloaded_on_change(client, db, workspace, template, auth_headers, monkeypatch):
+    # Only this process' invalidation can trigger the reload within the interval
+    monkeypatch.setattr(rule_index, "check_interval", 60)
+    create_rule(client, auth_headers, template, "Welcome")
+    loads = rule_index.loads
+
+    assert [r.name for r in rule_index.rules_for(db, workspace.id, template.id)] == ["Welcome"]
+    rule_index.rules_for(db, workspace.id, template.id)
+    assert rule_index.loads == loads + 1
+
+    create_rule(client, auth_headers, template, "Follow up")
+    db.expire_all()
+    assert sorted(r.name for r in rule_index.rules_for(db, workspace.id, template.id)) == ["Follow up", "Welcome"]
+    assert rule_index.loads == loads + 2
+
+
+def test_other_workers_see_changes_through_the_version(client, db, workspace, template, auth_headers):
+    # A second worker: its own index, not invalidated by this process' writes
+    other_worker = RuleIndex(check_interval=0)
+    rule = create_rule(client, auth_headers, template, "Welcome")
+    assert len(other_worker.rules_for(db, workspace.id, template.id)) == 1
+
+    client.delete(f"/api/v1/workspaces/automation/{rule['id']}", headers=auth_headers)
+    db.expire_all()
+    assert other_worker.rules_for(db, workspace.id, template.id) == ()
+    assert other_worker.loads == 2
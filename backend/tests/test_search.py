@@ -0,0 +1,61 @@
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.crm import Contact, Conversation, Message, MessageDirection, MessageType
+from app.models.workspace import Workspace
+
+
+def add_conversation(db, workspace_id, name, contents):
+    contact = Contact(workspace_id=workspace_id, name=name, email=f"{name.lower()}@example.com")
+    db.add(contact)
+    db.flush()
+    conversation = Conversation(workspace_id=workspace_id, contact_id=contact.id, status="active")
+    db.add(conversation)
+    db.flush()
+    db.add_all([
+        Message(conversation_id=conversation.id, direction=MessageDirection.INBOUND, type=MessageType.EMAIL, content=content)
+        for content in contents
+    ])
+    db.commit()
+    return conversation
+
+
+def search(client, auth_headers, q, **params):
+    return client.get("/api/v1/workspaces/conversations/search", params={"q": q, **params}, headers=auth_headers)
+
+
+def test_search_ranks_and_scopes_to_workspace(client, db, workspace, auth_headers):
+    other = Workspace(name="Other", contact_email="other@example.com")
+    db.add(other)
+    db.commit()
+    add_conversation(db, workspace.id, "Ada", ["Can I reschedule my booking?", "Thanks!"])
+    grace = add_conversation(db, workspace.id, "Grace", ["Booking for two, booking confirmed", "Where do I park?"])
+    add_conversation(db, other.id, "Mallory", ["booking booking booking"])
+
+    resp = search(client, auth_headers, "bookings")
+    assert resp.status_code == 200
+    hits = resp.json()
+    assert [hit["contact_name"] for hit in hits] == ["Grace", "Ada"]  # stemmed, two occurrences rank higher
+    assert hits[0]["conversation_id"] == grace.id
+
+    assert search(client, auth_headers, "parking").json()[0]["content"] == "Where do I park?"
+    assert search(client, auth_headers, 'booking "two"').json()[0]["contact_name"] == "Grace"
+    assert search(client, auth_headers, "?!").status_code == 400
+
+
+def test_search_paginates_and_follows_edits(client, db, workspace, auth_headers):
+    conversation = add_conversation(db, workspace.id, "Ada", [f"invoice number {i}" for i in range(5)])
+
+    seen = []
+    cursor = None
+    while True:
+        resp = search(client, auth_headers, "invoice", limit=2, **({"cursor": cursor} if cursor else {}))
+        seen += [hit["id"] for hit in resp.json()]
+        cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+    message = db.query(Message).filter(Message.conversation_id == conversation.id).first()
+    message.content = "receipt attached"
+    db.commit()
+    assert len(search(client, auth_headers, "invoice", limit=10).json()) == 4
+    assert search(client, auth_headers, "receipt").json()[0]["id"] == message.id
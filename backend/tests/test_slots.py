@@ -0,0 +1,101 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from app.models.crm import Contact
+from app.models.operations import Availability, Booking, Service
+from app.services import slots
+
+# A Monday far enough ahead that no slot is in the past
+MONDAY = date(2030, 1, 7)
+
+
+def utc(hour, minute=0, day=MONDAY):
+    return datetime.combine(day, time(hour, minute), tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_slot_cache():
+    slots.slot_cache.clear()
+    yield
+
+
+@pytest.fixture
+def service(db, workspace):
+    service = Service(workspace_id=workspace.id, name="Consultation", duration=60)
+    db.add(service)
+    db.flush()
+    db.add(Availability(service_id=service.id, day_of_week=0, start_time=time(9), end_time=time(12)))
+    db.commit()
+    return service
+
+
+@pytest.fixture
+def contact(db, workspace):
+    contact = Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com")
+    db.add(contact)
+    db.commit()
+    return contact
+
+
+def test_sweep_skips_booked_intervals():
+    windows = [(MONDAY, utc(9), utc(13))]
+    busy = [(utc(9, 30), utc(10)), (utc(11), utc(12))]
+    free = slots.sweep(windows, busy, timedelta(minutes=60))[MONDAY]
+    # 9:00 is blocked by 9:30, 10:00 is free, 11:00 is booked, 12:00 is free
+    assert free == [(utc(10), utc(11)), (utc(12), utc(13))]
+
+
+def test_windows_follow_workspace_timezone():
+    availability = Availability(day_of_week=0, start_time=time(9), end_time=time(10))
+    windows = slots.availability_windows([availability], [MONDAY, date(2030, 7, 1)], slots.workspace_zone("America/New_York"))
+    # EST in January, EDT in July
+    assert [w[1] for w in windows] == [utc(14), utc(13, day=date(2030, 7, 1))]
+
+
+def slot_starts(client, workspace, service):
+    response = client.get(
+        f"/api/v1/public/workspaces/{workspace.id}/services/{service.id}/slots",
+        params={"start": MONDAY.isoformat(), "end": (MONDAY + timedelta(days=6)).isoformat()},
+    )
+    assert response.status_code == 200
+    return [s["start"] for s in response.json()["slots"]]
+
+
+def test_booking_takes_slot_and_invalidates_cache(client, workspace, service, contact):
+    assert slot_starts(client, workspace, service) == [
+        "2030-01-07T09:00:00+00:00", "2030-01-07T10:00:00+00:00", "2030-01-07T11:00:00+00:00",
+    ]
+
+    url = f"/api/v1/public/workspaces/{workspace.id}/bookings"
+    booking = {"service_id": service.id, "contact_id": contact.id, "start_time": "2030-01-07T10:00:00"}
+    assert client.post(url, json=booking).status_code == 200
+    assert slot_starts(client, workspace, service) == ["2030-01-07T09:00:00+00:00", "2030-01-07T11:00:00+00:00"]
+
+    assert client.post(url, json=booking).status_code == 409
+    off_grid = dict(booking, start_time="2030-01-07T09:30:00+00:00")
+    assert client.post(url, json=off_grid).status_code == 409
+
+
+def test_cancelled_bookings_free_the_slot(db, client, workspace, service, contact):
+    db.add(Booking(service_id=service.id, contact_id=contact.id, start_time=utc(9), end_time=utc(10), status="cancelled"))
+    db.commit()
+    assert len(slot_starts(client, workspace, service)) == 3
+
+
+def test_create_service_parses_availability_times(client, workspace, auth_headers):
+    service = {
+        "name": "Checkup",
+        "duration": 30,
+        "availabilities": [{"day_of_week": 0, "start_time": "09:00", "end_time": "10:00"}],
+    }
+    response = client.post("/api/v1/workspaces/services/", json=service, headers=auth_headers)
+    assert response.status_code == 200
+    service_id = response.json()["id"]
+    response = client.get(f"/api/v1/public/workspaces/{workspace.id}/services/{service_id}/slots", params={"start": MONDAY.isoformat(), "end": MONDAY.isoformat()})
+    assert len(response.json()["slots"]) == 2
+
+
+def test_service_duration_is_capped_to_the_longest_booking(client, auth_headers):
+    service = {"name": "Retreat", "duration": 24 * 60 + 1, "availabilities": []}
+    assert client.post("/api/v1/workspaces/services/", json=service, headers=auth_headers).status_code == 422
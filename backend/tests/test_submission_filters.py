@@ -0,0 +1,91 @@
+from app.models.crm import Contact
+from app.models.forms_inventory import FormSubmission, FormTemplate
+from app.models.system import Alert
+from app.services import submission_query
+
+SCHEMA = {"fields": [
+    {"name": "Name", "type": "text", "indexed": True},
+    {"name": "age", "type": "number"},
+    {"name": "visit", "type": "date", "indexed": True},
+    {"name": "allergies", "type": "multiselect"},
+]}
+
+
+def seed(db, workspace):
+    contact = Contact(workspace_id=workspace.id, name="Ada", email="ada@example.com")
+    template = FormTemplate(workspace_id=workspace.id, name="Intake", schema=SCHEMA)
+    db.add_all([contact, template])
+    db.flush()
+    answers = [
+        {"Name": "Ada", "age": 36, "visit": "2030-01-05", "allergies": ["pollen", "nuts"]},
+        {"Name": "Grace", "age": 85, "visit": "2030-02-10", "allergies": []},
+        {"Name": "Alan", "age": 41.5, "visit": "2030-03-15", "allergies": ["pollen"]},
+    ]
+    db.add_all([FormSubmission(template_id=template.id, contact_id=contact.id, data=data) for data in answers])
+    db.commit()
+    return template
+
+
+def names(client, auth_headers, template_id=None, *where):
+    params = [("where", w) for w in where] + ([("template_id", template_id)] if template_id else [])
+    resp = client.get("/api/v1/workspaces/forms/submissions", params=params, headers=auth_headers)
+    assert resp.status_code == 200, resp.text
+    return sorted(s["data"]["Name"] for s in resp.json())
+
+
+def test_filter_submissions_by_answers(client, db, workspace, auth_headers):
+    template = seed(db, workspace)
+
+    assert names(client, auth_headers, None, "Name:eq:Grace") == ["Grace"]
+    assert names(client, auth_headers, None, "allergies:contains:pollen") == ["Ada", "Alan"]
+    assert names(client, auth_headers, template.id, "age:gte:40") == ["Alan", "Grace"]
+    assert names(client, auth_headers, template.id, "age:eq:36") == ["Ada"]
+    assert names(client, auth_headers, template.id, "visit:gt:2030-01-31", "visit:lt:2030-03-01") == ["Grace"]
+    assert names(client, auth_headers, template.id, "allergies:contains:pollen", "age:lt:40") == ["Ada"]
+
+
+def test_invalid_filters_are_rejected(client, db, workspace, auth_headers):
+    template = seed(db, workspace)
+    url = "/api/v1/workspaces/forms/submissions"
+
+    # Ranges need the field's type, which only the template knows
+    assert client.get(url, params={"where": "age:gte:40"}, headers=auth_headers).status_code == 400
+    assert client.get(url, params={"where": "age:gte:old", "template_id": template.id}, headers=auth_headers).status_code == 400
+    assert client.get(url, params={"where": "Name:like:A"}, headers=auth_headers).status_code == 400
+
+
+def test_indexed_fields_get_partial_expression_indexes():
+    wanted = submission_query.desired_field_indexes(7, SCHEMA)
+    assert sorted(wanted.values()) == ["Name", "visit"]
+    assert all(name.startswith("ix_form_submissions_t7_") and len(name) < 63 for name in wanted)
+
+
+def test_range_filters_skip_blank_and_malformed_numbers(client, db, workspace, auth_headers):
+    template = seed(db, workspace)
+    contact_id = db.query(Contact.id).scalar()
+    db.add_all([
+        FormSubmission(template_id=template.id, contact_id=contact_id, data={"Name": "Blank", "age": ""}),
+        FormSubmission(template_id=template.id, contact_id=contact_id, data={"Name": "Typo", "age": "forty"}),
+    ])
+    db.commit()
+
+    assert names(client, auth_headers, template.id, "age:lt:40") == ["Ada"]
+    assert names(client, auth_headers, template.id, "age:gte:0") == ["Ada", "Alan", "Grace"]
+
+    # On Postgres the cast only runs on JSON numbers
+    from sqlalchemy.dialects import postgresql
+    clause = submission_query._number("age", postgres=True) < 40
+    sql = str(clause.compile(dialect=postgresql.dialect()))
+    assert "CASE WHEN (jsonb_typeof(" in sql
+
+
+def test_failed_index_sync_raises_an_alert_without_failing_the_save(client, db, workspace, auth_headers, monkeypatch):
+    def fail(template_id, schema):
+        raise RuntimeError("could not create unique index")
+
+    monkeypatch.setattr(submission_query, "sync_field_indexes", fail)
+    resp = client.post("/api/v1/workspaces/forms/", json={"name": "Intake", "schema": SCHEMA}, headers=auth_headers)
+
+    assert resp.status_code == 200
+    alert = db.query(Alert).one()
+    assert (alert.type, alert.subject) == ("form_index_failed", f"form_template:{resp.json()['id']}")
@@ -21,6 +21,15 @@ export default function DashboardPage() {
         fetchStats();
     }, []);
 
+    const dismissAlert = async (alertId: number) => {
+        try {
+            await api.post(`/workspaces/dashboard/alerts/${alertId}/read`);
+            setStats((prev: any) => ({ ...prev, alerts: prev.alerts.filter((a: any) => a.id !== alertId) }));
+        } catch (e) {
+            console.error(e);
+        }
+    };
+
     if (loading) return <div className="p-8">Loading stats...</div>;
 
     return (
@@ -48,9 +57,15 @@ export default function DashboardPage() {
                         {stats?.alerts?.map((alert: any) => (
                             <div key={alert.id} className="flex items-start p-4 bg-red-50 rounded-lg border border-red-100">
                                 <div className="flex-1">
-                                    <h4 className="font-semibold text-red-800 capitalize">{alert.type.replace('_', ' ')}</h4>
+                                    <h4 className="font-semibold text-red-800 capitalize">
+                                        {alert.type.replace('_', ' ')}
+                                        {alert.occurrences > 1 && <span className="ml-2 text-xs font-normal text-red-500">×{alert.occurrences}</span>}
+                                    </h4>
                                     <p className="text-sm text-red-600 mt-1">{alert.message}</p>
                                 </div>
+                                <button onClick={() => dismissAlert(alert.id)} className="text-sm text-red-500 hover:text-red-700">
+                                    Dismiss
+                                </button>
                             </div>
                         ))}
                     </div>
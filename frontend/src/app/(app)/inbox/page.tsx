@@ -21,7 +21,7 @@ export default function InboxPage() {
 
     const fetchConversations = async () => {
         try {
-            const res = await api.get('/workspaces/conversations');
+            const res = await api.get('/workspaces/conversations/inbox');
             setConversations(res.data);
             if (res.data.length > 0 && !selectedId) setSelectedId(res.data[0].id);
         } catch (e) { console.error(e); } finally { setLoading(false); }
@@ -29,8 +29,19 @@ export default function InboxPage() {
 
     const fetchMessages = async (id: number) => {
         try {
-            const res = await api.get(`/workspaces/conversations/${id}/messages`);
-            setMessages(res.data);
+            // Newest first, paging back through X-Next-Cursor, then shown oldest first
+            const thread: any[] = [];
+            let cursor: string | undefined;
+            do {
+                const res = await api.get(`/workspaces/conversations/${id}/messages`, {
+                    params: { order: 'desc', limit: 500, cursor },
+                });
+                thread.push(...res.data);
+                cursor = res.headers['x-next-cursor'];
+            } while (cursor);
+            setMessages(thread.reverse() as any);
+            await api.post(`/workspaces/conversations/${id}/read`);
+            setConversations((prev: any) => prev.map((c: any) => c.id === id ? { ...c, unread_count: 0 } : c));
         } catch (e) { console.error(e); }
     };
 
@@ -72,12 +83,15 @@ export default function InboxPage() {
                             )}
                         >
                             <div className="flex justify-between mb-1">
-                                <h4 className="font-semibold text-gray-800">Contact #{conv.contact_id}</h4>
+                                <h4 className="font-semibold text-gray-800">
+                                    {conv.contact_name}
+                                    {conv.unread_count > 0 && <span className="ml-2 px-2 py-0.5 text-xs bg-blue-500 text-white rounded-full">{conv.unread_count}</span>}
+                                </h4>
                                 <span className="text-xs text-gray-500">{new Date(conv.last_message_at).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })}</span>
                             </div>
                             <p className="text-sm text-gray-500 truncate">
                                 {conv.status === 'paused' && <span className="text-orange-500 mr-2">[Paused]</span>}
-                                Click to view messages...
+                                {conv.last_message_preview || 'No messages yet'}
                             </p>
                         </div>
                     ))}
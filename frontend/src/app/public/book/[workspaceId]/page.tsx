@@ -8,6 +8,7 @@ export default function PublicBookingPage({ params }: { params: { workspaceId: s
     const [selectedService, setSelectedService] = useState<any>(null);
     const [contactId, setContactId] = useState(''); // Simulated: in real flow might come from URL param or previous step
     const [selectedTime, setSelectedTime] = useState('');
+    const [slots, setSlots] = useState<{ start: string, end: string }[]>([]);
     const [submitted, setSubmitted] = useState(false);
     const [loading, setLoading] = useState(false);
 
@@ -23,6 +24,15 @@ export default function PublicBookingPage({ params }: { params: { workspaceId: s
         // I will do that in the backend next.
     }, []);
 
+    // Free slots for the next 30 days, in the workspace timezone
+    useEffect(() => {
+        if (!selectedService) return;
+        setSelectedTime('');
+        api.get(`/public/workspaces/${params.workspaceId}/services/${selectedService.id}/slots`)
+            .then(res => setSlots(res.data.slots))
+            .catch(() => setSlots([]));
+    }, [selectedService, params.workspaceId]);
+
     const handleBook = async () => {
         if (!selectedService || !selectedTime || !contactId) return;
         setLoading(true);
@@ -35,8 +45,12 @@ export default function PublicBookingPage({ params }: { params: { workspaceId: s
                 start_time: selectedTime
             });
             setSubmitted(true);
-        } catch (e) {
-            alert("Booking failed. Ensure Contact ID is valid.");
+        } catch (e: any) {
+            if (e.response?.status === 409) {
+                alert("That time was just taken. Please pick another slot.");
+            } else {
+                alert("Booking failed. Ensure Contact ID is valid.");
+            }
         } finally {
             setLoading(false);
         }
@@ -98,11 +112,22 @@ export default function PublicBookingPage({ params }: { params: { workspaceId: s
                     {selectedService && (
                         <div className="p-6">
                             <h3 className="font-semibold text-lg mb-4">Select Time</h3>
-                            <input
-                                type="datetime-local"
-                                className="w-full p-3 border rounded-lg"
-                                onChange={(e) => setSelectedTime(e.target.value)}
-                            />
+                            {slots.length === 0 ? (
+                                <p className="text-sm text-gray-500">No available times in the next 30 days.</p>
+                            ) : (
+                                <div className="grid grid-cols-3 gap-2 max-h-80 overflow-y-auto">
+                                    {slots.map(slot => (
+                                        <button
+                                            key={slot.start}
+                                            onClick={() => setSelectedTime(slot.start)}
+                                            className={`p-2 border rounded-lg text-sm ${selectedTime === slot.start ? 'border-blue-500 bg-blue-50' : 'hover:bg-gray-50'}`}
+                                        >
+                                            {/* Wall-clock time at the business, as sent by the API */}
+                                            {slot.start.slice(5, 10)} {slot.start.slice(11, 16)}
+                                        </button>
+                                    ))}
+                                </div>
+                            )}
                         </div>
                     )}
 
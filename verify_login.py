@@ -20,7 +20,7 @@ def verify_login(email, password):
         print(f"User found: {user.email}, Role: {user.role}")
         print(f"Hashed Password in DB: {user.password_hash}")
         
-        is_valid = security.verify_password(password, user.password_hash)
+        is_valid = security.pwd_context.verify(password, user.password_hash)
         if is_valid:
             print("SUCCESS: Password verified correctly!")
         else: